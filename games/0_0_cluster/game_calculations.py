@@ -1,68 +1,5 @@
 from src.executables.executables import Executables
-from src.calculations.cluster import Cluster
-from src.calculations.board import Board
-from src.config.config import Config
 
 
 class GameCalculations(Executables):
-    """
-    This function will override the evaluate_clusters() function in cluster.py
-    This is to account for the grid multiplier in winning positions.
-    """
-
-    # Override cluster evaluation functions to include grid position multipliers
-    def evaluate_clusters_with_grid(
-        self,
-        config: Config,
-        board: Board,
-        clusters: dict,
-        pos_mult_grid: list,
-        global_multiplier: int = 1,
-        return_data: dict = {"totalWin": 0, "wins": []},
-    ) -> type:
-        """
-        Determine payout amount from cluster, including symbol multiplier and global multiplier value.
-        Game specific function which takes into account position multipliers.
-        """
-        exploding_symbols = []
-        total_win = 0
-        for sym in clusters:
-            for cluster in clusters[sym]:
-                syms_in_cluster = len(cluster)
-                if (syms_in_cluster, sym) in config.paytable:
-                    board_mult = 0
-                    for positions in cluster:
-                        board_mult += pos_mult_grid[positions[0]][positions[1]]
-                    board_mult = max(board_mult, 1)
-                    sym_win = config.paytable[(syms_in_cluster, sym)]
-                    symwin_mult = sym_win * board_mult * global_multiplier
-                    total_win += symwin_mult
-                    json_positions = [{"reel": p[0], "row": p[1]} for p in cluster]
-
-                    central_pos = Cluster.get_central_cluster_position(json_positions)
-                    return_data["wins"] += [
-                        {
-                            "symbol": sym,
-                            "clusterSize": syms_in_cluster,
-                            "win": symwin_mult,
-                            "positions": json_positions,
-                            "meta": {
-                                "globalMult": global_multiplier,
-                                "clusterMult": board_mult,
-                                "winWithoutMult": sym_win,
-                                "overlay": {"reel": central_pos[0], "row": central_pos[1]},
-                            },
-                        }
-                    ]
-
-                    for positions in cluster:
-                        board[positions[0]][positions[1]].explode = True
-                        if {
-                            "reel": positions[0],
-                            "row": positions[1],
-                        } not in exploding_symbols:
-                            exploding_symbols.append({"reel": positions[0], "row": positions[1]})
-
-        return_data["totalWin"] += total_win
-
-        return board, return_data
+    pass
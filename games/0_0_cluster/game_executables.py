@@ -9,40 +9,33 @@ class GameExecutables(GameCalculations):
 
     def reset_grid_mults(self):
         """Initialize all grid position multipliers."""
-        self.position_multipliers = [
-            [0 for _ in range(self.config.num_rows[reel])] for reel in range(self.config.num_reels)
-        ]
+        self.position_multipliers = Cluster.create_position_multiplier_grid(self.config.num_rows)
 
     def update_grid_mults(self):
         """All positions start with 1x. If there is a win in that position, the grid point
         is 'activated' and all subsequent wins on that position will double the grid value."""
         if self.win_data["totalWin"] > 0:
-            for win in self.win_data["wins"]:
-                for pos in win["positions"]:
-                    if self.position_multipliers[pos["reel"]][pos["row"]] == 0:
-                        self.position_multipliers[pos["reel"]][pos["row"]] = 1
-                    else:
-                        self.position_multipliers[pos["reel"]][pos["row"]] += 1
-                        self.position_multipliers[pos["reel"]][pos["row"]] = min(
-                            self.position_multipliers[pos["reel"]][pos["row"]], self.config.maximum_board_mult
-                        )
+            Cluster.update_position_multipliers(
+                self.position_multipliers, self.win_data["wins"], self.config.maximum_board_mult
+            )
             update_grid_mult_event(self)
 
     def get_clusters_update_wins(self):
         """Find clusters on board and update win manager."""
-        clusters = Cluster.get_clusters(self.board, "wild")
+        clusters = self.cluster_tracker.get_clusters(self.board)
         return_data = {
             "totalWin": 0,
             "wins": [],
         }
-        self.board, self.win_data = self.evaluate_clusters_with_grid(
+        self.board, self.win_data, total_win = Cluster.evaluate_clusters_with_grid(
             config=self.config,
             board=self.board,
             clusters=clusters,
-            pos_mult_grid=self.position_multipliers,
+            position_multipliers=self.position_multipliers,
             global_multiplier=self.global_multiplier,
             return_data=return_data,
         )
+        self.win_data["totalWin"] += total_win
 
         Cluster.record_cluster_wins(self)
         self.win_manager.update_spinwin(self.win_data["totalWin"])
@@ -76,6 +76,8 @@ class GameConfig(Config):
             14: [0, 1, 2, 3, 4],
             15: [4, 3, 2, 1, 0],
         }
+        # Cache payline results, keyed by the symbols under each line
+        self.line_win_cache_size = 2**16
         self.include_padding = True
         self.special_symbols = {
             "wild": ["W"],
@@ -204,6 +204,8 @@ class GameConfig(Config):
                 1,
             ],
         }
+        # Cache payline results, keyed by the symbols under each line
+        self.line_win_cache_size = 2**16
 
         self.include_padding = True
         self.special_symbols = {"wild": ["W"], "scatter": ["S"], "multiplier": ["W"]}
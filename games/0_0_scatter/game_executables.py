@@ -91,6 +91,7 @@ class GameExecutables(GameCalculations):
 
     def replace_symbol(self, reel: int, row: int, target_symbol: str) -> None:
         self.board[reel][row] = self.create_symbol(target_symbol)
+        self.update_board_position(reel, row)
 
     def count_regular_scatters(self) -> int:
         return sum(1 for reel in self.board for sym in reel if sym.name == "S")
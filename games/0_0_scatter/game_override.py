@@ -1,5 +1,3 @@
-import random
-
 from game_executables import *
 from src.events.events import update_freespin_event, update_global_mult_event
 from src.calculations.statistics import get_random_outcome
@@ -32,7 +30,7 @@ class GameStateOverride(GameExecutables):
             return
 
         weights = self.config.super_bonus_mult_weights if self.bonus_type == "super" else self.config.normal_bonus_mult_weights
-        multiplier_value = get_random_outcome(weights)
+        multiplier_value = get_random_outcome(weights, rng=self.rng)
         symbol.assign_attribute({"multiplier": multiplier_value})
 
     def check_game_repeat(self):
@@ -48,7 +46,7 @@ class GameStateOverride(GameExecutables):
             return
         if self.gametype != self.config.basegame_type:
             return
-        if random.random() >= self.config.bonus_hunt_scatter_boost_chance:
+        if self.rng.random() >= self.config.bonus_hunt_scatter_boost_chance:
             return
 
         regular_scatters = self.get_symbol_positions("S")
@@ -64,7 +62,7 @@ class GameStateOverride(GameExecutables):
         if not eligible_positions:
             return
 
-        reel, row = random.choice(eligible_positions)
+        reel, row = self.rng.choice(eligible_positions)
         self.replace_symbol(reel, row, "S")
         self.get_special_symbols_on_board()
 
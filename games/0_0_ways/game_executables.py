@@ -7,7 +7,7 @@ class GameExecutables(GameCalculations):
 
     def evaluate_ways_board(self):
         """Populate win-data, record wins, transmit events"""
-        self.win_data = Ways.get_ways_data(self.config, self.board)
+        self.win_data = self.get_board_win_data()
         if self.win_data["totalWin"] > 0:
             Ways.record_ways_wins(self)
             self.win_manager.update_spinwin(self.win_data["totalWin"])
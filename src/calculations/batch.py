@@ -0,0 +1,75 @@
+"""Bulk board generation from integer-coded reelstrips."""
+
+from typing import Dict, List
+import numpy as np
+from src.config.compiled_config import get_compiled_config
+
+
+class ReelWindows:
+    """Symbol-id windows visible for every stopping position of a reelstrip."""
+
+    def __init__(self, reel_ids: np.ndarray, num_rows: List[int]) -> None:
+        self.num_reels = len(num_rows)
+        self.num_rows = list(num_rows)
+        self.max_rows = max(num_rows)
+        self.reel_lengths = np.array([len(reel_ids[reel]) for reel in range(self.num_reels)], dtype=np.int64)
+        self.windows: List[np.ndarray] = []
+        for reel in range(self.num_reels):
+            strip = np.asarray(reel_ids[reel])
+            offsets = np.arange(len(strip))[:, None] + np.arange(num_rows[reel])[None, :]
+            self.windows.append(strip[offsets % len(strip)])
+
+    def draw_stops(self, num_boards: int, rng: np.random.Generator) -> np.ndarray:
+        """Uniformly draw stopping positions, shape [board, reel]."""
+        return rng.integers(0, self.reel_lengths, size=(num_boards, self.num_reels))
+
+    def get_boards(self, stops: np.ndarray) -> np.ndarray:
+        """Symbol ids for each set of stops, shape [board, reel, row] padded with -1."""
+        boards = np.full((len(stops), self.num_reels, self.max_rows), -1, dtype=np.int16)
+        for reel in range(self.num_reels):
+            boards[:, reel, : self.num_rows[reel]] = self.windows[reel][stops[:, reel]]
+        return boards
+
+
+def get_reel_windows(config: object, reelstrip_id: str) -> ReelWindows:
+    """Return cached ReelWindows for a reelstrip in config.reels."""
+    if getattr(config, "_reel_windows", None) is None:
+        config._reel_windows = {}
+    if reelstrip_id not in config._reel_windows:
+        reel_ids = get_compiled_config(config).reels[reelstrip_id]
+        config._reel_windows[reelstrip_id] = ReelWindows(reel_ids, config.num_rows)
+    return config._reel_windows[reelstrip_id]
+
+
+class BoardBatch:
+    """A batch of drawn boards with bulk-evaluated wins.
+
+    Boards with fallback[i] = True triggered a feature or contain symbols requiring per-symbol functions, so their
+    wins are not resolved in bulk and they should be replayed through the regular per-simulation path. Resolved
+    boards with rejected[i] = True do not satisfy the win criteria.
+    """
+
+    def __init__(self, reelstrip_id: str, stops: np.ndarray, boards: np.ndarray) -> None:
+        self.reelstrip_id = reelstrip_id
+        self.stops = stops
+        self.boards = boards
+        self.total_win = np.zeros(len(stops))
+        self.fallback = np.zeros(len(stops), dtype=bool)
+        self.rejected = np.zeros(len(stops), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.stops)
+
+    def get_summary(self) -> Dict[str, float]:
+        """RTP and hit-rate information for boards resolved in the batch."""
+        resolved = ~self.fallback & ~self.rejected
+        num_resolved = int(resolved.sum())
+        wins = self.total_win[resolved]
+        return {
+            "boards": len(self),
+            "resolved": num_resolved,
+            "fallback": int(self.fallback.sum()),
+            "rejected": int(self.rejected.sum()),
+            "rtp": float(wins.sum() / num_resolved) if num_resolved > 0 else 0.0,
+            "hit_rate": float((wins > 0).sum() / max(num_resolved, 1)),
+        }
@@ -1,8 +1,12 @@
 """Handles generating game-boards from reelstrips"""
 
-import random
-from typing import List
+from collections import deque
+from typing import List, Tuple
+import numpy as np
 from src.state.state import GeneralGameState
+from src.calculations.batch import BoardBatch, get_reel_windows
+from src.calculations.lines_engine import get_lines_batch
+from src.calculations.ways_engine import get_ways_batch
 from src.calculations.statistics import get_random_outcome
 from src.events.events import reveal_event
 
@@ -11,20 +15,32 @@ class Board(GeneralGameState):
     """Handles generation of a game board and symbols"""
 
     def create_board_reelstrips(self) -> None:
-        """Randomly selects stopping positions from a reelstrip."""
+        """Randomly selects stopping positions from a reelstrip, or uses a board queued by queue_batched_board()."""
+        if self.queued_board is not None and self.gametype == self.config.basegame_type:
+            reelstrip_id, reel_positions = self.queued_board
+            self.queued_board = None
+            self.create_board_from_stops(reelstrip_id, reel_positions)
+            return
+        reelstrip_id = get_random_outcome(
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
+        )
+        reelstrip = self.config.reels[reelstrip_id]
+        reel_positions = [self.rng.randrange(0, len(reelstrip[reel])) for reel in range(self.config.num_reels)]
+        self.create_board_from_stops(reelstrip_id, reel_positions)
+
+    def create_board_from_stops(self, reelstrip_id: str, reel_positions: List[int]) -> None:
+        """Creates a gameboard from the exact (top row) stopping position of every reel."""
         if self.config.include_padding:
             top_symbols = []
             bottom_symbols = []
         self.refresh_special_syms()
-        self.reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
-        )
+        self.reelstrip_id = reelstrip_id
         self.reelstrip = self.config.reels[self.reelstrip_id]
         anticipation = [0] * self.config.num_reels
         board = [[]] * self.config.num_reels
         for i in range(self.config.num_reels):
             board[i] = [0] * self.config.num_rows[i]
-        reel_positions = [random.randrange(0, len(self.reelstrip[reel])) for reel in range(self.config.num_reels)]
+        reel_positions = [int(pos) for pos in reel_positions]
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
         for reel in range(self.config.num_reels):
@@ -67,6 +83,7 @@ class Board(GeneralGameState):
                 raise RuntimeError
 
         self.board = board
+        self.update_board_arrays()
         self.get_special_symbols_on_board()
         self.reel_positions = reel_positions
         self.padding_position = padding_positions
@@ -90,10 +107,10 @@ class Board(GeneralGameState):
 
         reel_positions = [None] * self.config.num_reels
         for r, s in force_stop_positions.items():
-            reel_positions[r] = s - random.randint(0, self.config.num_rows[r] - 1)
+            reel_positions[r] = s - self.rng.randint(0, self.config.num_rows[r] - 1)
         for r, _ in enumerate(reel_positions):
             if reel_positions[r] is None:
-                reel_positions[r] = random.randrange(0, len(self.reelstrip[r]))
+                reel_positions[r] = self.rng.randrange(0, len(self.reelstrip[r]))
 
         padding_positions = [0] * self.config.num_reels
         first_scatter_reel = -1
@@ -134,6 +151,7 @@ class Board(GeneralGameState):
                 count += 1
 
         self.board = board
+        self.update_board_arrays()
         self.reel_positions = reel_positions
         self.padding_position = padding_positions
         self.anticipation = anticipation
@@ -141,6 +159,111 @@ class Board(GeneralGameState):
             self.top_symbols = top_symbols
             self.bottom_symbols = bottom_symbols
 
+    def update_board_arrays(self) -> None:
+        """Integer-code the active board into board_ids (symbol ids) and board_mults (multiplier values)."""
+        self.board_ids, self.board_mults = self.symbol_table.encode_board(self.board)
+
+    def update_board_position(self, reel: int, row: int) -> None:
+        """Re-encode a single board position after a symbol has been replaced or modified."""
+        sym = self.board[reel][row]
+        self.board_ids[reel, row] = self.symbol_table.ids[sym.name]
+        self.board_mults[reel, row] = self.symbol_table.get_multiplier_value(sym)
+        if reel < len(getattr(self, "special_syms_scanned_reels", [])):
+            self.special_syms_scanned_reels[reel] = None
+
+    def draw_board_batch(
+        self,
+        num_boards: int,
+        reelstrip_id: str = None,
+        fallback_symbols: List[str] = None,
+        trigger_symbol: str = "scatter",
+        generator: np.random.Generator = None,
+    ) -> BoardBatch:
+        """Draw and evaluate many boards at once for simple (no feature) spins, using gamestate.rng.
+
+        Wins are evaluated in bulk for config.win_type "lines" or "ways", without symbol multipliers.
+        Boards triggering a freegame or containing fallback_symbols (default: symbols with registered
+        special_symbol_functions) are flagged in BoardBatch.fallback and should be rebuilt with
+        create_board_from_stops() and evaluated per-simulation. Other boards failing the current distribution's
+        win criteria are flagged in BoardBatch.rejected. Stops are drawn from generator if given, otherwise from
+        gamestate.rng.get_numpy_generator().
+        """
+        if reelstrip_id is None:
+            reelstrip_id = get_random_outcome(
+                self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
+            )
+        if fallback_symbols is None:
+            fallback_symbols = list(self.special_symbol_functions.keys())
+
+        reel_windows = get_reel_windows(self.config, reelstrip_id)
+        if generator is None:
+            generator = self.rng.get_numpy_generator()
+        stops = reel_windows.draw_stops(num_boards, generator)
+        batch = BoardBatch(reelstrip_id, stops, reel_windows.get_boards(stops))
+
+        match self.config.win_type:
+            case "lines":
+                batch.total_win = get_lines_batch(batch.boards, self.config, self.symbol_table)
+            case "ways":
+                batch.total_win = get_ways_batch(batch.boards, self.config, self.symbol_table)
+            case _:
+                raise RuntimeError(f"Batch evaluation is not supported for win_type: {self.config.win_type}")
+
+        lookup_ids = np.append(np.zeros(self.symbol_table.num_symbols, dtype=bool), False)
+        for name in fallback_symbols:
+            lookup_ids[self.symbol_table.ids[name]] = True
+        batch.fallback |= lookup_ids[batch.boards].any(axis=(1, 2))
+
+        if trigger_symbol in self.config.special_symbols and self.gametype in self.config.freespin_triggers:
+            trigger_mask = np.append(self.symbol_table.get_special_mask(trigger_symbol), False)
+            num_triggers = trigger_mask[batch.boards].sum(axis=(1, 2))
+            batch.fallback |= num_triggers >= min(self.config.freespin_triggers[self.gametype].keys())
+
+        win_criteria = self.get_current_betmode_distributions().get_win_criteria()
+        if win_criteria is not None:
+            batch.rejected = ~batch.fallback & (np.round(batch.total_win, 2) != win_criteria)
+
+        return batch
+
+    def draw_batched_boards(self, num_boards: int) -> List[Tuple[str, List[int]]]:
+        """
+        Draw num_boards base-game boards for the current criteria, each from a reelstrip drawn with the criteria's
+        reel_weights. Returns the (reelstrip_id, reel_positions) of boards which are not rejected, in draw order.
+        """
+        reel_weights = self.get_current_distribution_conditions()["reel_weights"][self.config.basegame_type]
+        reelstrip_ids = list(reel_weights.keys())
+        weights = np.array(list(reel_weights.values()), dtype=np.float64)
+        generator = self.rng.get_batch_generator()
+        drawn_reelstrips = generator.choice(len(reelstrip_ids), size=num_boards, p=weights / weights.sum())
+
+        boards = [None] * num_boards
+        for reelstrip_index, reelstrip_id in enumerate(reelstrip_ids):
+            board_indexes = np.flatnonzero(drawn_reelstrips == reelstrip_index)
+            if len(board_indexes) == 0:
+                continue
+            batch = self.draw_board_batch(len(board_indexes), reelstrip_id, generator=generator)
+            for board_index, stops, rejected in zip(board_indexes, batch.stops.tolist(), batch.rejected):
+                if not rejected:
+                    boards[board_index] = (reelstrip_id, stops)
+        return [board for board in boards if board is not None]
+
+    def queue_batched_board(self, sim: int, simulation_seed: int = None) -> None:
+        """
+        Queue a board drawn in bulk (config.base_board_batch_size at a time) for the current criteria, used by the
+        simulation's first base-game create_board_reelstrips() call. Boards are only queued for criteria without
+        force_freegame, if no board remains the simulation draws its own.
+        """
+        self.queued_board = None
+        if self.get_current_distribution_conditions()["force_freegame"]:
+            return
+        boards = self.batched_boards.setdefault(self.criteria, deque())
+        if len(boards) == 0:
+            self.reset_seed(sim, simulation_seed)
+            self.gametype = self.config.basegame_type
+            boards.extend(self.draw_batched_boards(self.config.base_board_batch_size))
+        if len(boards) > 0:
+            self.queued_board = boards.popleft()
+
     def create_symbol(self, name: str) -> object:
         """Create a new symbol and assign relevant attributes."""
         if name not in self.symbol_storage.symbols:
@@ -157,16 +280,54 @@ class Board(GeneralGameState):
         self.special_syms_on_board = {}
         for s in self.config.special_symbols:
             self.special_syms_on_board[s] = []
+        self.special_syms_by_reel = []
+        self.special_syms_scanned_reels = []
 
     def get_special_symbols_on_board(self) -> None:
         """Scans board for any active special symbols."""
+        special_syms_by_reel = [self.scan_reel_special_symbols(reel) for reel in range(len(self.board))]
+        self.set_special_symbols_from_reels(special_syms_by_reel)
+
+    def scan_reel_special_symbols(self, reel: int) -> list:
+        """Return (special type, row) pairs for a single reel, in row order."""
+        found = []
+        for row, sym in enumerate(self.board[reel]):
+            if sym.special:
+                for specialType in self.config.special_symbols:
+                    if sym.check_attribute(specialType):
+                        found.append((specialType, row))
+        return found
+
+    def set_special_symbols_from_reels(self, special_syms_by_reel: list) -> None:
+        """Rebuild special_syms_on_board from per-reel scan results, recording the scanned symbols of each reel."""
         self.refresh_special_syms()
-        for reel, _ in enumerate(self.board):
-            for row, _ in enumerate(self.board[reel]):
-                if self.board[reel][row].special:
-                    for specialType in list(self.special_syms_on_board.keys()):
-                        if self.board[reel][row].check_attribute(specialType):
-                            self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
+        self.special_syms_by_reel = special_syms_by_reel
+        self.special_syms_scanned_reels = [tuple(column) for column in self.board]
+        for reel, found in enumerate(special_syms_by_reel):
+            for specialType, row in found:
+                self.special_syms_on_board[specialType].append({"reel": reel, "row": row})
+
+    def update_special_symbols_on_reels(self, reels: List[int]) -> None:
+        """Rescan the given reels for special symbols, along with any other reel changed since the last scan.
+
+        Other reels keep their previous results only if they hold the same symbol objects as when scanned
+        and were not re-encoded through update_board_position().
+        """
+        special_syms_by_reel = getattr(self, "special_syms_by_reel", [])
+        scanned_reels = getattr(self, "special_syms_scanned_reels", [])
+        if len(special_syms_by_reel) != len(self.board) or len(scanned_reels) != len(self.board):
+            self.get_special_symbols_on_board()
+            return
+        for reel, column in enumerate(self.board):
+            scanned = scanned_reels[reel]
+            if (
+                reel in reels
+                or scanned is None
+                or len(scanned) != len(column)
+                or any(sym is not scanned_sym for sym, scanned_sym in zip(column, scanned))
+            ):
+                special_syms_by_reel[reel] = self.scan_reel_special_symbols(reel)
+        self.set_special_symbols_from_reels(special_syms_by_reel)
 
     def transpose_board_string(self, board_string: List[List[str]]) -> List[List[str]]:
         """Transpose symbol names in the format displayed to the player during the game."""
@@ -199,7 +360,9 @@ class Board(GeneralGameState):
             self.get_current_distribution_conditions()["force_freegame"]
             and self.gametype == self.config.basegame_type
         ):
-            num_scatters = get_random_outcome(self.get_current_distribution_conditions()["scatter_triggers"])
+            num_scatters = get_random_outcome(
+                self.get_current_distribution_conditions()["scatter_triggers"], rng=self.rng
+            )
             self.force_special_board(trigger_symbol, num_scatters)
         elif (
             not (self.get_current_distribution_conditions()["force_freegame"])
@@ -247,7 +410,7 @@ class Board(GeneralGameState):
         Helper function for forcing special (or name specific) symbols
         """
         reelstrip_id = get_random_outcome(
-            self.get_current_distribution_conditions()["reel_weights"][self.gametype]
+            self.get_current_distribution_conditions()["reel_weights"][self.gametype], rng=self.rng
         )
         reelstops = self.get_syms_on_reel(reelstrip_id, force_criteria)
 
@@ -258,8 +421,8 @@ class Board(GeneralGameState):
         while len(force_stop_positions) != num_force_syms:
             possible_reels = [i for i in range(self.config.num_reels) if sym_prob[i] > 0]
             possible_probs = [p for p in sym_prob if p > 0]
-            chosen_reel = random.choices(possible_reels, possible_probs)[0]
-            chosen_stop = random.choice(reelstops[chosen_reel])
+            chosen_reel = self.rng.choices(possible_reels, possible_probs)[0]
+            chosen_stop = self.rng.choice(reelstops[chosen_reel])
             sym_prob[chosen_reel] = 0
             force_stop_positions[int(chosen_reel)] = int(chosen_stop)
 
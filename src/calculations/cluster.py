@@ -1,23 +1,26 @@
 from collections import defaultdict
 from abc import ABC
-from typing import List, Dict
-from src.calculations.board import Board
+from typing import List, Tuple
+import numpy as np
 from src.calculations.symbol import Symbol
 from src.config.config import Config
+from src.config.compiled_config import get_compiled_paytable
 from src.wins.multiplier_strategy import apply_mult
 
 
 class Cluster:
     """Collection of cluster-evaluation functions."""
 
+    _neighbour_index = {}
+
     @staticmethod
-    def get_central_cluster_position(winning_positions: List[Dict]) -> tuple:
+    def get_central_cluster_position(winning_positions: List[Tuple[int, int]]) -> tuple:
         """Return position on screen to display win amount."""
         all_reels = []
         all_rows = []
-        for pos in winning_positions:
-            all_reels.append(pos["reel"])
-            all_rows.append(pos["row"])
+        for reel, row in winning_positions:
+            all_reels.append(reel)
+            all_rows.append(row)
 
         reel_to_overlay = int(round(sum(all_reels) / len(all_rows)))
         row_to_overlay = int(round(sum(all_rows) / len(all_rows)))
@@ -25,84 +28,94 @@ class Cluster:
         return (reel_to_overlay, row_to_overlay)
 
     @staticmethod
-    def get_neighbours(board: list[list[Symbol]], reel: int, row: int, local_checked: list) -> list:
-        """All neighbouring symbols within board range."""
-        neighbours = []
-        if reel > 0:
-            if (reel - 1, row) not in local_checked:
-                neighbours += [(reel - 1, row)]
-                local_checked += [(reel - 1, row)]
-        if reel < len(board) - 1:
-            if (reel + 1, row) not in local_checked:
-                neighbours += [(reel + 1, row)]
-                local_checked += [(reel + 1, row)]
-        if row > 0:
-            if (reel, row - 1) not in local_checked:
-                neighbours += [(reel, row - 1)]
-                local_checked += [(reel, row - 1)]
-        if row < len(board[reel]) - 1:
-            if (reel, row + 1) not in local_checked:
-                neighbours += [(reel, row + 1)]
-                local_checked += [(reel, row + 1)]
-        return neighbours
+    def get_neighbour_index(board: list[list[Symbol]]) -> tuple:
+        """
+        Flat-index layout of a board: (positions, neighbours), cached by board shape.
 
-    @staticmethod
-    def in_cluster(board: list[list[Symbol]], reel: int, row: int, og_symbol: str, wild_key: str = "wild") -> bool:
-        """Checks if a symbol (including wilds) match cluster type."""
-        if board[reel][row].check_attribute(wild_key) or og_symbol == board[reel][row].name:
-            return True
+        positions[idx] is the (reel, row) of flat index idx (reel-major), neighbours[idx] lists the flat indices
+        of the positions left, right, above and below it, in that order.
+        """
+        shape = tuple(len(column) for column in board)
+        layout = Cluster._neighbour_index.get(shape)
+        if layout is None:
+            positions = [(reel, row) for reel, num_rows in enumerate(shape) for row in range(num_rows)]
+            flat_index = {pos: idx for idx, pos in enumerate(positions)}
+            neighbours = []
+            for reel, row in positions:
+                candidates = []
+                if reel > 0:
+                    candidates.append((reel - 1, row))
+                if reel < len(shape) - 1:
+                    candidates.append((reel + 1, row))
+                if row > 0:
+                    candidates.append((reel, row - 1))
+                if row < shape[reel] - 1:
+                    candidates.append((reel, row + 1))
+                neighbours.append([flat_index[pos] for pos in candidates if pos in flat_index])
+            layout = (positions, neighbours)
+            Cluster._neighbour_index[shape] = layout
+        return layout
 
     @staticmethod
-    def check_all_neighbours(
-        board: Board,
-        already_checked: list,
-        local_checked: list,
-        potential_cluster: list,
-        reel,
-        row,
-        og_symbol: str,
-        wild_key: str = "wild",
-    ):
-        """Recursively check neighbours for like-symbols."""
-        neighbours = Cluster.get_neighbours(board, reel, row, local_checked)
-        for reel_, row_ in neighbours:
-            if Cluster.in_cluster(board, reel_, row_, og_symbol, wild_key):
-                potential_cluster += [(reel_, row_)]
-                already_checked += [(reel_, row_)]
-                Cluster.check_all_neighbours(
-                    board,
-                    already_checked,
-                    local_checked,
-                    potential_cluster,
-                    reel_,
-                    row_,
-                    og_symbol,
-                    wild_key,
-                )
+    def flood_fill(names: list, is_wild: list, neighbours: list, already_checked: list, seeds: list = None) -> list:
+        """
+        Iterative flood-fill over flat name and wild arrays, returns [(seed index, symbol, [flat indices])].
+
+        Wilds are never cluster seeds but may join any number of clusters. Seeds are tried in increasing order of
+        position (all positions by default), skipping positions with already_checked = True.
+        Cluster positions are listed in depth-first order, visiting neighbours in get_neighbour_index() order.
+        """
+        # local_checked: id of the last cluster which reached a position, so it is reset in O(1) per cluster
+        local_checked = [0] * len(names)
+        found = []
+        cluster_id = 0
+
+        def claim_neighbours(idx: int) -> list:
+            """Unchecked neighbours of a position, marked as checked for the current cluster."""
+            claimed = [nb for nb in neighbours[idx] if local_checked[nb] != cluster_id]
+            for nb in claimed:
+                local_checked[nb] = cluster_id
+            return claimed
+
+        for start in range(len(names)) if seeds is None else seeds:
+            if already_checked[start] or is_wild[start]:
+                continue
+            symbol = names[start]
+            already_checked[start] = True
+            for idx in neighbours[start]:
+                if is_wild[idx] or names[idx] == symbol:
+                    break
+            else:
+                # Isolated symbol, no neighbours to claim
+                found.append((start, symbol, [start]))
+                continue
+
+            cluster_id += 1
+            local_checked[start] = cluster_id
+            cells = [start]
+            stack = [iter(claim_neighbours(start))]
+            while stack:
+                for idx in stack[-1]:
+                    if is_wild[idx] or names[idx] == symbol:
+                        cells.append(idx)
+                        already_checked[idx] = True
+                        stack.append(iter(claim_neighbours(idx)))
+                        break
+                else:
+                    stack.pop()
+            found.append((start, symbol, cells))
+
+        return found
 
     @staticmethod
     def get_clusters(board: list[list[Symbol]], wild_key: str = "wild") -> dict:
         """Return all symbol clusters of size >= 1."""
-        already_checked = []
+        positions, neighbours = Cluster.get_neighbour_index(board)
+        names = [sym.name for column in board for sym in column]
+        is_wild = [sym.check_attribute(wild_key) for column in board for sym in column]
         clusters = defaultdict(list)
-        for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                if (reel, row) not in already_checked and not (board[reel][row].check_attribute(wild_key)):
-                    potential_cluster = [(reel, row)]
-                    already_checked += [(reel, row)]
-                    local_checked = [(reel, row)]
-                    symbol = board[reel][row].name
-                    Cluster.check_all_neighbours(
-                        board,
-                        already_checked,
-                        local_checked,
-                        potential_cluster,
-                        reel,
-                        row,
-                        symbol,
-                        wild_key,
-                    )
-                    clusters[symbol].append(potential_cluster)
+        for _, symbol, cells in Cluster.flood_fill(names, is_wild, neighbours, [False] * len(names)):
+            clusters[symbol].append([positions[idx] for idx in cells])
 
         return clusters
 
@@ -116,30 +129,28 @@ class Cluster:
         return_data: dict = {"totalWin": 0, "wins": []},
     ) -> type:
         """Determine payout amount from cluster, including symbol multiplier and global multiplier value."""
-        exploding_symbols = []
         total_win = 0
+        get_payout = get_compiled_paytable(config).get_payout
         for sym in clusters:
             for cluster in clusters[sym]:
                 syms_in_cluster = len(cluster)
-                if (syms_in_cluster, sym) in config.paytable:
+                sym_win = get_payout(syms_in_cluster, sym)
+                if sym_win:
                     cluster_mult = 0
                     for positions in cluster:
                         if board[positions[0]][positions[1]].check_attribute(multiplier_key):
                             if int(board[positions[0]][positions[1]].get_attribute(multiplier_key)) > 0:
                                 cluster_mult += board[positions[0]][positions[1]].get_attribute(multiplier_key)
                     cluster_mult = max(cluster_mult, 1)
-                    sym_win = config.paytable[(syms_in_cluster, sym)]
                     symwin_mult = sym_win * cluster_mult * global_multiplier
                     total_win += symwin_mult
-                    json_positions = [{"reel": p[0], "row": p[1]} for p in cluster]
-
-                    central_pos = Cluster.get_central_cluster_position(json_positions)
+                    central_pos = Cluster.get_central_cluster_position(cluster)
                     return_data["wins"] += [
                         {
                             "symbol": sym,
                             "clusterSize": syms_in_cluster,
                             "win": symwin_mult,
-                            "positions": json_positions,
+                            "positions": cluster,
                             "meta": {
                                 "globalMult": global_multiplier,
                                 "clusterMult": cluster_mult,
@@ -151,14 +162,82 @@ class Cluster:
 
                     for positions in cluster:
                         board[positions[0]][positions[1]].explode = True
-                        if {
-                            "reel": positions[0],
-                            "row": positions[1],
-                        } not in exploding_symbols:
-                            exploding_symbols.append({"reel": positions[0], "row": positions[1]})
 
         return board, return_data, total_win
 
+    @staticmethod
+    def create_position_multiplier_grid(num_rows: List[int]) -> np.ndarray:
+        """Grid of zeroed position multipliers, shape [reel, row] padded to the tallest reel."""
+        return np.zeros((len(num_rows), max(num_rows)), dtype=np.int64)
+
+    @staticmethod
+    def get_cluster_grid_sums(position_multipliers: np.ndarray, clusters: List[list]) -> List[int]:
+        """Sum of the position multipliers under each cluster, gathered for all clusters at once."""
+        if len(clusters) == 0:
+            return []
+        reels, rows = np.array([pos for cluster in clusters for pos in cluster]).T
+        starts = np.cumsum([0] + [len(cluster) for cluster in clusters[:-1]])
+        return np.add.reduceat(position_multipliers[reels, rows], starts).tolist()
+
+    @staticmethod
+    def evaluate_clusters_with_grid(
+        config: Config,
+        board: list[list[Symbol]],
+        clusters: dict,
+        position_multipliers: np.ndarray,
+        global_multiplier: int = 1,
+        return_data: dict = {"totalWin": 0, "wins": []},
+    ) -> type:
+        """
+        Determine payout amount from cluster, where the cluster multiplier is the sum of the position multipliers
+        under the cluster (minimum 1), applied along with the global multiplier.
+        """
+        total_win = 0
+        get_payout = get_compiled_paytable(config).get_payout
+        paying = [(sym, cluster, get_payout(len(cluster), sym)) for sym in clusters for cluster in clusters[sym]]
+        paying = [(sym, cluster, sym_win) for sym, cluster, sym_win in paying if sym_win]
+        grid_sums = Cluster.get_cluster_grid_sums(position_multipliers, [cluster for _, cluster, _ in paying])
+        for (sym, cluster, sym_win), grid_sum in zip(paying, grid_sums):
+            grid_mult = max(grid_sum, 1)
+            symwin_mult = sym_win * grid_mult * global_multiplier
+            total_win += symwin_mult
+            central_pos = Cluster.get_central_cluster_position(cluster)
+            return_data["wins"] += [
+                {
+                    "symbol": sym,
+                    "clusterSize": len(cluster),
+                    "win": symwin_mult,
+                    "positions": cluster,
+                    "meta": {
+                        "globalMult": global_multiplier,
+                        "clusterMult": grid_mult,
+                        "winWithoutMult": sym_win,
+                        "overlay": {"reel": central_pos[0], "row": central_pos[1]},
+                    },
+                }
+            ]
+            for reel, row in cluster:
+                board[reel][row].explode = True
+
+        return board, return_data, total_win
+
+    @staticmethod
+    def update_position_multipliers(position_multipliers: np.ndarray, wins: List[dict], max_multiplier: int) -> None:
+        """
+        Activate (set to 1) winning positions with no multiplier, and increment the multiplier of active winning
+        positions, capped at max_multiplier. A position in several wins is updated once per win.
+        """
+        positions = [pos for win in wins for pos in win["positions"]]
+        if len(positions) == 0:
+            return
+        reels, rows = np.array(positions).T
+        hits = np.zeros_like(position_multipliers)
+        np.add.at(hits, (reels, rows), 1)
+        won = hits > 0
+        previous = position_multipliers[won]
+        # An inactive position is set to 1 by its first win, so k wins leave it at k
+        position_multipliers[won] = np.minimum(np.where(previous == 0, hits[won], previous + hits[won]), max_multiplier)
+
     @staticmethod
     def get_cluster_data(
         config: Config,
@@ -198,3 +277,68 @@ class Cluster:
                     "gametype": gamestate.gametype,
                 }
             )
+
+
+class ClusterTracker:
+    """
+    Cluster detection which keeps connectivity state between evaluations of boards with the same shape.
+
+    Positions holding the same Symbol object as in the previous call (such as symbols in reels which did not tumble)
+    are not re-read. Previous clusters which do not touch a changed position or its neighbours are reused as they
+    are, and flood-fills only start from the remaining positions. The result is identical to Cluster.get_clusters().
+    Call reset() if symbol names or wild attributes are modified in place rather than by replacing the Symbol.
+    """
+
+    def __init__(self, wild_key: str = "wild") -> None:
+        self.wild_key = wild_key
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the previous board, the next evaluation examines every position."""
+        self.shape = None
+        self.symbols = []
+        self.names = []
+        self.is_wild = []
+        self.found = []
+
+    def get_clusters(self, board: list[list[Symbol]]) -> dict:
+        """Return all symbol clusters of size >= 1, re-examining only positions around changed symbols."""
+        positions, neighbours = Cluster.get_neighbour_index(board)
+        symbols = [sym for column in board for sym in column]
+        shape = tuple(len(column) for column in board)
+        changed = []
+        if shape == self.shape:
+            changed = [idx for idx, sym in enumerate(symbols) if sym is not self.symbols[idx]]
+        self.symbols = symbols
+
+        already_checked = [False] * len(symbols)
+        if shape != self.shape or len(changed) == len(symbols):
+            self.shape = shape
+            self.names = [sym.name for sym in symbols]
+            self.is_wild = [sym.check_attribute(self.wild_key) for sym in symbols]
+            kept, seeds = [], None
+        else:
+            dirty = set(changed)
+            for idx in changed:
+                self.names[idx] = symbols[idx].name
+                self.is_wild[idx] = symbols[idx].check_attribute(self.wild_key)
+                dirty.update(neighbours[idx])
+            kept, seeds = [], set(changed)
+            for cluster in self.found:
+                if dirty.isdisjoint(cluster[2]):
+                    kept.append(cluster)
+                else:
+                    seeds.update(cluster[2])
+            for _, _, cells in kept:
+                for idx in cells:
+                    already_checked[idx] = True
+            seeds = sorted(seeds)
+
+        # Clusters are ordered by seed position, matching the scan order of a full evaluation
+        found = kept + Cluster.flood_fill(self.names, self.is_wild, neighbours, already_checked, seeds)
+        self.found = sorted(found, key=lambda cluster: cluster[0])
+        clusters = defaultdict(list)
+        for _, symbol, cells in self.found:
+            clusters[symbol].append([positions[idx] for idx in cells])
+
+        return clusters
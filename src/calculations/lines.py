@@ -1,8 +1,10 @@
 """Evaluates and records winds for lines games."""
 
+import numpy as np
 from src.calculations.symbol import Symbol
+from src.calculations.lines_engine import get_lines_engine
 from src.config.config import Config
-from src.wins.multiplier_strategy import apply_mult
+from src.wins.multiplier_strategy import get_multiplier_strategy, get_position_multipliers
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -32,88 +34,62 @@ class Lines:
         wild_sym: str = "W",
         multiplier_method: str = "symbol",
         global_multiplier: int = 1,
+        board_mults: np.ndarray = None,
     ):
-        """More efficient lines calculation"""
+        """
+        Evaluate line-wins using the compiled paylines engine. Symbol multipliers are read from board_mults
+        (the gamestate's encoded board) if given, otherwise from the symbols on the board.
+        """
         return_data = {
             "totalWin": 0,
             "wins": [],
         }
-
-        for line_index in config.paylines.keys():
+        engine = get_lines_engine(config, wild_key, wild_sym)
+        strategy = get_multiplier_strategy(multiplier_method)
+        for line_num, wild_matches, kind, target_name, wild_win, base_win in engine.get_line_wins(board):
+            line_index = engine.payline_ids[line_num]
             line = config.paylines[line_index]
-            first_sym = board[0][line[0]]
-            finished_wild_win = False if first_sym.check_attribute(wild_key) else True
-            first_non_wild = first_sym if finished_wild_win else None
-            potential_line = [first_sym]
-
-            wild_matches = 0 * (finished_wild_win) + 1 * (not (finished_wild_win))
-            matches = 1 * (finished_wild_win) + 0 * (not (finished_wild_win))
-            base_win, wild_win = 0, 0
-
-            for reel in range(1, len(line)):
-                sym = board[reel][line[reel]]
-                if finished_wild_win:
-                    if sym.name == first_non_wild.name or sym.check_attribute(wild_key):
-                        matches += 1
-                    else:
-                        break
-                else:
-                    if sym.check_attribute(wild_key) and first_non_wild is None:
-                        wild_matches += 1
-                    elif first_non_wild is None:
-                        first_non_wild = sym
-                        matches += 1
-                        finished_wild_win = True
-                    else:
-                        break
-                potential_line.append(sym)
-
-            if (wild_matches, wild_sym) in config.paytable:
-                wild_win = config.paytable[(wild_matches, wild_sym)]
-            if first_non_wild is not None:
-                if (wild_matches + matches, first_non_wild.name) in config.paytable:
-                    base_win = config.paytable[(wild_matches + matches, first_non_wild.name)]
-
-            if base_win > 0 or wild_win > 0:
-                if wild_win > base_win:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, wild_matches)]
-                    line_win, applied_mult = apply_mult(
-                        board, multiplier_method, global_multiplier=global_multiplier, win_amount=wild_win, positions=positions
-                    )
-                    win_dict = Lines.line_win_info(
-                        potential_line[0].name,
-                        wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": wild_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
-                    )
-                else:
-                    positions = [{"reel": idx, "row": line[idx]} for idx in range(0, matches + wild_matches)]
-                    line_win, applied_mult = apply_mult(
-                        board, multiplier_method, global_multiplier=global_multiplier, win_amount=base_win, positions=positions
-                    )
-                    win_dict = Lines.line_win_info(
-                        first_non_wild.name,
-                        matches + wild_matches,
-                        line_win,
-                        positions,
-                        {
-                            "lineIndex": line_index,
-                            "multiplier": applied_mult,
-                            "winWithoutMult": base_win,
-                            "globalMult": int(global_multiplier),
-                            "lineMultiplier": int(applied_mult / global_multiplier),
-                        },
-                    )
-
-                return_data["totalWin"] += line_win
-                return_data["wins"].append(win_dict)
+            if wild_win > base_win:
+                positions = [(idx, line[idx]) for idx in range(0, wild_matches)]
+                multipliers = ()
+                if strategy.uses_symbol_mults:
+                    multipliers = get_position_multipliers(board, positions, board_mults=board_mults)
+                line_win, applied_mult = strategy(wild_win, global_multiplier, multipliers)
+                win_dict = Lines.line_win_info(
+                    board[0][line[0]].name,
+                    wild_matches,
+                    line_win,
+                    positions,
+                    {
+                        "lineIndex": line_index,
+                        "multiplier": applied_mult,
+                        "winWithoutMult": wild_win,
+                        "globalMult": int(global_multiplier),
+                        "lineMultiplier": int(applied_mult / global_multiplier),
+                    },
+                )
+            else:
+                positions = [(idx, line[idx]) for idx in range(0, kind)]
+                multipliers = ()
+                if strategy.uses_symbol_mults:
+                    multipliers = get_position_multipliers(board, positions, board_mults=board_mults)
+                line_win, applied_mult = strategy(base_win, global_multiplier, multipliers)
+                win_dict = Lines.line_win_info(
+                    target_name,
+                    kind,
+                    line_win,
+                    positions,
+                    {
+                        "lineIndex": line_index,
+                        "multiplier": applied_mult,
+                        "winWithoutMult": base_win,
+                        "globalMult": int(global_multiplier),
+                        "lineMultiplier": int(applied_mult / global_multiplier),
+                    },
+                )
+
+            return_data["totalWin"] += line_win
+            return_data["wins"].append(win_dict)
 
         return return_data
 
@@ -0,0 +1,182 @@
+"""Compiled payline evaluation over integer-coded boards, used by Lines and bulk board generation."""
+
+from typing import List
+from operator import itemgetter
+import numpy as np
+from src.calculations.symbol import Symbol, SymbolTable, get_symbol_table
+from src.config.compiled_config import get_compiled_config, get_compiled_paytable
+from src.calculations.win_cache import WinCache, register_win_cache
+
+
+class LinesEngine:
+    """
+    Compiled payline evaluation over integer-coded boards.
+
+    Boards are flattened reel by reel and every payline becomes a row of flat board indices, terminated by a
+    sentinel position which is never wild and never matches. The number of leading wilds and the left-to-right
+    match length (wilds substituting for the first non-wild symbol) are then the first False entries along each
+    line, following the rules of Lines.get_lines.
+    """
+
+    def __init__(self, config: object, wild_key: str = "wild", wild_sym: str = "W") -> None:
+        self.symbol_table = get_symbol_table(config)
+        self.compiled_config = get_compiled_config(config)
+        self.compiled_paytable = get_compiled_paytable(config)
+        self.config_paytable = config.paytable
+        self.wild_key = wild_key
+        self.payline_ids = self.compiled_config.payline_ids
+        paylines = np.asarray(self.compiled_config.paylines)
+        self.num_reels = paylines.shape[1]
+        self.num_rows = list(config.num_rows)
+
+        # Paytable padded so every match length (including the sentinel) is a valid column, plus a zero row for -1
+        paytable = self.compiled_paytable.dense
+        width = max(paytable.shape[1], self.num_reels + 2)
+        self.paytable = np.zeros((paytable.shape[0] + 1, width), dtype=np.float64)
+        self.paytable[: paytable.shape[0], : paytable.shape[1]] = paytable
+        self.wild_mask = np.append(self.symbol_table.get_special_mask(wild_key), False)
+        self.wild_pays = self.paytable[self.symbol_table.ids[wild_sym]] if wild_sym in self.symbol_table.ids else None
+
+        reel_offsets = np.cumsum([0] + self.num_rows[:-1])
+        sentinel = np.full((len(paylines), 1), sum(self.num_rows))
+        self.line_index = np.hstack([reel_offsets[None, : self.num_reels] + paylines, sentinel])
+        padded_sentinel = np.full((len(paylines), 1), self.num_reels * max(self.num_rows))
+        self.padded_line_index = np.hstack([np.arange(self.num_reels)[None, :] * max(self.num_rows) + paylines, padded_sentinel])
+        self.lines = np.arange(len(paylines))
+
+        # Optional cache of line results keyed by the (symbol id, wild flag) codes under each payline
+        self.wild_sym = wild_sym
+        self.win_cache = None
+        cache_size = getattr(config, "line_win_cache_size", 0)
+        if cache_size > 0 and len(paylines) > 0:
+            self.win_cache = WinCache(cache_size)
+            register_win_cache(config, f"lines[{wild_key},{wild_sym}]", self.win_cache)
+            self.line_getters = [itemgetter(*(row[:-1].tolist() + [-1])) for row in self.line_index]
+
+    def encode_board(self, board: List[List[Symbol]]) -> tuple:
+        """Flat symbol ids and wild flags of a Symbol board, each followed by the sentinel position."""
+        ids = self.symbol_table.ids
+        wild_key = self.wild_key
+        board_ids = np.array([ids[sym.name] for reel in board for sym in reel] + [-1], dtype=np.int64)
+        is_wild = np.array([sym.check_attribute(wild_key) for reel in board for sym in reel] + [False], dtype=bool)
+        return board_ids, is_wild
+
+    def get_line_wins(self, board: List[List[Symbol]]) -> list:
+        """
+        Winning paylines of a Symbol board as (line number, wild matches, kind, target symbol, wild win, base win),
+        with target None if the line is all wilds and payouts as authored in config.paytable.
+        A line wins with the wild payout if wild win > base win, otherwise with the base win.
+        """
+        if self.win_cache is not None:
+            return self.get_cached_line_wins(board)
+        line_data = self.evaluate(*self.encode_board(board))
+        get_payout = self.compiled_paytable.get_payout
+        names = self.symbol_table.names
+        line_wins = []
+        for line_num in np.flatnonzero((line_data["wild_win"] > 0) | (line_data["base_win"] > 0)).tolist():
+            wild_matches = int(line_data["wild_matches"][line_num])
+            kind = int(line_data["kind"][line_num])
+            target, base_win = None, 0
+            if line_data["has_target"][line_num]:
+                target = names[line_data["target"][line_num]]
+                base_win = get_payout(kind, target)
+            line_wins.append((line_num, wild_matches, kind, target, get_payout(wild_matches, self.wild_sym), base_win))
+        return line_wins
+
+    def get_cached_line_wins(self, board: List[List[Symbol]]) -> list:
+        """get_line_wins() through the line result cache."""
+        ids = self.symbol_table.ids
+        wild_key = self.wild_key
+        wild_offset = self.symbol_table.num_symbols
+        codes = [ids[sym.name] + wild_offset * (getattr(sym, wild_key, False) is not False) for reel in board for sym in reel]
+        # Sentinel code, never wild and never matching
+        codes.append(-1)
+        cache = self.win_cache
+        line_wins = []
+        for line_num, getter in enumerate(self.line_getters):
+            key = getter(codes)
+            result = cache.get(key)
+            if result is None:
+                result = self.evaluate_line_codes(key)
+                cache.put(key, result)
+            if result:
+                line_wins.append((line_num,) + result)
+        return line_wins
+
+    def evaluate_line_codes(self, codes: tuple) -> tuple:
+        """(wild matches, kind, target symbol, wild win, base win) of one payline's codes, or () if it does not pay."""
+        wild_offset = self.symbol_table.num_symbols
+        wild_matches = 0
+        while codes[wild_matches] >= wild_offset:
+            wild_matches += 1
+        target_id = codes[wild_matches]
+        get_payout = self.compiled_paytable.get_payout
+        wild_win = get_payout(wild_matches, self.wild_sym)
+        kind, target, base_win = wild_matches, None, 0
+        if target_id != -1:
+            while codes[kind] == target_id or codes[kind] >= wild_offset:
+                kind += 1
+            target = self.symbol_table.names[target_id]
+            base_win = get_payout(kind, target)
+        if not (wild_win > 0 or base_win > 0):
+            return ()
+        return (wild_matches, kind, target, wild_win, base_win)
+
+    def evaluate(self, board_ids: np.ndarray, is_wild: np.ndarray) -> dict:
+        """
+        Match data and payouts (without multipliers) for each payline of one encoded board.
+
+        A line wins with the wild payout if wild_win > base_win, otherwise with base_win.
+        """
+        line_syms = board_ids[self.line_index]
+        line_wild = is_wild[self.line_index]
+        wild_matches = line_wild.argmin(axis=1)
+        target = line_syms[self.lines, wild_matches]
+        kind = ((line_syms == target[:, None]) | line_wild).argmin(axis=1)
+        has_target = wild_matches < self.num_reels
+        base_win = np.where(has_target, self.paytable[target, kind], 0.0)
+        wild_win = self.wild_pays[wild_matches] if self.wild_pays is not None else np.zeros(len(self.lines))
+        return {
+            "wild_matches": wild_matches,
+            "has_target": has_target,
+            "target": target,
+            "kind": kind,
+            "wild_win": wild_win,
+            "base_win": base_win,
+        }
+
+    def get_total_wins(self, boards: np.ndarray) -> np.ndarray:
+        """Total line-win (without multipliers) for symbol-id boards of shape [board, reel, row] padded with -1."""
+        flat = boards.reshape(len(boards), -1).astype(np.int64)
+        flat = np.hstack([flat, np.full((len(boards), 1), -1)])
+        line_syms = flat[:, self.padded_line_index]
+        line_wild = self.wild_mask[line_syms]
+        wild_matches = line_wild.argmin(axis=2)
+        target = np.take_along_axis(line_syms, wild_matches[..., None], axis=2)
+        kind = ((line_syms == target) | line_wild).argmin(axis=2)
+        has_target = wild_matches < self.num_reels
+        base_win = np.where(has_target, self.paytable[target[..., 0], kind], 0.0)
+        wild_win = self.wild_pays[wild_matches] if self.wild_pays is not None else np.zeros(wild_matches.shape)
+        return np.maximum(wild_win, base_win).sum(axis=1)
+
+
+def get_lines_engine(config: object, wild_key: str = "wild", wild_sym: str = "W") -> LinesEngine:
+    """Return the cached LinesEngine for a config, rebuilt if the paytable is replaced."""
+    if getattr(config, "_lines_engines", None) is None:
+        config._lines_engines = {}
+    engine = config._lines_engines.get((wild_key, wild_sym))
+    if engine is None or engine.config_paytable is not config.paytable:
+        engine = LinesEngine(config, wild_key, wild_sym)
+        config._lines_engines[(wild_key, wild_sym)] = engine
+    return engine
+
+
+def get_lines_batch(
+    boards: np.ndarray,
+    config: object,
+    symbol_table: SymbolTable,
+    wild_key: str = "wild",
+    wild_sym: str = "W",
+) -> np.ndarray:
+    """Total line-win for each board (without symbol multipliers), following Lines.get_lines rules."""
+    return get_lines_engine(config, wild_key, wild_sym).get_total_wins(boards)
@@ -0,0 +1,138 @@
+"""Random number streams used for board generation and distribution draws."""
+
+from bisect import bisect
+from itertools import accumulate
+from typing import List, MutableSequence, Sequence
+import random
+import numpy as np
+
+# Blocks skipped before draws made in bulk ahead of simulations, beyond any simulation's own use of its stream
+BATCH_STREAM_JUMP = 2**128
+
+
+class GameRNG:
+    """
+    Random number source attached to the gamestate.
+
+    mode="compat": draws from the global `random` module, reproducing previously published books bit-for-bit.
+    mode="philox": counter-based Philox4x64 stream per simulation. The key is derived directly from the
+    simulation seed and `stream_key`, so any simulation's stream is reproducible without replaying others,
+    and streams are independent of which worker/thread runs them. Uniforms are drawn in blocks.
+    """
+
+    def __init__(self, mode: str = "compat", stream_key: int = 0, buffer_size: int = 64):
+        assert mode in ["compat", "philox"], f"unknown rng mode: {mode}"
+        self.mode = mode
+        self.stream_key = stream_key
+        self.buffer_size = buffer_size
+        self._buffer: List[float] = []
+        self._buffer_pos = 0
+        self.current_seed = 0
+        if self.mode == "philox":
+            self._bit_generator = np.random.Philox(key=np.array([0, stream_key], dtype=np.uint64))
+            self._generator = np.random.Generator(self._bit_generator)
+
+    def seed(self, seed: int) -> None:
+        """Start the stream for a given simulation seed."""
+        self.current_seed = seed
+        if self.mode == "compat":
+            random.seed(seed)
+            return
+        self._bit_generator.state = {
+            "bit_generator": "Philox",
+            "state": {
+                "counter": np.zeros(4, dtype=np.uint64),
+                "key": np.array([seed % 2**64, self.stream_key % 2**64], dtype=np.uint64),
+            },
+            "buffer": np.zeros(4, dtype=np.uint64),
+            "buffer_pos": 4,
+            "has_uint32": 0,
+            "uinteger": 0,
+        }
+        self._buffer = []
+        self._buffer_pos = 0
+
+    def jump(self, delta: int) -> None:
+        """Advance the current stream by delta blocks without generating values."""
+        if self.mode == "compat":
+            raise RuntimeError("Jump-ahead is not available in compat mode.")
+        self._bit_generator.advance(delta)
+        self._buffer = []
+        self._buffer_pos = 0
+
+    def random(self) -> float:
+        """Uniform float on [0, 1)."""
+        if self.mode == "compat":
+            return random.random()
+        if self._buffer_pos >= len(self._buffer):
+            self._buffer = self._generator.random(self.buffer_size).tolist()
+            self._buffer_pos = 0
+        value = self._buffer[self._buffer_pos]
+        self._buffer_pos += 1
+        return value
+
+    def uniform(self, a: float, b: float) -> float:
+        """Uniform float on [a, b]."""
+        if self.mode == "compat":
+            return random.uniform(a, b)
+        return a + (b - a) * self.random()
+
+    def randrange(self, start: int, stop: int = None) -> int:
+        """Uniform integer on [start, stop), or [0, start) if stop is not given."""
+        if self.mode == "compat":
+            return random.randrange(start, stop)
+        if stop is None:
+            start, stop = 0, start
+        if stop <= start:
+            raise ValueError(f"empty range for randrange({start}, {stop})")
+        return start + int(self.random() * (stop - start))
+
+    def randint(self, a: int, b: int) -> int:
+        """Uniform integer on [a, b]."""
+        if self.mode == "compat":
+            return random.randint(a, b)
+        return self.randrange(a, b + 1)
+
+    def choice(self, seq: Sequence) -> object:
+        """Uniformly select an element from a non-empty sequence."""
+        if self.mode == "compat":
+            return random.choice(seq)
+        return seq[self.randrange(len(seq))]
+
+    def choices(self, population: Sequence, weights: Sequence = None, k: int = 1) -> list:
+        """Weighted selection with replacement."""
+        if self.mode == "compat":
+            return random.choices(population, weights, k=k)
+        if weights is None:
+            return [self.choice(population) for _ in range(k)]
+        cum_weights = list(accumulate(weights))
+        total = cum_weights[-1]
+        return [population[bisect(cum_weights, self.random() * total, 0, len(population) - 1)] for _ in range(k)]
+
+    def shuffle(self, x: MutableSequence) -> None:
+        """Shuffle a sequence in place."""
+        if self.mode == "compat":
+            random.shuffle(x)
+            return
+        for i in reversed(range(1, len(x))):
+            j = self.randrange(i + 1)
+            x[i], x[j] = x[j], x[i]
+
+    def get_numpy_generator(self) -> np.random.Generator:
+        """numpy Generator for vectorised draws, continuing the current stream."""
+        if self.mode == "compat":
+            return np.random.default_rng(random.getrandbits(128))
+        self._buffer = []
+        self._buffer_pos = 0
+        return self._generator
+
+    def get_batch_generator(self) -> np.random.Generator:
+        """
+        numpy Generator for boards drawn in bulk ahead of simulations. In philox mode the current stream is first
+        advanced by BATCH_STREAM_JUMP blocks, so bulk draws never reuse the uniforms of the simulation seeded with it.
+        In compat mode the generator is seeded from the current seed and stream_key, leaving the global stream as is.
+        """
+        if self.mode == "compat":
+            return np.random.default_rng([self.current_seed, self.stream_key])
+        self.jump(BATCH_STREAM_JUMP)
+        return self.get_numpy_generator()
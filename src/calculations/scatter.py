@@ -1,8 +1,8 @@
 """Handle win calculation for pay-anywhere games"""
 
-from typing import List, Dict
-from collections import defaultdict
+from typing import List, Tuple
 from src.calculations.symbol import Symbol
+from src.calculations.scatter_engine import get_scatter_engine
 from src.config.config import Config
 
 
@@ -11,14 +11,13 @@ class Scatter:
 
     @staticmethod
     def get_central_scatter_position(
-        rows_for_overlay: List, winning_positions: List[Dict], max_reels: int, max_rows: int
+        rows_for_overlay: List, winning_positions: List[Tuple[int, int]], max_reels: int, max_rows: int
     ) -> tuple:
         """Return position on screen to display win amount."""
         closest_to_middle = 100
         reel_to_overlay = 0
         row_to_overlay = 0
-        for pos in winning_positions:
-            reel, row = pos["reel"], pos["row"]
+        for reel, row in winning_positions:
             dist_from_middle = (reel - max_reels / 2) ** 2 + (row - max_rows / 2) ** 2
             if (
                 dist_from_middle < closest_to_middle
@@ -39,63 +38,45 @@ class Scatter:
         multiplier_key: str = "multiplier",
         global_multiplier: int = 1,
     ) -> dict:
-        """Return win data for all paying symbols"""
+        """Return win data for all paying symbols, from per-symbol counts of the board."""
         return_data = {
             "totalWin": 0,
             "wins": [],
         }
         rows_for_overlay = []
-        symbols_on_board = defaultdict(list)
-        wild_positions = []
         total_win = 0.0
-        for reel_idx, reel in enumerate(board):
-            for row_idx, symbol in enumerate(reel):
-                if symbol.name not in config.special_symbols[wild_key]:
-                    symbols_on_board[symbol.name].append({"reel": reel_idx, "row": row_idx})
-                else:
-                    wild_positions.append({"reel": reel_idx, "row": row_idx})
+        engine = get_scatter_engine(config, wild_key, multiplier_key)
+        groups, explode, flat = engine.evaluate(board)
+        flat_positions = engine.get_positions(board)
 
-        alias_map = getattr(config, "symbol_aliases", {})
-        if alias_map:
-            for original, target in alias_map.items():
-                if original in symbols_on_board:
-                    positions = symbols_on_board.pop(original)
-                    symbols_on_board.setdefault(target, []).extend(positions)
-
-        # Update all symbol positions with wilds, as this symbol is shared
-        for sym in symbols_on_board:
-            if len(wild_positions) > 0:
-                symbols_on_board[sym].extend(wild_positions)
-            win_size = len(symbols_on_board[sym])
-            if (win_size, sym) in config.paytable:
-                symbol_mult = 0
-                for p in symbols_on_board[sym]:
-                    if board[p["reel"]][p["row"]].check_attribute(multiplier_key):
-                        symbol_mult += board[p["reel"]][p["row"]].get_attribute(multiplier_key)
-
-                    board[p["reel"]][p["row"]].assign_attribute({"explode": True})
-
-                symbol_mult = max(symbol_mult, 1)
-                overlay_position = Scatter.get_central_scatter_position(
-                    rows_for_overlay, symbols_on_board[sym], len(board), len(board[0])
-                )
-                rows_for_overlay.append(overlay_position[1])
-                symbol_win_data = {
-                    "symbol": sym,
-                    "win": config.paytable[(win_size, sym)] * global_multiplier * symbol_mult,
-                    "positions": symbols_on_board[sym],
-                    "meta": {
-                        "globalMult": global_multiplier,
-                        "clusterMult": symbol_mult,
-                        "winWithoutMult": config.paytable[(win_size, sym)],
-                        "overlay": {
-                            "reel": overlay_position[0],
-                            "row": overlay_position[1],
-                        },
+        for sym, _, payout, indices, symbol_mult in groups:
+            positions = [flat_positions[idx] for idx in indices]
+            symbol_mult = max(symbol_mult, 1)
+            overlay_position = Scatter.get_central_scatter_position(
+                rows_for_overlay, positions, len(board), len(board[0])
+            )
+            rows_for_overlay.append(overlay_position[1])
+            symbol_win_data = {
+                "symbol": sym,
+                "win": payout * global_multiplier * symbol_mult,
+                "positions": positions,
+                "meta": {
+                    "globalMult": global_multiplier,
+                    "clusterMult": symbol_mult,
+                    "winWithoutMult": payout,
+                    "overlay": {
+                        "reel": overlay_position[0],
+                        "row": overlay_position[1],
                     },
-                }
-                total_win += symbol_win_data["win"]
-                return_data["wins"].append(symbol_win_data)
+                },
+            }
+            total_win += symbol_win_data["win"]
+            return_data["wins"].append(symbol_win_data)
+
+        if explode is not None:
+            for idx, exploding in enumerate(explode):
+                if exploding:
+                    flat[idx].explode = True
 
         return_data["totalWin"] = total_win
 
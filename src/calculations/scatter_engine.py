@@ -0,0 +1,99 @@
+"""Count-based scatter-pays evaluation over Symbol boards, used by Scatter."""
+
+from typing import List, Tuple
+from collections import Counter
+from src.calculations.symbol import Symbol
+from src.config.compiled_config import get_compiled_paytable
+
+
+class ScatterEngine:
+    """
+    Count-based scatter-pays (pay-anywhere) evaluation.
+
+    Symbol counts, including symbol_aliases remapping and shared wilds, are taken in a single pass over the board.
+    Positions and multiplier sums are only gathered for paying symbols, and winning positions are collected in a
+    boolean explode mask over the flattened (reel-major) board.
+    """
+
+    def __init__(self, config: object, wild_key: str = "wild", multiplier_key: str = "multiplier") -> None:
+        self.compiled_paytable = get_compiled_paytable(config)
+        self.config_paytable = config.paytable
+        self.wild_names = set(config.special_symbols[wild_key])
+        self.config_aliases = getattr(config, "symbol_aliases", None)
+        self.alias_map = dict(self.config_aliases or {})
+        self.multiplier_key = multiplier_key
+        self.shapes = {}
+
+    def get_positions(self, board: List[List[Symbol]]) -> List[Tuple[int, int]]:
+        """Flat index to (reel, row) lookup, cached per board shape."""
+        shape = tuple(len(column) for column in board)
+        if shape not in self.shapes:
+            self.shapes[shape] = [(reel, row) for reel, rows in enumerate(shape) for row in range(rows)]
+        return self.shapes[shape]
+
+    def count_board(self, names: List[str]) -> tuple:
+        """
+        Count symbol names of a flattened board.
+
+        Returns (counts{symbol: number} in order of first appearance with aliases merged into their target,
+        members{symbol: [names contributing positions, in order]}, number of wilds).
+        """
+        counts = Counter(names)
+        wild_count = 0
+        for name in self.wild_names.intersection(counts):
+            wild_count += counts.pop(name)
+        members = {}
+        for original, target in self.alias_map.items():
+            if original in counts:
+                counts[target] = counts.get(target, 0) + counts.pop(original)
+                members.setdefault(target, [target]).extend(members.pop(original, [original]))
+        return counts, members, wild_count
+
+    def evaluate(self, board: List[List[Symbol]]) -> tuple:
+        """
+        Return (paying groups, explode mask, flat board) where each paying group is (symbol, kind, payout,
+        flat indices, multiplier sum) in evaluation order. Indices list the symbol's own positions followed by all wild positions.
+        The mask and flat board are None when nothing pays.
+        """
+        names = [sym.name for column in board for sym in column]
+        counts, members, wild_count = self.count_board(names)
+        get_payout = self.compiled_paytable.get_payout
+        flat, explode, wild_indices = None, None, None
+        groups = []
+        for sym, count in counts.items():
+            kind = count + wild_count
+            payout = get_payout(kind, sym)
+            if not payout:
+                continue
+            if flat is None:
+                flat = [sym for column in board for sym in column]
+                explode = [False] * len(flat)
+                wild_indices = [idx for idx, name in enumerate(names) if name in self.wild_names]
+            indices = []
+            for member in members.get(sym, (sym,)):
+                indices += [idx for idx, name in enumerate(names) if name == member]
+            indices += wild_indices
+            symbol_mult = 0
+            for idx in indices:
+                explode[idx] = True
+                # Same test as Symbol.check_attribute: present and either non-boolean or True
+                value = getattr(flat[idx], self.multiplier_key, False)
+                if value is not False:
+                    symbol_mult += value
+            groups.append((sym, kind, payout, indices, symbol_mult))
+        return groups, explode, flat
+
+
+def get_scatter_engine(config: object, wild_key: str = "wild", multiplier_key: str = "multiplier") -> ScatterEngine:
+    """Return the cached ScatterEngine for a config, rebuilt if the paytable or symbol aliases are replaced."""
+    if getattr(config, "_scatter_engines", None) is None:
+        config._scatter_engines = {}
+    engine = config._scatter_engines.get((wild_key, multiplier_key))
+    if (
+        engine is None
+        or engine.config_paytable is not config.paytable
+        or engine.config_aliases is not getattr(config, "symbol_aliases", None)
+    ):
+        engine = ScatterEngine(config, wild_key, multiplier_key)
+        config._scatter_engines[(wild_key, multiplier_key)] = engine
+    return engine
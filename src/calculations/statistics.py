@@ -2,12 +2,13 @@ import random
 from typing import Union
 
 
-def get_random_outcome(distribution: dict, totalWeight: float = None) -> Union[float, int]:
-    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}"""
+def get_random_outcome(distribution: dict, totalWeight: float = None, rng: object = None) -> Union[float, int]:
+    """Returns a value from a distibution passed as a dictionary: {value : weight, ...}
+    Draws from rng (typically gamestate.rng) if provided, otherwise from the global random module."""
     assert isinstance(distribution, dict), "distribution must be of type: dict "
     if totalWeight is None:
         totalWeight = sum(distribution.values())
-    roll = random.uniform(0, totalWeight)
+    roll = (rng or random).uniform(0, totalWeight)
     cumulative = 0.0
     for value, weight in distribution.items():
         cumulative += weight
@@ -1,6 +1,7 @@
 """Handle symbol classes and initial generation."""
 
-from typing import Dict
+from typing import Dict, List, Tuple
+import numpy as np
 
 
 class SymbolStorage:
@@ -90,3 +91,71 @@ class Symbol:
         if self.name == name:
             return True
         return False
+
+
+class SymbolTable:
+    """Integer symbol codes used by array-based board representations and evaluators."""
+
+    def __init__(self, config: object) -> None:
+        names = set()
+        for tup in config.paytable:
+            names.add(tup[1])
+        for key, symbols in config.special_symbols.items():
+            if key is not None:
+                names.update(symbols)
+        for original, target in getattr(config, "symbol_aliases", {}).items():
+            names.update((original, target))
+
+        self.names: List[str] = sorted(names)
+        self.ids: Dict[str, int] = {name: idx for idx, name in enumerate(self.names)}
+        self.num_symbols = len(self.names)
+        self.special_masks: Dict[str, np.ndarray] = {}
+        for key, symbols in config.special_symbols.items():
+            if key is not None:
+                self.special_masks[key] = np.array([name in symbols for name in self.names], dtype=bool)
+
+    def get_id(self, name: str) -> int:
+        """Return integer code for a symbol name."""
+        if name not in self.ids:
+            raise ValueError(f"Symbol '{name}' is not registered.")
+        return self.ids[name]
+
+    def get_name(self, sym_id: int) -> str:
+        """Return symbol name from integer code."""
+        return self.names[sym_id]
+
+    def get_special_mask(self, special_key: str) -> np.ndarray:
+        """Boolean array over symbol ids, True where the symbol carries the special property."""
+        if special_key not in self.special_masks:
+            return np.zeros(self.num_symbols, dtype=bool)
+        return self.special_masks[special_key]
+
+    @staticmethod
+    def get_multiplier_value(symbol: Symbol, multiplier_key: str = "multiplier") -> int:
+        """Multiplier value of a symbol, 0 if the attribute is not active."""
+        if not symbol.check_attribute(multiplier_key):
+            return 0
+        return int(symbol.get_attribute(multiplier_key))
+
+    def encode_board(
+        self, board: List[List[Symbol]], multiplier_key: str = "multiplier"
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (symbol ids, multiplier values) arrays of shape [reel, row], padded with -1 and 0."""
+        max_rows = max(len(reel) for reel in board)
+        board_ids = np.full((len(board), max_rows), -1, dtype=np.int16)
+        board_mults = np.zeros((len(board), max_rows), dtype=np.int64)
+        for reel, _ in enumerate(board):
+            for row, sym in enumerate(board[reel]):
+                board_ids[reel, row] = self.ids[sym.name]
+                board_mults[reel, row] = self.get_multiplier_value(sym, multiplier_key)
+        return board_ids, board_mults
+
+
+def get_symbol_table(config: object) -> SymbolTable:
+    """Return the SymbolTable for a config, rebuilt only if the paytable or special symbols change."""
+    signature = (id(config.paytable), len(config.paytable), id(config.special_symbols))
+    cached = getattr(config, "_symbol_table", None)
+    if cached is None or cached[0] != signature:
+        cached = (signature, SymbolTable(config))
+        config._symbol_table = cached
+    return cached[1]
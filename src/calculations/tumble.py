@@ -7,45 +7,63 @@ class Tumble(Board):
     """General class for cascading/tumble game actions."""
 
     def tumble_board(self) -> None:
-        """Remove winning symbols from the active gameboard."""
-        self.board_before_tumble = copy(self.board)
-        static_board = copy(self.board)
-        self.new_symbols_from_tumble = [[] for _ in range(len(static_board))]
+        """
+        Remove winning symbols from the active gameboard.
 
-        for reel, _ in enumerate(static_board):
-            exploding_symbols = 0
-            copy_reel = static_board[reel]
-            exploding_symbols = sum(1 for x in static_board[reel] if x.check_attribute("explode"))
+        Only reels containing exploding symbols are rebuilt: surviving symbols are compacted to the bottom
+        of the reel and vacated positions are refilled from the reelstrip above the current stop.
+        Board arrays are updated for the rebuilt reels only. Special symbol positions are rescanned for the
+        rebuilt reels and for any other reel changed since the last scan.
+        """
+        self.board_before_tumble = self.board
+        self.board = copy(self.board)
+        self.new_symbols_from_tumble = [[] for _ in range(len(self.board))]
+        tumbled_reels = []
 
+        for reel, column in enumerate(self.board):
+            survivors = [sym for sym in column if not sym.check_attribute("explode")]
+            exploding_symbols = len(column) - len(survivors)
+            if exploding_symbols == 0:
+                continue
+            tumbled_reels.append(reel)
+
+            strip = self.reelstrip[reel]
+            reel_pos = self.reel_positions[reel]
+            refill, new_symbols = [], []
             for i in range(exploding_symbols):
-                reel_pos = (self.reel_positions[reel] - 1) % len(self.reelstrip[reel])
-                self.reel_positions[reel] = reel_pos
+                reel_pos = (reel_pos - 1) % len(strip)
                 # Take top symbol if it exists (don't add this to new_symbols_from_tumble)
                 if i == 0 and self.config.include_padding:
-                    insert_sym = self.top_symbols[reel]
+                    refill.append(self.top_symbols[reel])
                 else:
-                    nme = self.reelstrip[reel][(reel_pos) % len(self.reelstrip[reel])]
-                    insert_sym = self.create_symbol(nme)
-                    self.new_symbols_from_tumble[reel].insert(0, insert_sym)
-                copy_reel.insert(0, insert_sym)
-
-            copy_reel = [sym for sym in copy_reel if not (sym.check_attribute("explode"))]
+                    refill.append(self.create_symbol(strip[reel_pos]))
+                    new_symbols.append(refill[-1])
+            self.reel_positions[reel] = reel_pos
+            refill.reverse()
+            new_symbols.reverse()
 
-            if len(copy_reel) != self.config.num_rows[reel]:
+            if exploding_symbols + len(survivors) != self.config.num_rows[reel]:
                 raise RuntimeError(
-                    f"new reel length must match expected board size:\n expected: {self.config.num_rows[reel]} \n actual: {len(copy_reel)}"
+                    f"new reel length must match expected board size:\n expected: {self.config.num_rows[reel]} \n actual: {exploding_symbols + len(survivors)}"
                 )
-            static_board[reel] = copy_reel
+            self.board[reel] = refill + survivors
 
-            if self.config.include_padding and exploding_symbols > 0:
-                padding_name = str(
-                    self.reelstrip[reel][(self.reel_positions[reel] - 1) % len(self.reelstrip[reel])]
-                )
-                self.top_symbols[reel] = self.create_symbol(padding_name)
-                self.new_symbols_from_tumble[reel].insert(0, self.top_symbols[reel])
+            if self.config.include_padding:
+                self.top_symbols[reel] = self.create_symbol(str(strip[(reel_pos - 1) % len(strip)]))
+                new_symbols.insert(0, self.top_symbols[reel])
+            self.new_symbols_from_tumble[reel] = new_symbols
+
+        self.update_tumbled_board_arrays(tumbled_reels)
+        self.update_special_symbols_on_reels(tumbled_reels)
 
-        self.board = static_board
-        self.get_special_symbols_on_board()
+    def update_tumbled_board_arrays(self, reels: list) -> None:
+        """Re-encode board_ids and board_mults for rebuilt reels, or the whole board if arrays are missing."""
+        if getattr(self, "board_ids", None) is None or self.board_ids.shape[0] != len(self.board):
+            self.update_board_arrays()
+            return
+        for reel in reels:
+            for row in range(len(self.board[reel])):
+                self.update_board_position(reel, row)
 
     def set_end_tumble_event(self) -> None:
         """Emit wins related to latest cumulative tumble sequence."""
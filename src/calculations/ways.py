@@ -1,9 +1,9 @@
 """Ways wins executables/calculations."""
 
-from collections import defaultdict
 from src.calculations.symbol import Symbol
+from src.calculations.ways_engine import get_ways_engine
 from src.config.config import Config
-from src.wins.multiplier_strategy import apply_mult
+from src.wins.multiplier_strategy import get_multiplier_strategy
 from src.events.events import (
     win_info_event,
     set_win_event,
@@ -23,79 +23,47 @@ class Ways:
         multiplier_key: str = "multiplier",
         multiplier_strategy: str = "symbol",
     ):
-        """Ways calculation with possibility for global multiplier application."""
+        """Ways calculation from per-reel symbol counts, with possibility for global multiplier application."""
         return_data = {
             "totalWin": 0,
             "wins": [],
         }
         assert multiplier_strategy in ["symbol", "board", "global"]
+        engine = get_ways_engine(config, wild_key, multiplier_key)
+        # Ways multipliers are resolved from the counts above, the combined value is applied as a global multiplier
+        apply_win_multiplier = get_multiplier_strategy("global")
+        counts, symbol_mults, wild_counts, wild_mults = engine.count_board(board)
+        symbol_names = engine.symbol_table.names
         board_mult_count = 0
-        potential_wins = defaultdict()
-        wilds = [[] for _ in range(len(board))]
-        for reel, _ in enumerate(board):
-            for row, _ in enumerate(board[reel]):
-                sym = board[reel][row]
-                if reel == 0 and sym.name not in potential_wins:
-                    potential_wins[sym.name] = [[] for _ in range(len(board))]
-                    potential_wins[sym.name][0] = [{"reel": reel, "row": row}]
-                elif sym.name in potential_wins:
-                    potential_wins[sym.name][reel].append({"reel": reel, "row": row})
 
-                if sym.name in config.special_symbols[wild_key]:
-                    wilds[reel].append({"reel": reel, "row": row})
-                    if board[reel][row].check_attribute(multiplier_key):
-                        wilds[reel][-1][multiplier_key] = board[reel][row].get_attribute(multiplier_key)
-
-        for symbol in potential_wins:
+        # Candidate symbols are those on the first reel, in order of appearance
+        for sym_id in dict.fromkeys(engine.symbol_table.ids[sym.name] for sym in board[0]):
             kind, ways, cumulative_sym_mult = (0, 1, 0)
-            for reel, _ in enumerate(potential_wins[symbol]):
-                if len(potential_wins[symbol][reel]) > 0 or len(wilds[reel]) > 0:
-                    kind += 1
-                    reel_sym_count = 0
-                    # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
-                    symbols_have_mult = False
-                    for s in potential_wins[symbol][reel]:
-                        if board[s["reel"]][s["row"]].check_attribute(multiplier_key):
-                            symbols_have_mult = True
-
-                    if symbols_have_mult is False:
-                        reel_sym_count += len(potential_wins[symbol][reel])
-                    else:
-                        reel_sym_count = 0
-                        for s in potential_wins[symbol][reel]:
-                            if (
-                                board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                and multiplier_strategy == "symbol"
-                            ):
-                                reel_sym_count += board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                            else:
-                                reel_sym_count += 1
-                                if (
-                                    board[s["reel"]][s["row"]].check_attribute(multiplier_key)
-                                    and multiplier_strategy == "board"
-                                ):
-                                    gm = board[s["reel"]][s["row"]].get_attribute(multiplier_key)
-                                    board_mult_count += gm * (gm > 1)
-
-                    if len(wilds[reel]) > 0:
-                        for sym in wilds[reel]:
-                            if board[sym["reel"]][sym["row"]].check_attribute(
-                                multiplier_key
-                            ) and multiplier_strategy in ["board", "symbol"]:
-                                wild_mult_val = board[sym["reel"]][sym["row"]].get_attribute(multiplier_key)
-                                cumulative_sym_mult += wild_mult_val * (wild_mult_val > 1)
-                                if multiplier_strategy == "board":
-                                    reel_sym_count += 1
-                                    board_mult_count += wild_mult_val * (wild_mult_val > 1)
-                                else:
-                                    reel_sym_count += wild_mult_val
-                            else:
-                                reel_sym_count += 1
-
-                    ways *= reel_sym_count
-
-                else:
+            for reel, _ in enumerate(board):
+                num_wilds = wild_counts[reel]
+                if counts[reel][sym_id] == 0 and num_wilds == 0:
                     break
+                kind += 1
+                reel_sym_count = counts[reel][sym_id]
+                if (reel, sym_id) in symbol_mults:
+                    num_mults, mult_sum, mult_sum_above_one = symbol_mults[(reel, sym_id)]
+                    if multiplier_strategy == "symbol":
+                        reel_sym_count += mult_sum - num_mults
+                    elif multiplier_strategy == "board":
+                        board_mult_count += mult_sum_above_one
+
+                # Note that here multipliers on subsequent reels multiply (not add, like in lines games)
+                if num_wilds > 0:
+                    num_mults, mult_sum, mult_sum_above_one = wild_mults[reel]
+                    reel_sym_count += num_wilds
+                    if multiplier_strategy in ["board", "symbol"]:
+                        cumulative_sym_mult += mult_sum_above_one
+                        if multiplier_strategy == "board":
+                            board_mult_count += mult_sum_above_one
+                        else:
+                            reel_sym_count += mult_sum - num_mults
+
+                ways *= reel_sym_count
 
             match multiplier_strategy:
                 case "global":
@@ -105,21 +73,20 @@ class Ways:
                 case "symbol":
                     win_multiplier = 1
 
-            if (kind, symbol) in config.paytable:
+            symbol = symbol_names[sym_id]
+            payout = engine.compiled_paytable.get_payout(kind, symbol)
+            if payout:
                 positions = []
                 for reel in range(kind):
-                    for pos in potential_wins[symbol][reel]:
-                        positions += [pos]
-                    for pos in wilds[reel]:
-                        positions += [pos]
-
-                win = round(config.paytable[kind, symbol] * ways, 2)
-                win_amt, multiplier = apply_mult(
-                    board=board,
-                    strategy="global",
-                    win_amount=win,
-                    global_multiplier=win_multiplier,
-                )
+                    for row, sym in enumerate(board[reel]):
+                        if sym.name == symbol:
+                            positions.append((reel, row))
+                    for row, sym in enumerate(board[reel]):
+                        if sym.name in engine.wild_names:
+                            positions.append((reel, row))
+
+                win = round(payout * ways, 2)
+                win_amt, multiplier = apply_win_multiplier(win, win_multiplier)
                 if multiplier_strategy == "symbol":
                     assert win_amt == win
 
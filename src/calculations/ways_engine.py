@@ -0,0 +1,88 @@
+"""Count-matrix ways evaluation over Symbol and integer-coded boards, used by Ways and bulk board generation."""
+
+from typing import List
+import numpy as np
+from src.calculations.symbol import Symbol, SymbolTable, get_symbol_table
+from src.config.compiled_config import get_compiled_paytable
+
+
+class WaysEngine:
+    """
+    Count-matrix ways evaluation.
+
+    A single pass over the board produces per-reel symbol counts, wild counts and multiplier sums. Kind, ways and
+    multipliers for each reel-0 symbol follow from these counts, positions are only built for paying symbols.
+    Batches of symbol-id boards are evaluated with the same count matrix as arrays of shape [board, symbol, reel].
+    """
+
+    def __init__(self, config: object, wild_key: str = "wild", multiplier_key: str = "multiplier") -> None:
+        self.symbol_table = get_symbol_table(config)
+        self.compiled_paytable = get_compiled_paytable(config)
+        self.config_paytable = config.paytable
+        self.wild_names = set(config.special_symbols[wild_key])
+        self.wild_mask = np.append(self.symbol_table.get_special_mask(wild_key), False)
+        self.multiplier_key = multiplier_key
+        self.paying_ids = np.flatnonzero(self.compiled_paytable.max_kind > 0)
+
+    def count_board(self, board: List[List[Symbol]]) -> tuple:
+        """
+        Per-reel counts of a Symbol board.
+
+        Returns (counts[reel][symbol id], symbol_mults{(reel, symbol id): [number, sum, sum of values > 1]},
+        wild_counts[reel], wild_mults[reel] = [number, sum, sum of values > 1]) where multiplier entries only
+        include symbols with an active multiplier attribute.
+        """
+        ids = self.symbol_table.ids
+        wild_names = self.wild_names
+        multiplier_key = self.multiplier_key
+        num_symbols = self.symbol_table.num_symbols
+        counts = []
+        symbol_mults = {}
+        wild_counts = [0] * len(board)
+        wild_mults = [[0, 0, 0] for _ in board]
+        for reel, column in enumerate(board):
+            reel_counts = [0] * num_symbols
+            counts.append(reel_counts)
+            for sym in column:
+                sym_id = ids[sym.name]
+                reel_counts[sym_id] += 1
+                is_wild = sym.name in wild_names
+                wild_counts[reel] += is_wild
+                # Same test as Symbol.check_attribute: present and either non-boolean or True
+                value = getattr(sym, multiplier_key, False)
+                if value is not False:
+                    stats = symbol_mults.setdefault((reel, sym_id), [0, 0, 0])
+                    for stats in (stats, wild_mults[reel]) if is_wild else (stats,):
+                        stats[0] += 1
+                        stats[1] += value
+                        stats[2] += value * (value > 1)
+        return counts, symbol_mults, wild_counts, wild_mults
+
+    def get_total_wins(self, boards: np.ndarray) -> np.ndarray:
+        """Total ways-win (without multipliers) for symbol-id boards of shape [board, reel, row] padded with -1."""
+        num_reels = boards.shape[1]
+        counts = (boards[:, None, :, :] == self.paying_ids[None, :, None, None]).sum(axis=3)
+        wild_counts = self.wild_mask[boards].sum(axis=2)
+        on_first_reel = counts[:, :, 0] > 0
+        counts = counts + wild_counts[:, None, :]
+        kind = np.cumprod(counts > 0, axis=2).sum(axis=2)
+        included = np.arange(num_reels)[None, None, :] < kind[..., None]
+        ways = np.where(included, counts, 1).prod(axis=2)
+        pay = self.compiled_paytable.lookup(self.paying_ids[None, :], kind)
+        return np.where(on_first_reel, np.round(pay * ways, 2), 0.0).sum(axis=1)
+
+
+def get_ways_engine(config: object, wild_key: str = "wild", multiplier_key: str = "multiplier") -> WaysEngine:
+    """Return the cached WaysEngine for a config, rebuilt if the paytable is replaced."""
+    if getattr(config, "_ways_engines", None) is None:
+        config._ways_engines = {}
+    engine = config._ways_engines.get((wild_key, multiplier_key))
+    if engine is None or engine.config_paytable is not config.paytable:
+        engine = WaysEngine(config, wild_key, multiplier_key)
+        config._ways_engines[(wild_key, multiplier_key)] = engine
+    return engine
+
+
+def get_ways_batch(boards: np.ndarray, config: object, symbol_table: SymbolTable, wild_key: str = "wild") -> np.ndarray:
+    """Total ways-win for each board (without multipliers), following Ways.get_ways_data rules."""
+    return get_ways_engine(config, wild_key).get_total_wins(boards)
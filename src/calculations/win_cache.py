@@ -0,0 +1,82 @@
+"""Bounded caches for repeated win evaluations, with hit-rate statistics."""
+
+from typing import Dict, Hashable, Union
+
+
+class WinCache:
+    """
+    Bounded mapping from an evaluation key to a precomputed result.
+
+    Entries are evicted oldest-first once max_size is reached, so lookups which hit do no bookkeeping beyond
+    counting. get() returns None on a miss, stored results must therefore not be None.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        assert max_size > 0, "cache size must be positive"
+        self.max_size = max_size
+        self.entries: Dict[Hashable, object] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> object:
+        """Return the stored result for key, or None."""
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def put(self, key: Hashable, result: object) -> None:
+        """Store a result, evicting the oldest entry if the cache is full."""
+        if len(self.entries) >= self.max_size:
+            del self.entries[next(iter(self.entries))]
+        self.entries[key] = result
+
+    def reset_stats(self) -> None:
+        """Reset hit and miss counts, keeping stored entries."""
+        self.hits = 0
+        self.misses = 0
+
+    def clear(self) -> None:
+        """Remove all entries and reset statistics."""
+        self.entries = {}
+        self.reset_stats()
+
+    def get_summary(self) -> str:
+        """Hit-rate description."""
+        lookups = self.hits + self.misses
+        hit_rate = 100 * self.hits / lookups if lookups > 0 else 0.0
+        return f"hit rate {hit_rate:.1f}% ({lookups} lookups, {len(self.entries)}/{self.max_size} entries)"
+
+
+def register_win_cache(config: object, name: str, cache: WinCache) -> None:
+    """Record a cache on the config so its statistics are reported at the end of each simulation batch."""
+    if getattr(config, "_win_caches", None) is None:
+        config._win_caches = {}
+    config._win_caches[name] = cache
+
+
+def get_board_win_cache(config: object) -> Union[WinCache, None]:
+    """Board win cache of a config, created on first use, or None if config.board_win_cache_size is not set."""
+    max_size = getattr(config, "board_win_cache_size", 0)
+    if max_size <= 0:
+        return None
+    cache = getattr(config, "_board_win_cache", None)
+    if cache is None or cache.max_size != max_size:
+        cache = WinCache(max_size)
+        config._board_win_cache = cache
+        register_win_cache(config, "board", cache)
+    return cache
+
+
+def reset_win_cache_stats(config: object) -> None:
+    """Reset statistics of all caches registered on a config."""
+    for cache in (getattr(config, "_win_caches", None) or {}).values():
+        cache.reset_stats()
+
+
+def get_win_cache_summaries(config: object) -> Dict[str, str]:
+    """Hit-rate summaries of all caches registered on a config which have been used."""
+    caches = getattr(config, "_win_caches", None) or {}
+    return {name: cache.get_summary() for name, cache in caches.items() if cache.hits + cache.misses > 0}
@@ -0,0 +1,218 @@
+"""Integer-coded reelstrips, paytable and paylines compiled from a game config and cached as binary files."""
+
+import os
+import json
+import shutil
+import inspect
+import hashlib
+from typing import Dict, List
+import numpy as np
+
+from src.calculations.symbol import SymbolTable, get_symbol_table
+
+COMPILED_FORMAT_VERSION = 1
+
+
+class CompiledPaytable:
+    """
+    Dense paytable compiled from config.paytable, which remains the authoring format.
+
+    dense is a float64 array indexed by [symbol id, kind] (zero where there is no entry), max_kind holds the largest
+    paying kind per symbol id. Payouts are also kept per symbol name as lists indexed by kind, holding the values
+    exactly as authored so win amounts written to books keep their type.
+    """
+
+    def __init__(self, paytable: dict, symbol_table: SymbolTable) -> None:
+        self.symbol_table = symbol_table
+        self.max_kind = np.zeros(symbol_table.num_symbols, dtype=np.int64)
+        for kind, name in paytable:
+            sym_id = symbol_table.ids[name]
+            self.max_kind[sym_id] = max(self.max_kind[sym_id], kind)
+        self.dense = np.zeros((symbol_table.num_symbols, int(self.max_kind.max(initial=0)) + 1), dtype=np.float64)
+        self.rows: Dict[str, list] = {}
+        for (kind, name), payout in paytable.items():
+            self.dense[symbol_table.ids[name], kind] = payout
+            if name not in self.rows:
+                self.rows[name] = [0] * (int(self.max_kind[symbol_table.ids[name]]) + 1)
+            self.rows[name][kind] = payout
+
+    def get_payout(self, kind: int, symbol: str) -> float:
+        """Payout for kind-of-a-symbol as defined in config.paytable, 0 where there is no entry."""
+        row = self.rows.get(symbol)
+        if row is None or kind >= len(row):
+            return 0
+        return row[kind]
+
+    def lookup(self, sym_ids: np.ndarray, kinds: np.ndarray) -> np.ndarray:
+        """Vectorised payout lookup over symbol id and kind arrays."""
+        return lookup_payout(self.dense, sym_ids, kinds)
+
+
+def get_compiled_paytable(config: object) -> CompiledPaytable:
+    """Return the CompiledPaytable for a config, rebuilt only if the paytable or symbol table change."""
+    symbol_table = get_symbol_table(config)
+    signature = (id(config.paytable), len(config.paytable), id(symbol_table))
+    cached = getattr(config, "_compiled_paytable", None)
+    if cached is None or cached[0] != signature:
+        cached = (signature, CompiledPaytable(config.paytable, symbol_table))
+        config._compiled_paytable = cached
+    return cached[1]
+
+
+class CompiledConfig:
+    """
+    Array views of the static game data used by vectorised evaluators.
+
+    reels[reelstrip_id] is an int16 array of shape [reel, position] holding symbol ids,
+    paytable is a float64 array indexed by [symbol id, kind] (zero where there is no entry),
+    paylines is an int64 array of shape [line, reel] ordered as config.paylines.
+    """
+
+    def __init__(
+        self,
+        symbol_names: List[str],
+        reels: Dict[str, np.ndarray],
+        paytable: np.ndarray,
+        paylines: np.ndarray,
+        payline_ids: list,
+    ) -> None:
+        self.symbol_names = symbol_names
+        self.reels = reels
+        self.paytable = paytable
+        self.paylines = paylines
+        self.payline_ids = payline_ids
+
+    @classmethod
+    def from_config(cls, config: object, symbol_table: SymbolTable) -> "CompiledConfig":
+        """Encode reels, paytable and paylines of a config with the given symbol table."""
+        reels = {}
+        for reelstrip_id, reelstrip in getattr(config, "reels", {}).items():
+            if len(reelstrip) == 0:
+                continue
+            unknown = set().union(*reelstrip).difference(symbol_table.ids)
+            if len(unknown) > 0:
+                raise RuntimeError(
+                    f"Symbol identified in reel '{reelstrip_id}' that does not exist in valid symbol names. \n"
+                    f"Valid Symbols: {symbol_table.names}\n"
+                    f"Detected Symbols: {sorted(unknown)}"
+                )
+            reels[reelstrip_id] = np.array(
+                [[symbol_table.ids[name] for name in reel] for reel in reelstrip], dtype=np.int16
+            )
+
+        paytable = CompiledPaytable(config.paytable, symbol_table).dense
+
+        config_paylines = getattr(config, "paylines", {})
+        payline_ids = list(config_paylines)
+        paylines = np.array([config_paylines[idx] for idx in payline_ids], dtype=np.int64)
+        if len(payline_ids) == 0:
+            paylines = paylines.reshape(0, getattr(config, "num_reels", 0))
+
+        return cls(list(symbol_table.names), reels, paytable, paylines, payline_ids)
+
+    def save(self, folder_path: str) -> None:
+        """Write arrays as .npy files alongside a json manifest."""
+        os.makedirs(folder_path, exist_ok=True)
+        reel_files = {}
+        for reelstrip_id, reel_ids in self.reels.items():
+            reel_files[reelstrip_id] = f"reels_{len(reel_files)}.npy"
+            np.save(os.path.join(folder_path, reel_files[reelstrip_id]), reel_ids)
+        np.save(os.path.join(folder_path, "paytable.npy"), self.paytable)
+        np.save(os.path.join(folder_path, "paylines.npy"), self.paylines)
+        manifest = {
+            "version": COMPILED_FORMAT_VERSION,
+            "symbol_names": self.symbol_names,
+            "reels": reel_files,
+            "payline_ids": self.payline_ids,
+        }
+        # Manifest is written last, a folder without one is treated as incomplete
+        with open(os.path.join(folder_path, "manifest.json"), "w", encoding="UTF-8") as f:
+            json.dump(manifest, f)
+
+    @classmethod
+    def load(cls, folder_path: str, mmap: bool = True) -> "CompiledConfig":
+        """Read a saved compiled config. Arrays are memory-mapped read-only by default."""
+        mmap_mode = "r" if mmap else None
+        with open(os.path.join(folder_path, "manifest.json"), "r", encoding="UTF-8") as f:
+            manifest = json.load(f)
+        if manifest["version"] != COMPILED_FORMAT_VERSION:
+            raise RuntimeError(f"Compiled config version {manifest['version']} is not supported.")
+        reels = {
+            reelstrip_id: np.load(os.path.join(folder_path, filename), mmap_mode=mmap_mode)
+            for reelstrip_id, filename in manifest["reels"].items()
+        }
+        paytable = np.load(os.path.join(folder_path, "paytable.npy"), mmap_mode=mmap_mode)
+        paylines = np.load(os.path.join(folder_path, "paylines.npy"), mmap_mode=mmap_mode)
+        return cls(manifest["symbol_names"], reels, paytable, paylines, manifest["payline_ids"])
+
+
+def lookup_payout(paytable: np.ndarray, sym_ids: np.ndarray, kinds: np.ndarray) -> np.ndarray:
+    """Vectorised dense paytable lookup, zero for kinds beyond the largest paytable entry."""
+    max_kind = paytable.shape[1] - 1
+    return np.where(kinds <= max_kind, paytable[sym_ids, np.minimum(kinds, max_kind)], 0.0)
+
+
+def get_config_hash(config: object) -> str:
+    """Hash of the game config module source, reel csv files and symbol/pay definitions."""
+    digest = hashlib.sha256(str(COMPILED_FORMAT_VERSION).encode())
+    try:
+        with open(inspect.getsourcefile(type(config)), "rb") as f:
+            digest.update(f.read())
+    except (TypeError, OSError):
+        pass
+    for file_path, file_hash in sorted(getattr(config, "reel_file_hashes", {}).items()):
+        digest.update(os.path.basename(file_path).encode())
+        digest.update(file_hash.encode())
+    digest.update(repr(sorted(config.paytable.items(), key=lambda x: (x[0][1], x[0][0]))).encode())
+    digest.update(repr(sorted((str(k), v) for k, v in config.special_symbols.items())).encode())
+    digest.update(repr(getattr(config, "paylines", {})).encode())
+    digest.update(repr({k: (len(v), [len(r) for r in v]) for k, v in getattr(config, "reels", {}).items()}).encode())
+    return digest.hexdigest()
+
+
+def load_compiled_cache(folder_path: str, config: object, symbol_table: SymbolTable) -> CompiledConfig:
+    """Load a completed compiled config cache, None if it is missing or does not match the config."""
+    if not os.path.isfile(os.path.join(folder_path, "manifest.json")):
+        return None
+    compiled = CompiledConfig.load(folder_path)
+    if compiled.symbol_names != symbol_table.names or set(compiled.reels) != {
+        k for k, v in getattr(config, "reels", {}).items() if len(v) > 0
+    }:
+        return None
+    return compiled
+
+
+def get_compiled_config(config: object) -> CompiledConfig:
+    """
+    Return the CompiledConfig for a game config.
+
+    When the config defines library_path, arrays are cached under library/cache/compiled_<hash> and
+    memory-mapped on later runs and in worker processes. Otherwise the arrays are built in memory.
+    A completed cache folder is never replaced, it is only written when no folder exists under its name.
+    """
+    cached = getattr(config, "_compiled_config", None)
+    symbol_table = get_symbol_table(config)
+    if cached is not None and cached.symbol_names == symbol_table.names:
+        return cached
+
+    library_path = getattr(config, "library_path", None)
+    if library_path is not None:
+        folder_path = os.path.join(library_path, "cache", f"compiled_{get_config_hash(config)[:16]}")
+        compiled = load_compiled_cache(folder_path, config, symbol_table)
+        if compiled is None and not os.path.exists(folder_path):
+            temp_path = f"{folder_path}.tmp{os.getpid()}"
+            CompiledConfig.from_config(config, symbol_table).save(temp_path)
+            try:
+                os.rename(temp_path, folder_path)
+            except OSError:
+                # Another process finished writing the same cache first
+                shutil.rmtree(temp_path, ignore_errors=True)
+            compiled = load_compiled_cache(folder_path, config, symbol_table)
+        if compiled is None:
+            # An existing cache that does not match the config is left in place, arrays are built in memory
+            compiled = CompiledConfig.from_config(config, symbol_table)
+    else:
+        compiled = CompiledConfig.from_config(config, symbol_table)
+
+    config._compiled_config = compiled
+    return compiled
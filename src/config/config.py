@@ -2,7 +2,9 @@
 
 from src.config.betmode import BetMode
 from src.config.paths import PATH_TO_GAMES
+from src.config.compiled_config import CompiledPaytable, get_compiled_paytable
 import os
+import hashlib
 
 
 class Config:
@@ -18,6 +20,7 @@ class Config:
         self.provider_number = 1
         self.game_name = "sample_lines"
         self.output_regular_json = True  # if True, outputs .json if compression = False. If False, outputs .jsonl
+        self.compact_force_record = False  # if True, force_record_<mode>.json is written without indentation
         if self.game_id != "0_0_sample":
             self.construct_paths()
 
@@ -40,6 +43,13 @@ class Config:
 
         self.include_padding = True
 
+        # Random number generation: "compat" reproduces existing books, "philox" uses per-simulation streams
+        self.rng_mode = "compat"
+        self.rng_stream_key = 0
+        # Base-game boards drawn and evaluated together for lines and ways games (see Board.queue_batched_board()),
+        # 0 draws every board per-simulation
+        self.base_board_batch_size = 0
+
         # Define the number of scatter-symbols required to award free-spins
         self.freespin_triggers = {}
 
@@ -47,9 +57,27 @@ class Config:
         self.reel_location = ""
         self.reels = {}
         self.padding_reels = {}  # symbol configuration displayed before the board reveal
+        self.reel_file_hashes = {}  # sha256 of each reel csv, used to key the compiled config cache
 
         self.write_event_list = True
 
+        # Maximum number of cached payline results (keyed by the symbols under a line), 0 disables the cache.
+        # Lines games enable it in their own config
+        self.line_win_cache_size = 0
+        # Maximum number of cached board win results (keyed by the board's symbol ids), 0 disables the cache.
+        # Only used by Executables.get_board_win_data() for games without special_symbol_functions
+        self.board_win_cache_size = 0
+
+        # zstd settings for compressed books, see src/write_data/compression.py for the available options
+        self.compression_options = {
+            "level": 3,
+            "threads": 0,
+            "long_distance_matching": False,
+            "window_log": 0,
+            "dictionary_size": 0,
+            "books_per_frame": 0,
+        }
+
         self.bet_modes = []
         self.opt_params = {None: None}
 
@@ -106,12 +134,9 @@ class Config:
 
     def validate_reel_symbols(self, reel_strip: str) -> None:
         """Verify that all symbols on the reelstrip are valid."""
-        uniqueSymbols = set()
-        for reel in reel_strip:
-            for row in reel:
-                uniqueSymbols.add(row)
+        uniqueSymbols = set().union(*reel_strip)
 
-        isSubset = uniqueSymbols.issubset(set(self.all_valid_sym_names))
+        isSubset = uniqueSymbols.issubset(self.all_valid_sym_names)
         if not isSubset:
             raise RuntimeError(
                 f"Symbol identified in reel that does not exist in valid symbol names. \n"
@@ -122,20 +147,20 @@ class Config:
     def read_reels_csv(self, file_path):
         """Read csv from reelstrip path."""
         reelstrips = []
-        count = 0
-        with open(os.path.abspath(file_path), "r", encoding="UTF-8") as file:
-            for line in file:
-                split_line = line.strip().split(",")
-                for reelIndex in range(len(split_line)):
-                    if count == 0:
-                        reelstrips.append(["".join([ch for ch in split_line[reelIndex] if ch.strip().isalnum()])])
-                    else:
-                        reelstrips[reelIndex].append(
-                            "".join([ch for ch in split_line[reelIndex] if ch.strip().isalnum() and len(ch) > 0])
-                        )
-
-                    assert len(reelstrips[reelIndex][-1]) > 0, "Symbol is empty."
-                count += 1
+        with open(os.path.abspath(file_path), "rb") as file:
+            contents = file.read()
+        self.reel_file_hashes[os.path.abspath(file_path)] = hashlib.sha256(contents).hexdigest()
+
+        for count, line in enumerate(contents.decode("UTF-8").splitlines()):
+            split_line = line.strip().split(",")
+            for reelIndex in range(len(split_line)):
+                symbol = "".join(filter(str.isalnum, split_line[reelIndex]))
+                if count == 0:
+                    reelstrips.append([symbol])
+                else:
+                    reelstrips[reelIndex].append(symbol)
+
+                assert len(symbol) > 0, "Symbol is empty."
 
         return reelstrips
 
@@ -150,6 +175,11 @@ class Config:
         if not (os.path.exists(folder_path)):
             os.makedirs(folder_path)
 
+    @property
+    def compiled_paytable(self) -> CompiledPaytable:
+        """Dense symbol-id by kind view of self.paytable, shared by all win evaluators."""
+        return get_compiled_paytable(self)
+
     def convert_range_table(self, pay_group: dict) -> dict:
         """
         requires self.pay_group to be defined
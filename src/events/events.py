@@ -1,6 +1,5 @@
 """Defines reusable events"""
 
-from copy import deepcopy
 from src.events.event_constants import EventConstants
 
 
@@ -15,6 +14,11 @@ def json_ready_sym(symbol: object, special_attributes: list = None):
     return print_sym
 
 
+def json_ready_positions(positions: list, row_offset: int = 0) -> list:
+    """Converts (reel, row) board positions to dictionary/JSON format."""
+    return [{"reel": reel, "row": row + row_offset} for reel, row in positions]
+
+
 def reveal_event(gamestate):
     """Display the initial board drawn from reelstrips."""
     board_client = []
@@ -138,37 +142,33 @@ def win_info_event(gamestate, include_padding_index=True):
     """
     include_padding_index: starts winning-symbol positions at row=1, to account for top/bottom symbol inclusion in board
     """
-    win_data_copy = {}
-    win_data_copy["wins"] = deepcopy(gamestate.win_data["wins"])
-    for idx, w in enumerate(win_data_copy["wins"]):
-        if include_padding_index:
-            new_positions = []
-            for p in w["positions"]:
-                new_positions.append({"reel": p["reel"], "row": p["row"] + 1})
-        else:
-            new_positions = w["positions"]
-
-        win_data_copy["wins"][idx]["win"] = int(
-            round(min(win_data_copy["wins"][idx]["win"], gamestate.config.wincap) * 100, 0)
-        )
-        win_data_copy["wins"][idx]["positions"] = new_positions
-        if "meta" in win_data_copy["wins"][idx]:
-            win_data_copy["wins"][idx]["meta"]["winWithoutMult"] = int(
+    row_offset = 1 if include_padding_index else 0
+    wins = []
+    for w in gamestate.win_data["wins"]:
+        # Only the fields rewritten below are copied, the event itself is copied when added to the book
+        win_info = dict(w)
+        win_info["win"] = int(round(min(w["win"], gamestate.config.wincap) * 100, 0))
+        win_info["positions"] = json_ready_positions(w["positions"], row_offset)
+        if "meta" in w:
+            win_info["meta"] = dict(w["meta"])
+            win_info["meta"]["winWithoutMult"] = int(
                 int(
                     min(
-                        win_data_copy["wins"][idx]["meta"]["winWithoutMult"] * 100,
+                        w["meta"]["winWithoutMult"] * 100,
                         gamestate.config.wincap * 100,
                     ),
                 )
             )
-            if "overlay" in win_data_copy["wins"][idx]["meta"] and include_padding_index:
-                win_data_copy["wins"][idx]["meta"]["overlay"]["row"] += 1
+            if "overlay" in w["meta"] and include_padding_index:
+                win_info["meta"]["overlay"] = dict(w["meta"]["overlay"])
+                win_info["meta"]["overlay"]["row"] += 1
+        wins.append(win_info)
 
     event = {
         "index": len(gamestate.book.events),
         "type": EventConstants.WIN_DATA.value,
         "totalWin": int(round(min(gamestate.win_data["totalWin"], gamestate.config.wincap) * 100, 0)),
-        "wins": win_data_copy["wins"],
+        "wins": wins,
     }
     gamestate.book.add_event(event)
 
@@ -232,13 +232,10 @@ def tumble_board_event(gamestate):
 
     exploding = []
     for win in gamestate.win_data["wins"]:
-        for pos in win["positions"]:
-            if gamestate.config.include_padding:
-                exploding.append({"reel": pos["reel"], "row": pos["row"] + 1})
-            else:
-                exploding.append({"reel": pos["reel"], "row": pos["row"]})
-
-    exploding = sorted(exploding, key=lambda x: x["reel"])
+        exploding.extend(win["positions"])
+    exploding = json_ready_positions(
+        sorted(exploding, key=lambda pos: pos[0]), 1 if gamestate.config.include_padding else 0
+    )
 
     new_symbols = [[] for _ in range(gamestate.config.num_reels)]
     for r, _ in enumerate(gamestate.new_symbols_from_tumble):
@@ -1,5 +1,9 @@
+from copy import deepcopy
 from src.state.state_conditions import Conditions
 from src.calculations.tumble import Tumble
+from src.calculations.lines import Lines
+from src.calculations.ways import Ways
+from src.calculations.win_cache import get_board_win_cache
 from src.events.events import (
     win_info_event,
     freespin_end_event,
@@ -25,6 +29,34 @@ class Executables(Conditions, Tumble):
         self.tumble_board()
         tumble_board_event(self)
 
+    def get_board_win_data(self, **kwargs) -> dict:
+        """
+        Lines or ways win data of the active board (following config.win_type), kwargs are passed to the evaluation.
+        If config.board_win_cache_size > 0 and no special_symbol_functions are registered, results are cached by
+        the board's symbol ids and multiplier values, and repeated boards are not re-evaluated. Cached results are
+        copied on the way in and out, so the returned win data may be modified. Board arrays are encoded first
+        if they are missing or do not match the board size, line-wins read symbol multipliers from board_mults.
+        """
+        if getattr(self, "board_ids", None) is None or self.board_ids.shape[0] != len(self.board):
+            self.update_board_arrays()
+        cache = None if len(self.special_symbol_functions) > 0 else get_board_win_cache(self.config)
+        if cache is not None:
+            key = (self.board_ids.tobytes(), self.board_mults.tobytes(), tuple(kwargs.items()))
+            win_data = cache.get(key)
+            if win_data is not None:
+                return deepcopy(win_data)
+
+        if self.config.win_type == "lines":
+            win_data = Lines.get_lines(self.board, self.config, board_mults=self.board_mults, **kwargs)
+        elif self.config.win_type == "ways":
+            win_data = Ways.get_ways_data(self.config, self.board, **kwargs)
+        else:
+            raise ValueError(f"board win data is only available for lines and ways games, not '{self.config.win_type}'")
+
+        if cache is not None:
+            cache.put(key, deepcopy(win_data))
+        return win_data
+
     def emit_tumble_win_events(self) -> None:
         """Transmit win and new board information upon tumble."""
         if self.win_data["totalWin"] > 0:
@@ -9,7 +9,8 @@ import shutil
 import asyncio
 from typing import Dict
 
-from src.write_data.write_data import output_lookup_and_force_files
+from src.write_data.compression import get_compression_options
+from src.write_data.write_data import create_book_dictionary, output_lookup_and_force_files, reset_book_dictionary
 
 
 def create_books(
@@ -20,8 +21,15 @@ def create_books(
     threads: int,
     compress: bool,
     profiling: bool,
+    verify_merge: bool = False,
+    compression_options: dict = None,
 ):
-    """Main run-function for simulating game outcomes and outputting all files."""
+    """
+    Main run-function for simulating game outcomes and outputting all files.
+    verify_merge: decompress merged compressed books and check them against the temporary book files.
+    compression_options: zstd settings overriding config.compression_options for compressed books.
+    """
+    config.compression_options = get_compression_options(config, compression_options)
     for key, ns in num_sim_args.items():
         if all([ns > 0, ns > batch_size * batch_size]):
             assert (
@@ -72,6 +80,7 @@ def create_books(
                 gamestate,
                 num_sims=nsims,
                 compress=compress,
+                verify_merge=verify_merge,
             )
     shutil.rmtree(gamestate.output_files.temp_path)
     print("\nFinished creating books in", time.time() - startTime, "seconds.\n")
@@ -202,6 +211,10 @@ def run_multi_process_sims(
             criteria_counter[c] += 1
             simulation_seeds.append(offset_val)
 
+    if compress:
+        reset_book_dictionary(gamestate, betmode)
+    train_dictionary = compress and get_compression_options(gamestate.config)["dictionary_size"] > 0
+
     for repeat in range(num_repeats):
         print("Batch", repeat + 1, "of", num_repeats)
         processes = []
@@ -266,3 +279,6 @@ def run_multi_process_sims(
             gamestate.combine(all_betmode_configs, betmode)
             gamestate.get_betmode(betmode).lock_force_keys()
             manager.shutdown()
+
+        if repeat == 0 and train_dictionary:
+            create_book_dictionary(gamestate, betmode, threads)
@@ -1,11 +1,13 @@
 from copy import copy, deepcopy
 from abc import ABC, abstractmethod
 from warnings import warn
-import random
 
 # from src.config.config import BetMode
 from src.wins.win_manager import WinManager
-from src.calculations.symbol import SymbolStorage
+from src.calculations.symbol import SymbolStorage, get_symbol_table
+from src.calculations.rng import GameRNG
+from src.calculations.win_cache import get_win_cache_summaries, reset_win_cache_stats
+from src.config.compiled_config import get_compiled_config
 from src.config.output_filenames import OutputFiles
 from src.state.books import Book
 from src.write_data.write_data import (
@@ -28,6 +30,9 @@ class GeneralGameState(ABC):
         self.recorded_events = {}
         self.special_symbol_functions = {}
         self.temp_wins = []
+        self.rng = GameRNG(self.config.rng_mode, self.config.rng_stream_key)
+        self.queued_board = None
+        self.batched_boards = {}
         self.create_symbol_map()
         self.assign_special_sym_function()
         self.sim = 0
@@ -55,6 +60,8 @@ class GeneralGameState(ABC):
 
         all_symbols_list = list(all_symbols_list)
         self.symbol_storage = SymbolStorage(self.config, all_symbols_list)
+        self.symbol_table = get_symbol_table(self.config)
+        self.compiled_config = get_compiled_config(self.config)
 
     @abstractmethod
     def assign_special_sym_function(self):
@@ -65,6 +72,8 @@ class GeneralGameState(ABC):
         """Reset global simulation variables."""
         self.temp_wins = []
         self.board = [[[] for _ in range(self.config.num_rows[x])] for x in range(self.config.num_reels)]
+        self.board_ids = None
+        self.board_mults = None
         self.top_symbols = None
         self.bottom_symbols = None
         self.book_id = self.sim + 1
@@ -87,9 +96,9 @@ class GeneralGameState(ABC):
     def reset_seed(self, sim: int = 0, seed_override=None) -> None:
         """Reset rng seed to simulation number for reproducibility."""
         if seed_override is not None:
-            random.seed(seed_override + 1)
+            self.rng.seed(seed_override + 1)
         else:
-            random.seed(sim + 1)
+            self.rng.seed(sim + 1)
         self.sim = sim
         self.repeat_count = 0
 
@@ -258,12 +267,17 @@ class GeneralGameState(ABC):
         self.recorded_events = {}
         self.betmode = betmode
         self.num_sims = num_sims
+        self.batched_boards = {}
+        reset_win_cache_stats(self.config)
         for sim in range(
             thread_index * num_sims + (total_threads * num_sims) * repeat_count,
             (thread_index + 1) * num_sims + (total_threads * num_sims) * repeat_count,
         ):
             self.criteria = sim_to_criteria[sim]
+            if self.config.base_board_batch_size > 0:
+                self.queue_batched_board(sim, simulation_seeds[sim])
             self.run_spin(sim, simulation_seeds[sim])
+            self.queued_board = None
         mode_cost = self.get_current_betmode().get_cost()
 
         print(
@@ -274,6 +288,8 @@ class GeneralGameState(ABC):
             f"[baseGame: {round(self.win_manager.cumulative_base_wins/(num_sims*mode_cost), 3)}, freeGame: {round(self.win_manager.cumulative_free_wins/(num_sims*mode_cost), 3)}]",
             flush=True,
         )
+        for cache_name, cache_summary in get_win_cache_summaries(self.config).items():
+            print(f"Thread {thread_index} {cache_name} cache: {cache_summary}", flush=True)
 
         write_json(
             self,
@@ -1,49 +1,88 @@
 """Global multipliers, symbol multipliers, combined multipliers or no actions
-    All functions return [final_win_amount], [applied multiplier]"""
+    All strategies return [final_win_amount], [applied multiplier]"""
 
-from typing import List, Dict
+from typing import Callable, Dict, List, Sequence, Tuple, Union
+import numpy as np
 from src.calculations.board import Board
 
+MULTIPLIER_STRATEGIES: Dict[str, Callable] = {}
+
+
+def register_multiplier_strategy(name: str, uses_symbol_mults: bool = True) -> Callable:
+    """
+    Register a multiplier strategy under a name, for use as a decorator.
+
+    Strategies are called as strategy(win_amount, global_multiplier, multipliers), where multipliers holds the
+    multiplier value of each winning position (0 where the attribute is not present). Strategies registered with
+    uses_symbol_mults=False are passed an empty sequence, so the board is never read for them.
+    """
+
+    def register(func: Callable) -> Callable:
+        func.uses_symbol_mults = uses_symbol_mults
+        MULTIPLIER_STRATEGIES[name] = func
+        return func
+
+    return register
+
+
+def get_multiplier_strategy(name: str) -> Callable:
+    """Resolve a registered strategy, intended to be done once per evaluation rather than once per win."""
+    if name not in MULTIPLIER_STRATEGIES:
+        raise ValueError(f"Multiplier strategy '{name}' is not registered. Options: {list(MULTIPLIER_STRATEGIES)}")
+    return MULTIPLIER_STRATEGIES[name]
+
+
+def get_position_multipliers(
+    board: Board,
+    positions: List[Tuple[int, int]],
+    multiplier_key: str = "multiplier",
+    board_mults: np.ndarray = None,
+) -> list:
+    """
+    Multiplier values of the symbols at the given (reel, row) positions. Values are read from board_mults
+    (as encoded by Board.update_board_arrays()) when given, otherwise from the symbol attributes.
+    """
+    if board_mults is not None and multiplier_key == "multiplier":
+        return board_mults[[reel for reel, _ in positions], [row for _, row in positions]].tolist()
+    return [getattr(board[reel][row], multiplier_key, 0) for reel, row in positions]
+
 
 def apply_mult(
     board: Board,
     strategy: str,
     win_amount: float = 0.0,
     global_multiplier: int = 1,
-    positions: list = [],
+    positions: List[Union[Tuple[int, int], dict]] = [],
     multiplier_key: str = "multiplier",
+    board_mults: np.ndarray = None,
 ):
-    """Apply multiplier method to win_amount and winning symbol positions."""
-    strat = {
-        "global": apply_global_mult(win_amount, global_multiplier),
-        "symbol": apply_added_symbol_mult(board, win_amount, positions, multiplier_key=multiplier_key),
-        "combined": apply_combined_mult(
-            board, win_amount, global_multiplier, positions, multiplier_key=multiplier_key
-        ),
-    }
-    return strat[strategy]
-
-
-def apply_global_mult(win_amount: float, global_multiplier: int) -> tuple:
+    """Apply multiplier method to win_amount and winning symbol positions, given as (reel, row) or {"reel", "row"}."""
+    strategy_func = get_multiplier_strategy(strategy)
+    multipliers = ()
+    if strategy_func.uses_symbol_mults:
+        positions = [(pos["reel"], pos["row"]) if isinstance(pos, dict) else pos for pos in positions]
+        multipliers = get_position_multipliers(board, positions, multiplier_key, board_mults)
+    return strategy_func(win_amount, global_multiplier, multipliers)
+
+
+@register_multiplier_strategy("global", uses_symbol_mults=False)
+def apply_global_mult(win_amount: float, global_multiplier: int, multipliers: Sequence = ()) -> tuple:
     """Enhance win global multiplier"""
     return (round(win_amount * global_multiplier, 2), global_multiplier)
 
 
-def apply_added_symbol_mult(board: Board, win_amount: float, positions: List[Dict], multiplier_key: str) -> tuple:
-    """Get multiplier attribute from all winning positions"""
+@register_multiplier_strategy("symbol")
+def apply_added_symbol_mult(win_amount: float, global_multiplier: int, multipliers: Sequence) -> tuple:
+    """Sum all symbol multipliers greater than 1 from winning positions"""
     symbol_multiplier = 0
-    for pos in positions:
-        if (
-            board[pos["reel"]][pos["row"]].check_attribute(multiplier_key)
-            and board[pos["reel"]][pos["row"]].get_attribute(multiplier_key) > 1
-        ):
-            symbol_multiplier += board[pos["reel"]][pos["row"]].get_attribute(multiplier_key)
+    for value in multipliers:
+        if value > 1:
+            symbol_multiplier += value
     return (round(win_amount * max(symbol_multiplier, 1), 2), max(symbol_multiplier, 1))
 
 
-def apply_combined_mult(
-    board: Board, win_amount: float, global_multiplier: int, positions: List[Dict], multiplier_key
-) -> tuple:
+@register_multiplier_strategy("combined")
+def apply_combined_mult(win_amount: float, global_multiplier: int, multipliers: Sequence) -> tuple:
     """Apply symbol multipliers and then global multiplier"""
-    win, sym_mult = apply_added_symbol_mult(board, win_amount, positions, multiplier_key)
-    return (win * global_multiplier  , sym_mult * global_multiplier)
+    win, sym_mult = apply_added_symbol_mult(win_amount, global_multiplier, multipliers)
+    return (win * global_multiplier, sym_mult * global_multiplier)
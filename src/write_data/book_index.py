@@ -0,0 +1,206 @@
+"""
+Seekable compressed books: books written in independent zstd frames of a fixed number of books, with an index
+from book id to frame offset and line within the frame.
+
+Concatenated frames are still a single valid zstd stream, so readers which decompress the whole file are
+unaffected. The index stores the compressed offset and first book position of every frame, and book ids as runs
+of consecutive ids, so it stays small when ids are sequential.
+"""
+
+import io
+import os
+import json
+from typing import Iterator, List, Tuple
+import numpy as np
+import zstandard as zstd
+
+from src.write_data.compression import get_books_decompressor
+
+
+def get_book_index_path(books_path: str) -> str:
+    """Index file stored alongside a compressed books file: books_<mode>.jsonl.zst -> books_<mode>.index.npz"""
+    folder, filename = os.path.split(books_path)
+    return os.path.join(folder, filename.split(".")[0] + ".index.npz")
+
+
+def write_book_frames(f: object, compressor: zstd.ZstdCompressor, lines: Iterator[bytes], books_per_frame: int = 0):
+    """
+    Stream encoded books into an open binary file, starting a new zstd frame every books_per_frame books
+    (0 writes a single frame). Returns (number of books, end offset in f) of every frame.
+    """
+    frames = []
+    frame_books, total_books = 0, 0
+    with compressor.stream_writer(f, closefd=False) as writer:
+        for line in lines:
+            if books_per_frame > 0 and frame_books == books_per_frame:
+                writer.flush(zstd.FLUSH_FRAME)
+                frames.append((frame_books, f.tell()))
+                frame_books = 0
+            writer.write(line)
+            frame_books += 1
+            total_books += 1
+        if total_books == 0:
+            writer.write(b"\n")
+    frames.append((frame_books, f.tell()))
+    return frames
+
+
+def save_frame_index(index_path: str, frames: List[Tuple[int, int]], book_ids: List[int]) -> None:
+    """Temporary index of one books file: books and end offset of each frame, and the id of every book."""
+    np.savez(
+        index_path,
+        frame_books=np.array([frame[0] for frame in frames], dtype=np.uint64),
+        frame_ends=np.array([frame[1] for frame in frames], dtype=np.uint64),
+        book_ids=np.array(book_ids, dtype=np.uint64),
+    )
+
+
+def load_frame_index_book_ids(index_path: str) -> np.ndarray:
+    """Ordered book ids of a temporary index."""
+    with np.load(index_path) as data:
+        return data["book_ids"]
+
+
+class BookIndex:
+    """Location of every book in a seekable books file."""
+
+    def __init__(
+        self,
+        frame_offsets: np.ndarray,
+        frame_positions: np.ndarray,
+        run_ids: np.ndarray,
+        run_positions: np.ndarray,
+    ):
+        # frame_offsets[i] is the compressed offset of frame i, the final entry is the file size
+        self.frame_offsets = frame_offsets.astype(np.uint64)
+        # frame_positions[i] is the position (line number, ignoring blank lines) of frame i's first book
+        self.frame_positions = frame_positions.astype(np.uint64)
+        # book ids run_ids[i] + k are at position run_positions[i] + k, for k < run_positions[i + 1] - run_positions[i]
+        self.run_ids = run_ids.astype(np.uint64)
+        self.run_positions = run_positions.astype(np.uint64)
+        self._run_order = np.argsort(self.run_ids, kind="stable")
+        self._sorted_run_ids = self.run_ids[self._run_order]
+
+    @classmethod
+    def from_frames(cls, frame_books: np.ndarray, frame_ends: np.ndarray, book_ids: np.ndarray) -> "BookIndex":
+        """Index of a books file from the number of books and end offset of each frame, and the ordered book ids."""
+        book_ids = np.asarray(book_ids, dtype=np.int64)
+        run_starts = np.flatnonzero(np.diff(book_ids) != 1) + 1
+        if len(book_ids) > 0:
+            run_starts = np.concatenate([[0], run_starts])
+        start = np.zeros(1, dtype=np.uint64)
+        return cls(
+            np.concatenate([start, np.asarray(frame_ends, dtype=np.uint64)]),
+            np.concatenate([start, np.cumsum(frame_books, dtype=np.uint64)]),
+            book_ids[run_starts],
+            np.append(run_starts, len(book_ids)),
+        )
+
+    @classmethod
+    def load(cls, index_path: str) -> "BookIndex":
+        """Read a saved index."""
+        with np.load(index_path) as data:
+            return cls(data["frame_offsets"], data["frame_positions"], data["run_ids"], data["run_positions"])
+
+    def save(self, index_path: str) -> None:
+        """Write the index as an uncompressed numpy archive."""
+        np.savez(
+            index_path,
+            frame_offsets=self.frame_offsets,
+            frame_positions=self.frame_positions,
+            run_ids=self.run_ids,
+            run_positions=self.run_positions,
+        )
+
+    @property
+    def num_frames(self) -> int:
+        """Number of zstd frames in the books file."""
+        return len(self.frame_offsets) - 1
+
+    @property
+    def num_books(self) -> int:
+        """Number of books in the books file."""
+        return int(self.frame_positions[-1])
+
+    def locate(self, book_id: int) -> Tuple[int, int]:
+        """Frame containing a book and the book's line within it, raises KeyError for unknown ids."""
+        idx = int(np.searchsorted(self._sorted_run_ids, np.uint64(book_id), side="right")) - 1
+        if book_id < 0 or idx < 0:
+            raise KeyError(book_id)
+        run = self._run_order[idx]
+        offset = book_id - int(self.run_ids[run])
+        if offset >= int(self.run_positions[run + 1] - self.run_positions[run]):
+            raise KeyError(book_id)
+        position = int(self.run_positions[run]) + offset
+        frame = int(np.searchsorted(self.frame_positions, np.uint64(position), side="right")) - 1
+        return frame, position - int(self.frame_positions[frame])
+
+    def get_frame_range(self, frame: int) -> Tuple[int, int]:
+        """Compressed offset and size of a frame."""
+        return int(self.frame_offsets[frame]), int(self.frame_offsets[frame + 1] - self.frame_offsets[frame])
+
+
+def merge_book_indexes(index_list: list, books_file_list: list, output_path: str) -> None:
+    """
+    Combine the temporary indexes of books files merged in the same order by merge_zstd_files(), shifting frame
+    offsets by the size of the preceding files.
+    """
+    frame_books, frame_ends, book_ids = [], [], []
+    offset = 0
+    for index_path, books_path in zip(index_list, books_file_list):
+        with np.load(index_path) as data:
+            frame_books.append(data["frame_books"])
+            frame_ends.append(data["frame_ends"] + np.uint64(offset))
+            book_ids.append(data["book_ids"])
+        offset += os.path.getsize(books_path)
+    BookIndex.from_frames(np.concatenate(frame_books), np.concatenate(frame_ends), np.concatenate(book_ids)).save(
+        output_path
+    )
+
+
+class SeekableBooks:
+    """
+    Random access to a books file written with books_per_frame set. Each lookup decompresses only the frame
+    holding the book, the most recently read frame is kept.
+    """
+
+    def __init__(self, books_path: str, dictionary: bytes = None):
+        self.index = BookIndex.load(get_book_index_path(books_path))
+        self.decompressor = get_books_decompressor(books_path, dictionary)
+        self.file = open(books_path, "rb")
+        self._frame = None
+        self._frame_lines = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        """Close the books file."""
+        self.file.close()
+
+    def read_frame(self, frame: int) -> List[bytes]:
+        """Encoded books of one frame."""
+        if frame != self._frame:
+            offset, size = self.index.get_frame_range(frame)
+            self.file.seek(offset)
+            with self.decompressor.stream_reader(io.BytesIO(self.file.read(size))) as reader:
+                self._frame_lines = [line for line in reader.read().splitlines() if line.strip()]
+            self._frame = frame
+        return self._frame_lines
+
+    def get_book(self, book_id: int) -> dict:
+        """Book with the given id, raises KeyError if it is not in the file."""
+        frame, line = self.index.locate(book_id)
+        return json.loads(self.read_frame(frame)[line])
+
+    def get_books(self, first_id: int, last_id: int) -> Iterator[dict]:
+        """Books with ids from first_id to last_id inclusive, skipping ids not in the file."""
+        for book_id in range(first_id, last_id + 1):
+            try:
+                frame, line = self.index.locate(book_id)
+            except KeyError:
+                continue
+            yield json.loads(self.read_frame(frame)[line])
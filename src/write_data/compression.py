@@ -0,0 +1,111 @@
+"""zstd compression settings and dictionaries used when writing book files."""
+
+import os
+from warnings import warn
+import zstandard as zstd
+
+# Default zstd settings, matching zstd.ZstdCompressor() so existing books are unchanged.
+#   level: compression level, 1 (fastest) to 22 (smallest), negative levels trade ratio for speed
+#   threads: zstd worker threads per writer, 0 compresses on the calling thread, -1 uses one per logical CPU
+#   long_distance_matching: search for matches far back in the window, useful with large window_log values
+#   window_log: log2 of the match window size, 0 uses the level's default
+#   dictionary_size: size in bytes of a dictionary trained on each mode's first batch of books, 0 disables
+#   books_per_frame: books per independently decompressible frame, with an id index for random access.
+#       0 writes one frame per simulation batch and thread, without an index
+DEFAULT_COMPRESSION_OPTIONS = {
+    "level": 3,
+    "threads": 0,
+    "long_distance_matching": False,
+    "window_log": 0,
+    "dictionary_size": 0,
+    "books_per_frame": 0,
+}
+
+# Maximum number of books used to train a dictionary
+DICTIONARY_MAX_SAMPLES = 100000
+
+# Largest window decompressors accept without being configured otherwise (zstd's default memory limit)
+DEFAULT_MAX_WINDOW_LOG = 27
+# Bytes read to parse a zstd frame header, enough for the largest possible header
+MAX_FRAME_HEADER_SIZE = 18
+
+
+def get_compression_options(config: object, overrides: dict = None) -> dict:
+    """Compression settings of a config, with any unset options taken from the defaults."""
+    options = dict(DEFAULT_COMPRESSION_OPTIONS)
+    options.update(getattr(config, "compression_options", None) or {})
+    options.update(overrides or {})
+    unknown = set(options) - set(DEFAULT_COMPRESSION_OPTIONS)
+    if len(unknown) > 0:
+        raise ValueError(f"Unknown compression options: {sorted(unknown)}")
+    return options
+
+
+def get_zstd_compressor(options: dict, dictionary: bytes = None) -> zstd.ZstdCompressor:
+    """Compressor for a set of compression options, optionally using a trained dictionary."""
+    options = {**DEFAULT_COMPRESSION_OPTIONS, **options}
+    dict_data = zstd.ZstdCompressionDict(dictionary) if dictionary is not None else None
+    if not options["long_distance_matching"] and options["window_log"] == 0:
+        # zstd tunes the level's parameters to the input size when it is known
+        return zstd.ZstdCompressor(level=options["level"], threads=options["threads"], dict_data=dict_data)
+    params = zstd.ZstdCompressionParameters.from_level(
+        options["level"],
+        threads=options["threads"],
+        enable_ldm=int(options["long_distance_matching"]),
+        window_log=options["window_log"],
+    )
+    return zstd.ZstdCompressor(compression_params=params, dict_data=dict_data)
+
+
+def get_zstd_decompressor(options: dict = None, dictionary: bytes = None) -> zstd.ZstdDecompressor:
+    """Decompressor accepting the window size produced by a set of compression options, and their dictionary."""
+    window_log = max((options or {}).get("window_log", 0), DEFAULT_MAX_WINDOW_LOG)
+    dict_data = zstd.ZstdCompressionDict(dictionary) if dictionary is not None else None
+    return zstd.ZstdDecompressor(dict_data=dict_data, max_window_size=2**window_log)
+
+
+def get_frame_window_log(frame_header: bytes) -> int:
+    """log2 (rounded up) of the window size declared by a zstd frame header, 0 if the header cannot be read."""
+    try:
+        window_size = zstd.get_frame_parameters(frame_header).window_size
+    except zstd.ZstdError:
+        return 0
+    return max(window_size - 1, 0).bit_length()
+
+
+def get_books_decompressor(books_path: str, dictionary: bytes = None) -> zstd.ZstdDecompressor:
+    """
+    Decompressor for a compressed books file, accepting the window size declared by its first frame so books written
+    with window_log above DEFAULT_MAX_WINDOW_LOG can be read. Uses the books_<mode>.dict file alongside the books,
+    if there is one, unless a dictionary is given.
+    """
+    with open(books_path, "rb") as f:
+        window_log = get_frame_window_log(f.read(MAX_FRAME_HEADER_SIZE))
+    return get_zstd_decompressor({"window_log": window_log}, dictionary or load_book_dictionary(books_path))
+
+
+def train_book_dictionary(samples: list, dictionary_size: int, level: int = 3) -> bytes:
+    """
+    Train a zstd dictionary on encoded books. Returns None, with a warning, if zstd cannot train a dictionary of
+    the requested size, which happens when there are too few samples.
+    """
+    try:
+        return zstd.train_dictionary(dictionary_size, samples[:DICTIONARY_MAX_SAMPLES], level=level).as_bytes()
+    except zstd.ZstdError as err:
+        warn(f"Could not train a books dictionary from {len(samples)} books ({err}), books are not using one.")
+        return None
+
+
+def get_book_dictionary_path(books_path: str) -> str:
+    """Dictionary file stored alongside a compressed books file: books_<mode>.jsonl.zst -> books_<mode>.dict"""
+    folder, filename = os.path.split(books_path)
+    return os.path.join(folder, filename.split(".")[0] + ".dict")
+
+
+def load_book_dictionary(books_path: str) -> bytes:
+    """Dictionary used by a compressed books file, or None if it was written without one."""
+    dictionary_path = get_book_dictionary_path(books_path)
+    if not os.path.isfile(dictionary_path):
+        return None
+    with open(dictionary_path, "rb") as f:
+        return f.read()
@@ -0,0 +1,119 @@
+"""
+Temporary force files, holding the recorded event descriptions of one simulation thread and batch with the
+ids of the books in which each occurred.
+
+Each file is a description table followed by the packed book ids of every description:
+
+    uint64 table size | JSON table [{"search": [[key, value], ...], "timesTriggered": n, "numIds": m}, ...] |
+    uint64 book ids, in table order
+
+Book ids are read back with numpy without parsing. Merging and writing the final force record hold only one
+file's ids of one description in memory at a time.
+"""
+
+import json
+from contextlib import ExitStack
+from typing import BinaryIO, Iterator, List, Tuple
+import numpy as np
+
+# Byte order and width of stored book ids
+FORCE_ID_DTYPE = np.dtype("<u8")
+TABLE_SIZE_BYTES = 8
+
+
+def write_force_file(recorded_events: dict, filename: str) -> None:
+    """Write recorded events, {description: {"timesTriggered": n, "bookIds": [...]}}, to a temporary force file."""
+    table = [
+        {
+            "search": [list(key_value) for key_value in description],
+            "timesTriggered": record["timesTriggered"],
+            "numIds": len(record["bookIds"]),
+        }
+        for description, record in recorded_events.items()
+    ]
+    encoded_table = json.dumps(table).encode("UTF-8")
+    with open(filename, "wb") as f:
+        f.write(len(encoded_table).to_bytes(TABLE_SIZE_BYTES, "little"))
+        f.write(encoded_table)
+        for record in recorded_events.values():
+            np.asarray(record["bookIds"], dtype=FORCE_ID_DTYPE).tofile(f)
+
+
+def read_force_table(filename: str) -> List[Tuple[tuple, int, int, int]]:
+    """Description, times triggered, byte offset and number of book ids of every record in a temporary force file."""
+    with open(filename, "rb") as f:
+        table_size = int.from_bytes(f.read(TABLE_SIZE_BYTES), "little")
+        table = json.loads(f.read(table_size))
+
+    records = []
+    offset = TABLE_SIZE_BYTES + table_size
+    for record in table:
+        description = tuple(tuple(key_value) for key_value in record["search"])
+        records.append((description, record["timesTriggered"], offset, record["numIds"]))
+        offset += record["numIds"] * FORCE_ID_DTYPE.itemsize
+    return records
+
+
+def read_force_ids(f: BinaryIO, offset: int, num_ids: int) -> np.ndarray:
+    """Book ids of one record of an open temporary force file."""
+    f.seek(offset)
+    return np.fromfile(f, dtype=FORCE_ID_DTYPE, count=num_ids)
+
+
+def merge_force_files(file_list: list) -> Iterator[Tuple[tuple, int, Iterator[np.ndarray]]]:
+    """
+    Merge temporary force files given in simulation order, yielding (description, times triggered, book ids)
+    for each description in order of first occurrence. Book ids are yielded lazily as one array per file
+    containing the description, so remain in simulation order and only one file's ids are held in memory.
+    The ids of each description must be consumed before moving on to the next. Files holding book ids are kept
+    open until the merge is complete.
+    """
+    locations = {}
+    for filename in file_list:
+        for description, times_triggered, offset, num_ids in read_force_table(filename):
+            locations.setdefault(description, []).append((filename, times_triggered, offset, num_ids))
+
+    with ExitStack() as stack:
+        files = {}
+        for parts in locations.values():
+            for filename, _, _, _ in parts:
+                if filename not in files:
+                    files[filename] = stack.enter_context(open(filename, "rb"))
+
+        for description, parts in locations.items():
+            book_ids = (read_force_ids(files[filename], offset, num_ids) for filename, _, offset, num_ids in parts)
+            yield description, sum(part[1] for part in parts), book_ids
+
+
+def write_force_record(
+    records: Iterator[Tuple[tuple, int, Iterator[np.ndarray]]], filename: str, compact: bool = False
+) -> List[tuple]:
+    """
+    Write force_record_<mode>.json one description at a time from merged records, returning the descriptions.
+    The output matches json.dumps() of the full record list, with indent=4 unless compact.
+    """
+
+    def line_break(level: int) -> str:
+        return "" if compact else "\n" + " " * (4 * level)
+
+    separator = ", " if compact else ","
+    descriptions = []
+    with open(filename, "w", encoding="UTF-8") as f:
+        f.write("[")
+        for description, times_triggered, book_id_chunks in records:
+            search = [{"name": str(key), "value": str(value)} for key, value in description]
+            search_text = json.dumps(search) if compact else json.dumps(search, indent=4).replace("\n", line_break(2))
+            f.write(separator if len(descriptions) > 0 else "")
+            f.write(line_break(1) + "{" + line_break(2) + '"search": ' + search_text + separator)
+            f.write(line_break(2) + f'"timesTriggered": {times_triggered}' + separator)
+            f.write(line_break(2) + '"bookIds": [')
+            num_ids = 0
+            for book_ids in book_id_chunks:
+                if len(book_ids) > 0:
+                    f.write(separator if num_ids > 0 else "")
+                    f.write(line_break(3) + (separator + line_break(3)).join(map(str, book_ids.tolist())))
+                    num_ids += len(book_ids)
+            f.write((line_break(2) if num_ids > 0 else "") + "]" + line_break(1) + "}")
+            descriptions.append(description)
+        f.write((line_break(0) if len(descriptions) > 0 else "") + "]")
+    return descriptions
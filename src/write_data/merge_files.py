@@ -0,0 +1,84 @@
+"""
+Concatenation of temporary output files. Data is copied inside the kernel with os.copy_file_range or
+os.sendfile where the platform supports them, falling back to buffered reads and writes, so file contents
+are never loaded into memory.
+"""
+
+import os
+
+# Read/write size used when streaming file contents
+COPY_CHUNK_SIZE = 2**20
+# Largest number of bytes requested from a single kernel copy call
+MAX_KERNEL_COPY_SIZE = 2**30
+
+
+def _copy_file_range(in_fd: int, out_fd: int, offset: int, count: int) -> int:
+    return os.copy_file_range(in_fd, out_fd, count, offset)
+
+
+def _sendfile(in_fd: int, out_fd: int, offset: int, count: int) -> int:
+    return os.sendfile(out_fd, in_fd, offset, count)
+
+
+KERNEL_COPY_METHODS = [
+    method
+    for method, name in [(_copy_file_range, "copy_file_range"), (_sendfile, "sendfile")]
+    if hasattr(os, name)
+]
+
+
+def append_file(outfile: object, filename: str, start: int = 0, end: int = None) -> None:
+    """
+    Append bytes start to end (default end of file) of a file to an unbuffered binary output file. Kernel copy
+    methods which are unsupported for the pair of files are skipped, continuing from the bytes already copied.
+    """
+    out_fd = outfile.fileno()
+    with open(filename, "rb") as infile:
+        in_fd = infile.fileno()
+        end = os.fstat(in_fd).st_size if end is None else end
+        offset = start
+        for method in KERNEL_COPY_METHODS:
+            try:
+                while offset < end:
+                    copied = method(in_fd, out_fd, offset, min(end - offset, MAX_KERNEL_COPY_SIZE))
+                    if copied == 0:
+                        break
+                    offset += copied
+            except OSError:
+                continue
+            if offset >= end:
+                return
+
+        infile.seek(offset)
+        while offset < end:
+            chunk = infile.read(min(COPY_CHUNK_SIZE, end - offset))
+            if not chunk:
+                break
+            outfile.write(chunk)
+            offset += len(chunk)
+
+
+def concatenate_files(file_list: list, output_path: str) -> None:
+    """Write the contents of several files, in order, to a single output file."""
+    with open(output_path, "wb", buffering=0) as outfile:
+        for filename in file_list:
+            append_file(outfile, filename)
+
+
+def merge_json_array_files(file_list: list, output_path: str) -> None:
+    """
+    Combine files each holding a JSON array (as written by json.dumps) into a single array, copying the
+    elements of each file between its opening '[' and closing ']'. Files holding empty arrays are skipped.
+    """
+    with open(output_path, "wb", buffering=0) as outfile:
+        outfile.write(b"[")
+        first = True
+        for filename in file_list:
+            size = os.path.getsize(filename)
+            if size <= len(b"[]"):
+                continue
+            if not first:
+                outfile.write(b",")
+            append_file(outfile, filename, 1, size - 1)
+            first = False
+        outfile.write(b"]")
@@ -55,6 +55,8 @@ def make_index_config(gamestate: object):
             mode_obj["cost"] = cost_map[bm["name"]]
             mode_obj["events"] = bm["booksFile"]["file"]
             mode_obj["weights"] = bm["tables"][0]["file"]
+            if "booksDictionaryFile" in bm:
+                mode_obj["dictionary"] = bm["booksDictionaryFile"]["file"]
 
             manifest_object["modes"].append(mode_obj)
 
@@ -369,6 +371,12 @@ def make_be_config(gamestate):
             "file": gamestate.output_files.books[bet.get_name()]["names"]["books_compressed"],
             "sha256": data_sha,
         }
+        dictionary_loc = gamestate.output_files.books[bet.get_name()]["paths"]["dictionary"]
+        if os.path.isfile(dictionary_loc):
+            dic["booksDictionaryFile"] = {
+                "file": gamestate.output_files.books[bet.get_name()]["names"]["dictionary"],
+                "sha256": get_hash(dictionary_loc),
+            }
         dic["forceFile"] = {
             "file": gamestate.output_files.force[bet.get_name()]["names"]["force_record"],
             "sha256": force_sha,
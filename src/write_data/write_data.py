@@ -1,13 +1,28 @@
 """Handles writing all game game files"""
 
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 import shutil
 import os
 import hashlib
 import json
-import ast
-import zstandard as zstd
+from src.write_data.book_index import (
+    get_book_index_path,
+    load_frame_index_book_ids,
+    merge_book_indexes,
+    save_frame_index,
+    write_book_frames,
+)
+from src.write_data.compression import (
+    get_compression_options,
+    get_books_decompressor,
+    get_zstd_compressor,
+    load_book_dictionary,
+    train_book_dictionary,
+)
+from src.write_data.force_record import merge_force_files, write_force_file, write_force_record
+from src.write_data.merge_files import COPY_CHUNK_SIZE, concatenate_files, merge_json_array_files
 
 
 def get_sha_256(file_to_hash: str):
@@ -66,9 +81,9 @@ def make_force_json(gamestate: object):
 
 
 def get_force_options(force_results: dict):
-    """Return JSON ready force keys."""
+    """Return JSON ready force keys from recorded descriptions, or a dict keyed by them."""
     force_keys = defaultdict(set)
-    for force in force_results.keys():
+    for force in force_results:
         for key, val in force:
             force_keys[str(key)].add(val)
     return {key: list(val) for key, val in force_keys.items()}
@@ -124,95 +139,104 @@ def write_library_events(gamestate: object, library: list, gametype: str):
         f.write(json_object)
 
 
-def output_lookup_and_force_files(
-    threads: int,
-    batching_size: int,
-    game_id: str,
-    betmode: str,
-    gamestate: object,
-    num_sims: int = 1000000,
-    compress: bool = True,
-):
-    """Combine temporary lookup tables and force files into a single output."""
-    print("Saving books for ", game_id, "in", betmode)
-    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_multi_thread_name(betmode, thread, repeat_index, compress)
-            )
+def get_zstd_content_hash(file_list: list, dictionary: bytes = None) -> str:
+    """
+    SHA256 of the decompressed contents of zstd files, streamed as one continuous output across all frames.
+    Files compressed with a trained dictionary require the dictionary.
+    """
+    sha256_content = hashlib.sha256()
+    for filename in file_list:
+        decompressor = get_books_decompressor(filename, dictionary)
+        with open(filename, "rb") as f, decompressor.stream_reader(f, read_across_frames=True) as reader:
+            while True:
+                chunk = reader.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                sha256_content.update(chunk)
+    return sha256_content.hexdigest()
+
+
+def merge_zstd_files(file_list: list, output_path: str, verify: bool = False, dictionary: bytes = None) -> None:
+    """
+    Combine zstd compressed files by copying their frames byte-for-byte into a single multi-frame file.
+    Concatenated zstd frames decompress to the concatenation of their contents, so no data is decompressed or
+    recompressed. If verify is True the output is decompressed, using the files' dictionary if they were
+    compressed with one, and checked against the input files.
+    """
+    concatenate_files(file_list, output_path)
+
+    if verify and get_zstd_content_hash(file_list, dictionary) != get_zstd_content_hash([output_path], dictionary):
+        raise RuntimeError(f"Merged file {output_path} does not match the contents of its temporary files.")
+
+
+def reset_book_dictionary(gamestate: object, betmode: str) -> None:
+    """Compress books without a dictionary, removing any dictionary left by a previous run of the mode."""
+    gamestate.config._book_dictionary = None
+    dictionary_path = gamestate.output_files.get_dictionary_name(betmode)
+    if os.path.isfile(dictionary_path):
+        os.remove(dictionary_path)
+
+
+def create_book_dictionary(gamestate: object, betmode: str, threads: int) -> None:
+    """
+    Train a zstd dictionary on the books of the first simulation batch and save it with the publish files.
+    The batch's temporary files are recompressed with the dictionary, and later batches compress with it.
+    """
+    options = get_compression_options(gamestate.config)
+    file_list = [
+        gamestate.output_files.get_temp_multi_thread_name(betmode, thread, 0, True) for thread in range(threads)
+    ]
+    file_lines = []
+    for filename in file_list:
+        decompressor = get_books_decompressor(filename)
+        with open(filename, "rb") as f, decompressor.stream_reader(f, read_across_frames=True) as reader:
+            file_lines.append([line for line in reader.read().splitlines(keepends=True) if line.strip()])
+
+    samples = [line for lines in file_lines for line in lines]
+    dictionary = train_book_dictionary(samples, options["dictionary_size"], options["level"])
+    if dictionary is None:
+        return
+
+    with open(gamestate.output_files.get_dictionary_name(betmode), "wb") as f:
+        f.write(dictionary)
+    gamestate.config._book_dictionary = dictionary
+    compressor = get_zstd_compressor(options, dictionary)
+    for filename, lines in zip(file_list, file_lines):
+        with open(filename, "wb") as f:
+            frames = write_book_frames(f, compressor, lines, options["books_per_frame"])
+        if options["books_per_frame"] > 0:
+            # Book order is unchanged, only frame offsets move
+            index_path = get_book_index_path(filename)
+            save_frame_index(index_path, frames, load_frame_index_book_ids(index_path))
 
+
+def merge_book_files(gamestate: object, betmode: str, file_list: list, compress: bool, verify_merge: bool) -> None:
+    """Combine temporary book files, and their frame indexes when books are written in fixed-size frames."""
+    books_path = gamestate.output_files.get_final_book_name(betmode, compress)
     if compress:
-        temp_book_output_path = os.path.join(gamestate.output_files.book_path, "temp_book_output.json")
-        with open(temp_book_output_path, "w", encoding="UTF-8") as outfile:
-            for fname in file_list:
-                with open(fname, "rb") as infile:
-                    decompressed = zstd.ZstdDecompressor().decompress(infile.read())
-                    outfile.write(decompressed.decode("UTF-8"))
-
-        final_out = gamestate.output_files.get_final_book_name(betmode, True)
-        with open(temp_book_output_path, "rb") as f_in, open(final_out, "wb") as f_out:
-            f_out.write(zstd.ZstdCompressor().compress(f_in.read()))
-
-        os.remove(temp_book_output_path)
+        dictionary = None
+        if verify_merge:
+            dictionary = getattr(gamestate.config, "_book_dictionary", None) or load_book_dictionary(books_path)
+        merge_zstd_files(file_list, books_path, verify_merge, dictionary)
+        if get_compression_options(gamestate.config)["books_per_frame"] > 0:
+            index_list = [get_book_index_path(filename) for filename in file_list]
+            merge_book_indexes(index_list, file_list, get_book_index_path(books_path))
+        elif os.path.isfile(get_book_index_path(books_path)):
+            os.remove(get_book_index_path(books_path))
+    elif books_path.endswith(".json"):
+        merge_json_array_files(file_list, books_path)
     else:
-        with open(
-            gamestate.output_files.get_final_book_name(betmode, False),
-            "w",
-            encoding="UTF-8",
-        ) as outfile:
-            for id, filename in enumerate(file_list):
-                with open(filename, "r", encoding="UTF-8") as infile:
-                    file_data = infile.read()
-                    if filename.endswith(".jsonl"):
-                        outfile.write(file_data)
-                    elif filename.endswith(".json"):
-                        if id == 0 and len(file_list) == 1:
-                            outfile.write(file_data)
-                        elif id == 0 and len(file_list) > 1:
-                            outfile.write(file_data[:-1])  # don't write final ']'
-                        elif id != len(file_list) - 1:
-                            outfile.write("," + file_data[1:-1])  # don't write first or last '[/]'
-                        else:
-                            outfile.write("," + file_data[1::])  # dont write first '[', write last ']'
-
-    print("Saving force files for", game_id, "in", betmode)
-    force_results_dict = {}
-    file_list = []
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            file_list.append(
-                gamestate.output_files.get_temp_force_name(betmode, thread, repeat_index),
-            )
+        concatenate_files(file_list, books_path)
 
-    for filename in file_list:
-        force_chunk = ast.literal_eval(json.load(open(filename, "r", encoding="UTF-8")))
-        for key in force_chunk:
-            if force_results_dict.get(key) is not None:
-                force_results_dict[key]["timesTriggered"] += force_chunk[key]["timesTriggered"]
-                force_results_dict[key]["bookIds"] += force_chunk[key]["bookIds"]
-            else:
-                force_results_dict[key] = force_chunk[key]
-
-    force_results_dict_just_for_rob = []
-    for force_combination in force_results_dict:
-        search_dict = []
-        for key in force_combination:
-            search_dict.append({"name": str(key[0]), "value": str(key[1])})
-        force_dict = {
-            "search": search_dict,
-            "timesTriggered": force_results_dict[force_combination]["timesTriggered"],
-            "bookIds": force_results_dict[force_combination]["bookIds"],
-        }
-        force_results_dict_just_for_rob.append(force_dict)
-
-    json_object_for_rob = json.dumps(force_results_dict_just_for_rob, indent=4)
+
+def merge_force_record_files(gamestate: object, betmode: str, file_list: list) -> None:
+    """Write force_record_<mode>.json from temporary force files and add the mode's search keys to force.json."""
     force_record_path = os.path.join(gamestate.output_files.force_path, f"force_record_{betmode}.json")
-    with open(force_record_path, "w", encoding="UTF-8") as file:
-        file.write(json_object_for_rob)
+    descriptions = write_force_record(
+        merge_force_files(file_list), force_record_path, getattr(gamestate.config, "compact_force_record", False)
+    )
 
-    forceResultKeys = get_force_options(force_results_dict)
+    forceResultKeys = get_force_options(descriptions)
     json_file_path = os.path.join(gamestate.output_files.force_path, "force.json")
     try:
         with open(json_file_path, "r", encoding="UTF-8") as file:
@@ -224,26 +248,10 @@ def output_lookup_and_force_files(
     with open(json_file_path, "w", encoding="UTF-8") as file:
         file.write(json_object)
 
-    weights_plus_wins_file_list = []
-    segmented_lut_file_list = []
-    print("Saving LUTs for", game_id, "in", betmode)
-    for repeat_index in range(num_repeats):
-        for thread in range(threads):
-            weights_plus_wins_file_list += [
-                gamestate.output_files.get_temp_lookup_name(betmode, thread, repeat_index)
-            ]
-            segmented_lut_file_list += [
-                gamestate.output_files.get_temp_segmented_name(betmode, thread, repeat_index)
-            ]
 
-    with open(
-        gamestate.output_files.get_final_lookup_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
-        for filename in weights_plus_wins_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
-                outfile.write(infile.read())
+def merge_lookup_files(gamestate: object, betmode: str, file_list: list) -> None:
+    """Combine temporary lookup tables, creating the _0 lookup table if it does not exist."""
+    concatenate_files(file_list, gamestate.output_files.get_final_lookup_name(betmode))
 
     # Write _0 file if it does not exist
     if not (os.path.exists(gamestate.output_files.get_optimized_lookup_name(betmode))):
@@ -251,27 +259,59 @@ def output_lookup_and_force_files(
             gamestate.output_files.get_final_lookup_name(betmode),
             gamestate.output_files.get_optimized_lookup_name(betmode),
         )
-    with open(
-        gamestate.output_files.get_final_segmented_name(betmode),
-        "w",
-        encoding="UTF-8",
-    ) as outfile:
-        for filename in segmented_lut_file_list:
-            with open(filename, "r", encoding="UTF-8") as infile:
-                outfile.write(infile.read())
 
 
-def write_json(gamestate, filename: str):
-    """Convert the list of dictionaries to a JSON-encoded string and compress it in chunks."""
-    json_objects = [json.dumps(item) for item in gamestate.library.values()]
-    combined_data = "\n".join(json_objects) + "\n"
+def output_lookup_and_force_files(
+    threads: int,
+    batching_size: int,
+    game_id: str,
+    betmode: str,
+    gamestate: object,
+    num_sims: int = 1000000,
+    compress: bool = True,
+    verify_merge: bool = False,
+):
+    """
+    Combine temporary books, force files, lookup tables and segmented lookup tables into their outputs.
+    The four merges are independent and run in parallel threads.
+    """
+    num_repeats = max(int(round(num_sims / threads / batching_size, 0)), 1)
+    batches = [(thread, repeat_index) for repeat_index in range(num_repeats) for thread in range(threads)]
+    output_files = gamestate.output_files
+    book_list = [output_files.get_temp_multi_thread_name(betmode, *batch, compress) for batch in batches]
+    force_list = [output_files.get_temp_force_name(betmode, *batch) for batch in batches]
+    lookup_list = [output_files.get_temp_lookup_name(betmode, *batch) for batch in batches]
+    segmented_list = [output_files.get_temp_segmented_name(betmode, *batch) for batch in batches]
+
+    print("Saving books, force files and LUTs for", game_id, "in", betmode)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        merges = [
+            executor.submit(merge_book_files, gamestate, betmode, book_list, compress, verify_merge),
+            executor.submit(merge_force_record_files, gamestate, betmode, force_list),
+            executor.submit(merge_lookup_files, gamestate, betmode, lookup_list),
+            executor.submit(concatenate_files, segmented_list, output_files.get_final_segmented_name(betmode)),
+        ]
+        for merge in merges:
+            merge.result()
+
 
+def write_json(gamestate, filename: str):
+    """
+    Write the library as JSON-lines. Compressed files are streamed through zstd one book at a time, using the
+    config's compression_options.
+    """
     if filename.endswith(".zst"):
-        compressor = zstd.ZstdCompressor()
-        compressed_data = compressor.compress(combined_data.encode("UTF-8"))
+        options = get_compression_options(gamestate.config)
+        compressor = get_zstd_compressor(options, getattr(gamestate.config, "_book_dictionary", None))
+        lines = ((json.dumps(item) + "\n").encode("UTF-8") for item in gamestate.library.values())
         with open(filename, "wb") as f:
-            f.write(compressed_data)
+            frames = write_book_frames(f, compressor, lines, options["books_per_frame"])
+        if options["books_per_frame"] > 0:
+            book_ids = [item["id"] for item in gamestate.library.values()]
+            save_frame_index(get_book_index_path(filename), frames, book_ids)
     else:
+        json_objects = [json.dumps(item) for item in gamestate.library.values()]
+        combined_data = "\n".join(json_objects) + "\n"
         with open(filename, "w", encoding="UTF-8") as f:
             if not (gamestate.config.output_regular_json):
                 f.write(combined_data)
@@ -282,7 +322,4 @@ def write_json(gamestate, filename: str):
 
 def print_recorded_wins(gamestate: object, name: str = ""):
     """Temporary file generation for wins/recorded results."""
-    json_object = json.dumps(str(gamestate.recorded_events), indent=4)
-    file = open(name, "w", encoding="UTF-8")
-    file.write(json_object)
-    file.close()
+    write_force_file(gamestate.recorded_events, name)
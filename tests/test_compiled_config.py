@@ -0,0 +1,96 @@
+"""Test the compiled config cache."""
+
+import os
+import numpy as np
+from src.config.config import Config
+from src.config.compiled_config import CompiledConfig, get_compiled_config, get_compiled_paytable
+from tests.win_calculations.test_linespay import GameLinesConfig
+
+
+def test_read_reels_csv(tmp_path):
+    "Whitespace and non-alphanumeric characters are stripped from symbol names."
+    csv_path = tmp_path / "reel.csv"
+    csv_path.write_text("L1, H1 ,W\r\nS,'L2',H2\n")
+    config = Config()
+    assert config.read_reels_csv(str(csv_path)) == [["L1", "S"], ["H1", "L2"], ["W", "H2"]]
+    assert os.path.abspath(str(csv_path)) in config.reel_file_hashes
+
+
+def test_compiled_config_roundtrip(tmp_path):
+    "Saved arrays are memory-mapped on load and match the config definitions."
+    csv_path = tmp_path / "BR0.csv"
+    csv_path.write_text("W,H1,S,X,WM\nH1,WM,H1,W,S\nX,X,W,H1,H1\n")
+    config = GameLinesConfig()
+    config.reels = {"BR0": Config().read_reels_csv(str(csv_path))}
+    compiled = get_compiled_config(config)
+    compiled.save(str(tmp_path / "cache"))
+    loaded = CompiledConfig.load(str(tmp_path / "cache"))
+
+    assert isinstance(loaded.reels["BR0"], np.memmap)
+    assert loaded.symbol_names == compiled.symbol_names
+    assert np.array_equal(loaded.paylines, [config.paylines[idx] for idx in config.paylines])
+    assert loaded.paytable[loaded.symbol_names.index("H1"), 4] == config.paytable[(4, "H1")]
+    assert [[loaded.symbol_names[i] for i in reel] for reel in loaded.reels["BR0"]] == config.reels["BR0"]
+
+
+def test_compiled_paytable():
+    "Dense payouts and authored values are available by symbol and kind."
+    config = GameLinesConfig()
+    paytable = get_compiled_paytable(config)
+    h1 = paytable.symbol_table.ids["H1"]
+    assert paytable.dense[h1, 5] == config.paytable[(5, "H1")]
+    assert paytable.max_kind[h1] == 5
+    assert paytable.max_kind[paytable.symbol_table.ids["S"]] == 0
+    assert paytable.get_payout(5, "H1") is config.paytable[(5, "H1")]
+    assert paytable.get_payout(2, "H1") == 0 and paytable.get_payout(9, "H1") == 0 and paytable.get_payout(5, "S") == 0
+    assert list(paytable.lookup(np.array([h1, h1]), np.array([5, 40]))) == [config.paytable[(5, "H1")], 0.0]
+    assert get_compiled_paytable(config) is paytable
+
+
+def test_config_compiled_paytable_range_table():
+    "Range tables expand to every kind in the compiled paytable."
+    config = Config()
+    config.special_symbols = {"wild": ["W"]}
+    config.paytable = config.convert_range_table({((5, 6), "H1"): 1.5, ((7, 30), "H1"): 4})
+    assert config.compiled_paytable.get_payout(6, "H1") == 1.5
+    assert config.compiled_paytable.get_payout(30, "H1") == 4
+    assert config.compiled_paytable.get_payout(31, "H1") == 0
+
+
+def test_compiled_config_cache_is_kept(tmp_path, monkeypatch):
+    "Completed caches are never replaced, a process losing the race to write one loads the existing cache."
+    config = GameLinesConfig()
+    config.library_path = str(tmp_path)
+    config.reels = {"BR0": [["W", "H1", "S"], ["H1", "WM", "X"], ["X", "W", "H1"]]}
+    compiled = get_compiled_config(config)
+    assert isinstance(compiled.reels["BR0"], np.memmap)
+    cache_path = os.path.join(str(tmp_path), "cache")
+    (folder_name,) = os.listdir(cache_path)
+    manifest_path = os.path.join(cache_path, folder_name, "manifest.json")
+    written = os.stat(manifest_path).st_mtime_ns
+
+    # Another process completes the same cache while this one is writing its own
+    other_path = str(tmp_path / "other")
+    real_rename = os.rename
+    real_rename(os.path.join(cache_path, folder_name), other_path)
+
+    def rename_after_other_process(src, dst):
+        real_rename(other_path, dst)
+        real_rename(src, dst)
+
+    monkeypatch.setattr(os, "rename", rename_after_other_process)
+    config._compiled_config = None
+    loaded = get_compiled_config(config)
+    monkeypatch.undo()
+    assert os.listdir(cache_path) == [folder_name]
+    assert os.stat(manifest_path).st_mtime_ns == written
+    assert np.array_equal(loaded.reels["BR0"], compiled.reels["BR0"])
+
+    # A cache folder not matching the config is left in place
+    os.remove(manifest_path)
+    config._compiled_config = None
+    rebuilt = get_compiled_config(config)
+    assert not isinstance(rebuilt.reels["BR0"], np.memmap)
+    assert np.array_equal(rebuilt.reels["BR0"], compiled.reels["BR0"])
+    assert os.listdir(cache_path) == [folder_name]
+    assert sorted(os.listdir(os.path.join(cache_path, folder_name))) == ["paylines.npy", "paytable.npy", "reels_0.npy"]
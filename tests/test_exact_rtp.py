@@ -0,0 +1,77 @@
+"""Test exact full-cycle win statistics against brute-force evaluation of every reel stop."""
+
+import itertools
+import random
+import pytest
+from src.calculations.lines import Lines
+from src.calculations.ways import Ways
+from tests.win_calculations.game_test_config import GamestateTest
+from tests.win_calculations.test_linespay import GameLinesConfig
+from tests.win_calculations.test_wayspay import GameWaysConfig
+from utils.game_analytics.exact_rtp import (
+    get_lines_expected_win,
+    get_ways_expected_win,
+    get_win_distribution,
+    run_exact_analysis,
+)
+
+
+def create_small_config(config_class, names):
+    """Four reel, three row config with short random reelstrips."""
+    config = config_class()
+    config.num_reels = 4
+    config.num_rows = [3] * config.num_reels
+    if hasattr(config, "paylines"):
+        config.paylines = {1: [0, 0, 0, 0], 2: [0, 1, 2, 1], 3: [2, 2, 1, 0]}
+        config.paytable = {key: value for key, value in config.paytable.items() if key[0] < 5}
+    rng = random.Random(5)
+    config.reels = {"BR0": [[rng.choice(names) for _ in range(7)] for _ in range(config.num_reels)]}
+    return config
+
+
+def get_brute_force_distribution(config, evaluate):
+    """Win distribution found by evaluating the board of every stop combination."""
+    gamestate = GamestateTest(config)
+    gamestate.create_symbol_map()
+    gamestate.assign_special_sym_function()
+    gamestate.special_symbol_functions = {}
+    reelstrip = config.reels["BR0"]
+    distribution = {}
+    for stops in itertools.product(*[range(len(reel)) for reel in reelstrip]):
+        board = [
+            [gamestate.create_symbol(reel[(stop + row) % len(reel)]) for row in range(config.num_rows[idx])]
+            for idx, (reel, stop) in enumerate(zip(reelstrip, stops))
+        ]
+        win = evaluate(board, config)
+        distribution[win] = distribution.get(win, 0) + 1
+    return distribution
+
+
+def test_exact_lines_matches_brute_force():
+    "Lines distribution and expected win match evaluation of every board."
+    config = create_small_config(GameLinesConfig, ["W", "H1", "WM", "X", "S"])
+    brute_force = get_brute_force_distribution(
+        config, lambda board, config: Lines.get_lines(board, config, multiplier_method="global")["totalWin"]
+    )
+    distribution = get_win_distribution(config, "BR0", "lines", processes=1)
+    assert sorted(distribution) == pytest.approx(sorted(brute_force))
+    assert [distribution[win] for win in sorted(distribution)] == [brute_force[win] for win in sorted(brute_force)]
+
+    results = run_exact_analysis(config, "lines", processes=1)
+    expected = sum(win * weight for win, weight in brute_force.items()) / 7**4
+    assert results["BR0"].rtp == pytest.approx(expected)
+    assert get_lines_expected_win(config, "BR0") == pytest.approx(expected)
+
+
+def test_exact_ways_matches_brute_force():
+    "Ways distribution and expected win match evaluation of every board."
+    config = create_small_config(GameWaysConfig, ["W", "H1", "H2", "X", "S"])
+    brute_force = get_brute_force_distribution(
+        config, lambda board, config: Ways.get_ways_data(config, board, multiplier_strategy="global")["totalWin"]
+    )
+    distribution = get_win_distribution(config, "BR0", "ways", processes=2)
+    assert sorted(distribution) == pytest.approx(sorted(brute_force))
+    assert [distribution[win] for win in sorted(distribution)] == [brute_force[win] for win in sorted(brute_force)]
+
+    expected = sum(win * weight for win, weight in brute_force.items()) / 7**4
+    assert get_ways_expected_win(config, "BR0") == pytest.approx(expected)
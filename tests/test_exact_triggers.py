@@ -0,0 +1,44 @@
+"""Test exact scatter statistics against boards drawn from every reel stop."""
+
+import itertools
+import random
+import pytest
+from src.calculations.board import Board
+from tests.win_calculations.game_test_config import GamestateTest
+from tests.win_calculations.test_linespay import GameLinesConfig
+from utils.game_analytics.exact_triggers import get_trigger_result
+
+
+class BoardTest(GamestateTest, Board):
+    """Test gamestate with board functions."""
+
+
+def test_exact_triggers_match_boards():
+    "Scatter counts and anticipation starts match Board.create_board_from_stops() over the full cycle."
+    config = GameLinesConfig()
+    config.num_reels = 4
+    config.num_rows = [3, 2, 3, 4]
+    config.include_padding = False
+    config.freespin_triggers = {"basegame": {3: 10, 4: 15}}
+    config.anticipation_triggers = {"basegame": 2}
+    rng = random.Random(2)
+    config.reels = {"BR0": [[rng.choice(["S", "H1", "X"]) for _ in range(6)] for _ in range(config.num_reels)]}
+
+    gamestate = BoardTest(config)
+    gamestate.create_symbol_map()
+    gamestate.assign_special_sym_function()
+    gamestate.gametype = "basegame"
+    scatter_counts = [0] * 13
+    anticipation_counts = [0] * config.num_reels
+    for stops in itertools.product(range(6), repeat=config.num_reels):
+        gamestate.create_board_from_stops("BR0", list(stops))
+        scatter_counts[len(gamestate.special_syms_on_board["scatter"])] += 1
+        if max(gamestate.anticipation) > 0:
+            anticipation_counts[gamestate.anticipation.index(1)] += 1
+
+    result = get_trigger_result(config, "BR0", "basegame")
+    assert result.scatter_counts == scatter_counts
+    assert result.anticipation_counts == anticipation_counts
+    assert sum(anticipation_counts) > 0
+    assert result.trigger_probability == pytest.approx(sum(scatter_counts[3:]) / 6**4)
+    assert result.expected_spins_awarded == pytest.approx((10 * scatter_counts[3] + 15 * scatter_counts[4]) / 6**4)
@@ -0,0 +1,61 @@
+"""Test multiplier strategy registry."""
+
+import pytest
+from src.wins.multiplier_strategy import (
+    MULTIPLIER_STRATEGIES,
+    apply_mult,
+    get_multiplier_strategy,
+    get_position_multipliers,
+    register_multiplier_strategy,
+)
+from tests.win_calculations.test_linespay import create_test_lines_gamestate
+
+
+@pytest.fixture
+def gamestate():
+    """Lines test state with multiplier symbols on the first row."""
+    gamestate = create_test_lines_gamestate()
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            gamestate.board[idx][idy] = gamestate.create_symbol("WM" if idy == 0 and idx < 2 else "H1")
+    return gamestate
+
+
+def test_builtin_strategies(gamestate):
+    "Symbol multipliers above 1 are added, global multipliers scale the result."
+    positions = [(idx, 0) for idx in range(3)]
+    assert apply_mult(gamestate.board, "global", 2.0, 3, positions) == (6.0, 3)
+    assert apply_mult(gamestate.board, "symbol", 2.0, 3, positions) == (12.0, 6)
+    assert apply_mult(gamestate.board, "combined", 2.0, 3, positions) == (36.0, 18)
+    assert apply_mult(gamestate.board, "symbol", 2.0, 3, [(4, 4)]) == (2.0, 1)
+    dict_positions = [{"reel": reel, "row": row} for reel, row in positions]
+    assert apply_mult(gamestate.board, "combined", 2.0, 3, dict_positions) == (36.0, 18)
+    with pytest.raises(ValueError):
+        get_multiplier_strategy("not_a_strategy")
+
+
+def test_custom_strategy(gamestate):
+    "Registered strategies receive the multiplier values of the winning positions."
+
+    @register_multiplier_strategy("test_max")
+    def apply_max_mult(win_amount, global_multiplier, multipliers):
+        mult = max(max(multipliers, default=1), 1)
+        return (win_amount * mult, mult)
+
+    try:
+        positions = [(0, 0), (4, 2)]
+        assert apply_mult(gamestate.board, "test_max", 5.0, 1, positions) == (15.0, 3)
+        assert get_multiplier_strategy("test_max") is apply_max_mult
+    finally:
+        MULTIPLIER_STRATEGIES.pop("test_max")
+
+
+def test_board_mults(gamestate):
+    "Multiplier values are read from the encoded board arrays when given."
+    _, board_mults = gamestate.symbol_table.encode_board(gamestate.board)
+    positions = [(idx, 0) for idx in range(3)]
+    assert get_position_multipliers(gamestate.board, positions, board_mults=board_mults) == [3, 3, 0]
+    board_mults[2, 0] = 4
+    result = apply_mult(gamestate.board, "symbol", 2.0, 1, positions, board_mults=board_mults)
+    assert result == (20.0, 10)
+    assert apply_mult(gamestate.board, "symbol", 2.0, 1, positions) == (12.0, 6)
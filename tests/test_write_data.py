@@ -0,0 +1,261 @@
+"""Test merging of temporary simulation output files."""
+
+import io
+import json
+from types import SimpleNamespace
+import pytest
+import zstandard as zstd
+from src.write_data.book_index import BookIndex, SeekableBooks, get_book_index_path, merge_book_indexes
+from src.write_data.compression import (
+    get_book_dictionary_path,
+    get_compression_options,
+    get_frame_window_log,
+    get_zstd_decompressor,
+    load_book_dictionary,
+    train_book_dictionary,
+)
+from src.write_data.force_record import merge_force_files, read_force_table, write_force_file, write_force_record
+from src.write_data import force_record, merge_files
+from src.write_data.merge_files import concatenate_files, merge_json_array_files
+from src.write_data.write_data import get_zstd_content_hash, merge_book_files, merge_zstd_files, write_json
+from utils.decompress_zstd import decompress, read_books
+from utils.rgs_verification import verify_books_and_payout_mults
+
+
+def write_temp_books(tmp_path, num_files: int = 3, books_per_file: int = 4) -> list:
+    """Compressed jsonl files of simple books, one zstd frame per file."""
+    file_list = []
+    for file_index in range(num_files):
+        first_id = file_index * books_per_file + 1
+        book_ids = range(first_id, first_id + books_per_file)
+        books = [{"id": book_id, "payoutMultiplier": 0, "events": []} for book_id in book_ids]
+        data = "\n".join(json.dumps(book) for book in books) + "\n"
+        filename = tmp_path / f"books_base_{file_index}_0.jsonl.zst"
+        filename.write_bytes(zstd.ZstdCompressor().compress(data.encode("UTF-8")))
+        file_list.append(str(filename))
+    return file_list
+
+
+def test_merge_zstd_files(tmp_path):
+    "Merged frames decompress to the concatenated books, without recompression."
+    file_list = write_temp_books(tmp_path)
+    output_path = str(tmp_path / "books_base.jsonl.zst")
+    merge_zstd_files(file_list, output_path, verify=True)
+
+    with open(output_path, "rb") as f:
+        assert f.read() == b"".join(open(filename, "rb").read() for filename in file_list)
+    with open(output_path, "rb") as f, zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+        lines = io.TextIOWrapper(reader, encoding="UTF-8").read().splitlines()
+    assert [json.loads(line)["id"] for line in lines] == list(range(1, 13))
+    assert get_zstd_content_hash([output_path]) == get_zstd_content_hash(file_list)
+    decompress(output_path)
+
+
+class BookConfig:
+    """Config attributes used when writing books."""
+
+    def __init__(self, compression_options: dict = None):
+        self.output_regular_json = False
+        if compression_options is not None:
+            self.compression_options = compression_options
+
+
+class BookState:
+    """Gamestate holding a library of simple books."""
+
+    def __init__(self, config: BookConfig, num_books: int, first_id: int = 1):
+        self.config = config
+        book_ids = range(first_id, first_id + num_books)
+        self.library = {idx: {"id": idx, "payoutMultiplier": idx * 10, "events": []} for idx in book_ids}
+
+
+@pytest.mark.parametrize(
+    "compression_options",
+    [None, {"level": 1, "threads": 2}, {"level": 5, "long_distance_matching": True, "window_log": 28}],
+)
+def test_write_json_compression_options(tmp_path, compression_options):
+    "Compressed books decompress to the same JSON-lines for any compression settings."
+    for num_books in [0, 50]:
+        gamestate = BookState(BookConfig(compression_options), num_books)
+        write_json(gamestate, str(tmp_path / "books.jsonl"))
+        write_json(gamestate, str(tmp_path / "books.jsonl.zst"))
+        decompressor = get_zstd_decompressor(get_compression_options(gamestate.config))
+        with open(tmp_path / "books.jsonl.zst", "rb") as f, decompressor.stream_reader(f) as reader:
+            assert reader.read() == (tmp_path / "books.jsonl").read_bytes()
+
+    with pytest.raises(ValueError):
+        get_compression_options(BookConfig(), {"levle": 3})
+
+
+def test_book_dictionary(tmp_path):
+    "Books compressed with a trained dictionary are read using the dictionary file stored alongside them."
+    gamestate = BookState(BookConfig({"dictionary_size": 4096}), 2000)
+    samples = [(json.dumps(book) + "\n").encode("UTF-8") for book in gamestate.library.values()]
+    gamestate.config._book_dictionary = train_book_dictionary(samples, 4096)
+    books_path = str(tmp_path / "books_base.jsonl.zst")
+    write_json(gamestate, books_path)
+
+    with pytest.raises(zstd.ZstdError):
+        with open(books_path, "rb") as f, zstd.ZstdDecompressor().stream_reader(f) as reader:
+            reader.read()
+
+    assert get_book_dictionary_path(books_path) == str(tmp_path / "books_base.dict")
+    assert load_book_dictionary(books_path) is None
+    (tmp_path / "books_base.dict").write_bytes(gamestate.config._book_dictionary)
+    decompressor = get_zstd_decompressor(dictionary=load_book_dictionary(books_path))
+    with open(books_path, "rb") as f, decompressor.stream_reader(f) as reader:
+        assert reader.read() == b"".join(samples)
+    decompress(books_path)
+    payouts, _ = verify_books_and_payout_mults(books_path)
+    assert payouts == [book["payoutMultiplier"] for book in gamestate.library.values()]
+
+    with pytest.warns(UserWarning):
+        assert train_book_dictionary(samples[:2], 4096) is None
+
+
+def test_read_books_with_large_window(tmp_path):
+    "Books written with window_log above the default decompression limit are read by the repo's readers."
+    config = BookConfig({"long_distance_matching": True, "window_log": 28, "books_per_frame": 5})
+    file_list = [str(tmp_path / f"books_base_{file_index}_0.jsonl.zst") for file_index in range(2)]
+    for filename, first_id in zip(file_list, [1, 21]):
+        write_json(BookState(config, 20, first_id), filename)
+    assert get_frame_window_log(open(file_list[0], "rb").read()) == 28
+    with pytest.raises(zstd.ZstdError):
+        with open(file_list[0], "rb") as f, get_zstd_decompressor().stream_reader(f) as reader:
+            reader.read()
+
+    books_path = str(tmp_path / "books_base.jsonl.zst")
+    merge_zstd_files(file_list, books_path, verify=True)
+    index_list = [get_book_index_path(filename) for filename in file_list]
+    merge_book_indexes(index_list, file_list, get_book_index_path(books_path))
+    decompress(books_path)
+    payouts, _ = verify_books_and_payout_mults(books_path)
+    assert payouts == [book_id * 10 for book_id in range(1, 41)]
+    assert read_books(books_path, 24) == [BookState(config, 1, 24).library[24]]
+
+
+def test_merge_verify_with_book_dictionary(tmp_path):
+    "Merges of books compressed with a trained dictionary are verified using the dictionary."
+    config = BookConfig({"dictionary_size": 4096, "books_per_frame": 10, "threads": 2})
+    samples = [(json.dumps(book) + "\n").encode("UTF-8") for book in BookState(config, 2000).library.values()]
+    config._book_dictionary = train_book_dictionary(samples, 4096)
+    file_list = []
+    for file_index, first_id in enumerate([1, 501, 1001]):
+        file_list.append(str(tmp_path / f"books_base_{file_index}_0.jsonl.zst"))
+        write_json(BookState(config, 500, first_id), file_list[-1])
+
+    books_path = str(tmp_path / "books_base.jsonl.zst")
+    with pytest.raises(zstd.ZstdError):
+        merge_zstd_files(file_list, books_path, verify=True)
+    merge_zstd_files(file_list, books_path, verify=True, dictionary=config._book_dictionary)
+
+    output_files = SimpleNamespace(get_final_book_name=lambda betmode, compress: books_path)
+    merge_book_files(SimpleNamespace(config=config, output_files=output_files), "base", file_list, True, True)
+    (tmp_path / "books_base.dict").write_bytes(config._book_dictionary)
+    config._book_dictionary = None
+    merge_book_files(SimpleNamespace(config=config, output_files=output_files), "base", file_list, True, True)
+    assert read_books(books_path, 1200) == [BookState(config, 1, 1200).library[1200]]
+
+
+def test_seekable_books(tmp_path):
+    "Books written in frames of books_per_frame books are read by id from the merged file and index."
+    config = BookConfig({"books_per_frame": 3})
+    file_list = []
+    expected = {}
+    for file_index, first_id in enumerate([1, 8, 100]):
+        gamestate = BookState(config, 7, first_id)
+        expected.update({book["id"]: book for book in gamestate.library.values()})
+        file_list.append(str(tmp_path / f"books_base_{file_index}_0.jsonl.zst"))
+        write_json(gamestate, file_list[-1])
+    books_path = str(tmp_path / "books_base.jsonl.zst")
+    merge_zstd_files(file_list, books_path)
+    index_list = [get_book_index_path(filename) for filename in file_list]
+    merge_book_indexes(index_list, file_list, get_book_index_path(books_path))
+
+    index = BookIndex.load(get_book_index_path(books_path))
+    assert (index.num_frames, index.num_books, len(index.run_ids)) == (9, 21, 2)
+    with open(books_path, "rb") as f, zstd.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+        lines = reader.read().splitlines()
+    assert [json.loads(line) for line in lines] == list(expected.values())
+
+    with SeekableBooks(books_path) as books:
+        for book_id in [1, 14, 8, 106, 100, 3]:
+            assert books.get_book(book_id) == expected[book_id]
+        assert [book["id"] for book in books.get_books(12, 102)] == [12, 13, 14, 100, 101, 102]
+        for book_id in [0, 15, 99, 107]:
+            with pytest.raises(KeyError):
+                books.get_book(book_id)
+    assert read_books(books_path, 101) == [expected[101]]
+
+
+def test_force_files(tmp_path, monkeypatch):
+    "Temporary force files merge to the summed counts and concatenated ids of each description, in first-seen order."
+    free = (("gametype", "freegame"), ("kind", "3"), ("symbol", "S"))
+    base = (("gametype", "basegame"), ("kind", "4"), ("symbol", "H1"))
+    recorded_events = [
+        {base: {"timesTriggered": 2, "bookIds": [1, 3]}},
+        {},
+        {free: {"timesTriggered": 1, "bookIds": [21]}, base: {"timesTriggered": 3, "bookIds": [20, 22, 25]}},
+    ]
+    file_list = []
+    for file_index, events in enumerate(recorded_events):
+        file_list.append(str(tmp_path / f"force_base_{file_index}_0.bin"))
+        write_force_file(events, file_list[-1])
+
+    assert [record[0] for record in read_force_table(file_list[2])] == [free, base]
+    opened = []
+    monkeypatch.setattr(force_record, "open", lambda *args: opened.append(args[0]) or open(*args), raising=False)
+    merged = [
+        (description, times, [book_id for chunk in chunks for book_id in chunk.tolist()])
+        for description, times, chunks in merge_force_files(file_list)
+    ]
+    monkeypatch.undo()
+    assert merged == [(base, 5, [1, 3, 20, 22, 25]), (free, 1, [21])]
+    # Each file is opened once to read its table, and files holding ids once more for the whole merge
+    assert sorted(opened) == sorted(file_list + [file_list[0], file_list[2]])
+
+    expected = [
+        {
+            "search": [{"name": key, "value": value} for key, value in description],
+            "timesTriggered": times,
+            "bookIds": book_ids,
+        }
+        for description, times, book_ids in merged
+    ]
+    for compact in [False, True]:
+        force_record_path = tmp_path / "force_record_base.json"
+        descriptions = write_force_record(merge_force_files(file_list), str(force_record_path), compact)
+        assert descriptions == [base, free]
+        assert force_record_path.read_text() == (json.dumps(expected) if compact else json.dumps(expected, indent=4))
+        write_force_record(merge_force_files(file_list[1:2]), str(force_record_path), compact)
+        assert force_record_path.read_text() == "[]"
+
+
+def fail_kernel_copy(in_fd, out_fd, offset, count):
+    """Kernel copy method unsupported for the files being copied."""
+    raise OSError("unsupported")
+
+
+@pytest.mark.parametrize("copy_methods", ["platform", "fallback", "failing"])
+def test_merge_files(tmp_path, monkeypatch, copy_methods):
+    "Concatenated and spliced outputs match reading the files into memory, with or without kernel copies."
+    if copy_methods == "fallback":
+        monkeypatch.setattr(merge_files, "KERNEL_COPY_METHODS", [])
+    elif copy_methods == "failing":
+        monkeypatch.setattr(merge_files, "KERNEL_COPY_METHODS", [fail_kernel_copy] + merge_files.KERNEL_COPY_METHODS)
+    monkeypatch.setattr(merge_files, "COPY_CHUNK_SIZE", 7)
+
+    arrays = [[{"id": 1}, {"id": 2}], [], [{"id": 3, "events": ["a" * 50]}], [{"id": 4}]]
+    file_list = []
+    for file_index, array in enumerate(arrays):
+        file_list.append(tmp_path / f"books_base_{file_index}_0.json")
+        file_list[-1].write_text(json.dumps(array))
+
+    concatenate_files(file_list, tmp_path / "concatenated")
+    assert (tmp_path / "concatenated").read_bytes() == b"".join(filename.read_bytes() for filename in file_list)
+    merge_json_array_files(file_list, tmp_path / "books_base.json")
+    spliced = "[" + ",".join(json.dumps(array)[1:-1] for array in arrays if len(array) > 0) + "]"
+    assert (tmp_path / "books_base.json").read_text() == spliced
+    assert json.loads(spliced) == [book for array in arrays for book in array]
+    merge_json_array_files(file_list[1:2], tmp_path / "books_base.json")
+    assert json.loads((tmp_path / "books_base.json").read_text()) == []
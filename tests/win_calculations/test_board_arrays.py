@@ -0,0 +1,45 @@
+"""Test integer-coded board representation."""
+
+import pytest
+from tests.win_calculations.test_linespay import create_test_lines_gamestate
+
+
+@pytest.fixture
+def gamestate():
+    """Initialise test state."""
+    return create_test_lines_gamestate()
+
+
+def test_board_arrays_match_symbols(gamestate):
+    "Symbol ids and multipliers mirror the Symbol board."
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            name = "WM" if idx == idy else "H1"
+            gamestate.board[idx][idy] = gamestate.create_symbol(name)
+
+    table = gamestate.symbol_table
+    board_ids, board_mults = table.encode_board(gamestate.board)
+    assert board_ids.shape == (5, 5)
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            assert table.get_name(board_ids[idx, idy]) == gamestate.board[idx][idy].name
+            assert board_mults[idx, idy] == (3 if idx == idy else 0)
+
+
+def test_symbol_table_special_masks(gamestate):
+    "Special properties are available per symbol id."
+    table = gamestate.symbol_table
+    assert table.get_special_mask("wild")[table.get_id("W")]
+    assert not table.get_special_mask("wild")[table.get_id("H1")]
+    assert table.get_special_mask("multiplier")[table.get_id("WM")]
+    with pytest.raises(ValueError):
+        table.get_id("not_a_symbol")
+
+
+def test_uneven_board_padding(gamestate):
+    "Reels with fewer rows are padded with -1."
+    board = [[gamestate.create_symbol("H1") for _ in range(rows)] for rows in (3, 5, 4)]
+    board_ids, _ = gamestate.symbol_table.encode_board(board)
+    assert board_ids.shape == (3, 5)
+    assert list(board_ids[0, 3:]) == [-1, -1]
+    assert board_ids[2, 4] == -1
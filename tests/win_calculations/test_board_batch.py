@@ -0,0 +1,196 @@
+"""Test base-game simulations using boards drawn in bulk."""
+
+import random
+import pytest
+from src.calculations.ways import Ways
+from src.calculations.rng import GameRNG
+from src.config.betmode import BetMode
+from src.config.config import Config
+from src.config.distributions import Distribution
+from src.executables.executables import Executables
+from src.wins.win_manager import WinManager
+from tests.win_calculations.game_test_config import GamestateTest
+from tests.win_calculations.test_wayspay import GameWaysConfig
+
+
+class GameBatchConfig(Config):
+    """Ways test game with reelstrips and base-game bet mode distributions."""
+
+    def __init__(self, rng_mode: str = "compat"):
+        super().__init__()
+        vars(self).update(vars(GameWaysConfig()))
+        self.win_type = "ways"
+        self.rng_mode = rng_mode
+        self.freespin_triggers = {self.basegame_type: {3: 10, 4: 15, 5: 20}}
+        self.anticipation_triggers = {self.basegame_type: 2}
+        rng = random.Random(11)
+        names = ["H1", "H2", "X", "X", "W", "S"]
+        self.reels = {
+            reelstrip_id: [[rng.choice(names) for _ in range(20)] for _ in range(self.num_reels)]
+            for reelstrip_id in ["BR0", "BR1"]
+        }
+        self.bet_modes = [
+            BetMode(
+                name="base",
+                cost=1.0,
+                rtp=self.rtp,
+                max_win=self.wincap,
+                auto_close_disabled=False,
+                is_feature=True,
+                is_buybonus=False,
+                distributions=[
+                    Distribution(
+                        criteria="0",
+                        quota=0.5,
+                        win_criteria=0.0,
+                        conditions={"reel_weights": {self.basegame_type: {"BR0": 1, "BR1": 2}}},
+                    ),
+                    Distribution(
+                        criteria="basegame",
+                        quota=0.5,
+                        conditions={"reel_weights": {self.basegame_type: {"BR0": 1, "BR1": 2}}},
+                    ),
+                ],
+            )
+        ]
+
+
+class BatchGameState(GamestateTest, Executables):
+    """Test gamestate with a ways base-game spin, optionally replaying given boards."""
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.win_manager = WinManager(config.basegame_type, config.freegame_type, config.wincap)
+        self.rng = GameRNG(config.rng_mode, config.rng_stream_key)
+        self.create_symbol_map()
+        self.assign_special_sym_function()
+        self.library, self.recorded_events, self.temp_wins = {}, {}, []
+        self.queued_board, self.batched_boards = None, {}
+        self.replayed_boards = {}
+        self.betmode = "base"
+        self.criteria = "0"
+
+    def assign_special_sym_function(self):
+        self.special_symbol_functions = {}
+
+    def create_board_reelstrips(self):
+        if self.sim in self.replayed_boards and self.gametype == self.config.basegame_type:
+            self.create_board_from_stops(*self.replayed_boards.pop(self.sim))
+            return
+        super().create_board_reelstrips()
+
+    def run_spin(self, sim, simulation_seed=None):
+        self.reset_seed(sim)
+        self.repeat = True
+        while self.repeat:
+            self.reset_book()
+            self.draw_board(emit_event=True)
+            self.win_data = self.get_board_win_data()
+            if self.win_data["totalWin"] > 0:
+                Ways.record_ways_wins(self)
+                self.win_manager.update_spinwin(self.win_data["totalWin"])
+            Ways.emit_wayswin_events(self)
+            self.win_manager.update_gametype_wins(self.gametype)
+            self.evaluate_finalwin()
+            self.check_repeat()
+        self.imprint_wins()
+
+
+def run_test_sims(gamestate, sim_to_criteria: list) -> tuple:
+    """Run simulations as GeneralGameState.run_sims() does, returning the queued board and spins of each simulation."""
+    queued, repeats = {}, {}
+    for sim, criteria in enumerate(sim_to_criteria):
+        gamestate.criteria = criteria
+        if gamestate.config.base_board_batch_size > 0:
+            gamestate.queue_batched_board(sim, sim)
+            queued[sim] = gamestate.queued_board
+        gamestate.run_spin(sim, sim)
+        gamestate.queued_board = None
+        repeats[sim] = gamestate.repeat_count
+    return queued, repeats
+
+
+@pytest.mark.parametrize("rng_mode", ["compat", "philox"])
+def test_batched_books_match_per_sim_books(rng_mode):
+    "Books of simulations using batched boards match the per-simulation path rebuilding the same boards."
+    sim_to_criteria = ["0", "basegame"] * 60
+    config = GameBatchConfig(rng_mode)
+    config.base_board_batch_size = 16
+    batched = BatchGameState(config)
+    queued, repeats = run_test_sims(batched, sim_to_criteria)
+    assert all(board is not None for board in queued.values())
+
+    per_sim = BatchGameState(GameBatchConfig(rng_mode))
+    per_sim.replayed_boards = dict(queued)
+    run_test_sims(per_sim, sim_to_criteria)
+    assert len(per_sim.replayed_boards) == 0
+    assert batched.library == per_sim.library
+    assert batched.recorded_events == per_sim.recorded_events
+
+    payouts = [book["payoutMultiplier"] for book in batched.library.values()]
+    assert all(payout == 0 for payout, criteria in zip(payouts, sim_to_criteria) if criteria == "0")
+    assert any(payout > 0 for payout in payouts)
+
+    # Boards without a scatter trigger were resolved in bulk, so meet the win criteria at the first spin
+    for sim, (reelstrip_id, reel_positions) in queued.items():
+        reelstrip = config.reels[reelstrip_id]
+        num_scatters = sum(
+            reel[(stop + row) % len(reel)] == "S"
+            for reel, stop, rows in zip(reelstrip, reel_positions, config.num_rows)
+            for row in range(rows)
+        )
+        if num_scatters < 3:
+            assert repeats[sim] == 1
+
+
+def test_batched_boards_are_reproducible():
+    "Queued boards depend only on the simulations run, and are drawn from gamestate.rng."
+    sim_to_criteria = ["0"] * 20 + ["basegame"] * 20
+    runs = []
+    for _ in range(2):
+        config = GameBatchConfig("philox")
+        config.base_board_batch_size = 8
+        gamestate = BatchGameState(config)
+        runs.append(run_test_sims(gamestate, sim_to_criteria)[0])
+    assert runs[0] == runs[1]
+
+    config = GameBatchConfig("philox")
+    config.rng_stream_key = 1
+    config.base_board_batch_size = 8
+    assert run_test_sims(BatchGameState(config), sim_to_criteria)[0] != runs[0]
+
+
+def test_compat_batched_boards_keep_stream():
+    "Drawing batched boards in compat mode does not consume the simulation's random stream."
+    gamestate = BatchGameState(GameBatchConfig("compat"))
+    gamestate.gametype = gamestate.config.basegame_type
+    gamestate.reset_seed(5)
+    expected = [random.random() for _ in range(5)]
+    gamestate.reset_seed(5)
+    boards = gamestate.draw_batched_boards(16)
+    assert len(boards) > 0
+    assert [random.random() for _ in range(5)] == expected
+    gamestate.reset_seed(5)
+    assert gamestate.draw_batched_boards(16) == boards
+
+
+def test_draw_board_batch_flags():
+    "Resolved boards missing the win criteria are rejected, scatter triggers fall back to the per-simulation path."
+    gamestate = BatchGameState(GameBatchConfig())
+    gamestate.reset_seed(0)
+    gamestate.gametype = gamestate.config.basegame_type
+    batch = gamestate.draw_board_batch(200, "BR0")
+    scatter_id = gamestate.symbol_table.ids["S"]
+    triggers = (batch.boards == scatter_id).sum(axis=(1, 2)) >= 3
+    assert (batch.fallback == triggers).all()
+    assert (batch.rejected == (~triggers & (batch.total_win > 0))).all()
+    summary = batch.get_summary()
+    assert summary["resolved"] + summary["fallback"] + summary["rejected"] == len(batch)
+    assert summary["hit_rate"] == 0.0
+
+    gamestate.criteria = "basegame"
+    batch = gamestate.draw_board_batch(200, "BR0")
+    assert not batch.rejected.any()
+    summary = batch.get_summary()
+    assert 0 < summary["hit_rate"] < 1
+    assert summary["hit_rate"] == (batch.total_win[~batch.fallback] > 0).sum() / summary["resolved"]
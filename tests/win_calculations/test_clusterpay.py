@@ -1,8 +1,9 @@
 """Test basic cluster-calculation functionality."""
 
+import random
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
-from src.calculations.cluster import Cluster
+from src.calculations.cluster import Cluster, ClusterTracker
 
 
 class GameClusterConfig:
@@ -99,3 +100,68 @@ def test_basic_cluster(gamestate):
         clusters=clusters,
     )
     assert total_win == gamestate.config.paytable[(9, "H1")]
+
+
+def test_wilds_join_multiple_clusters(gamestate):
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            gamestate.board[idx][idy] = gamestate.create_symbol("X")
+    gamestate.board[0][0] = gamestate.create_symbol("H1")
+    gamestate.board[1][0] = gamestate.create_symbol("WM")
+    gamestate.board[2][0] = gamestate.create_symbol("H2")
+    gamestate.board[1][1] = gamestate.create_symbol("H1")
+
+    clusters = Cluster.get_clusters(gamestate.board)
+    assert clusters["H1"] == [[(0, 0), (1, 0), (1, 1)]]
+    assert clusters["H2"] == [[(2, 0), (1, 0)]]
+
+
+def test_large_wild_board():
+    "Flood-fill is iterative, so large connected regions do not hit the recursion limit."
+    test_gamestate = create_test_cluster_gamestate()
+    board = [[test_gamestate.create_symbol("WM") for _ in range(50)] for _ in range(50)]
+    board[0][0] = test_gamestate.create_symbol("H1")
+
+    clusters = Cluster.get_clusters(board)
+    assert len(clusters["H1"][0]) == 50 * 50
+
+
+def test_cluster_tracker_matches_full_evaluation(gamestate):
+    "Reusing clusters away from replaced symbols gives the same result as a full evaluation."
+    rng = random.Random(3)
+    names = ["H1", "H2", "X", "WM"]
+    tracker = ClusterTracker()
+    board = [[gamestate.create_symbol(rng.choice(names)) for _ in range(6)] for _ in range(6)]
+    for _ in range(30):
+        assert tracker.get_clusters(board) == Cluster.get_clusters(board)
+        # Replace the top of a random column, as a tumble would
+        reel = rng.randrange(len(board))
+        for row in range(rng.randrange(1, len(board[reel]))):
+            board[reel][row] = gamestate.create_symbol(rng.choice(names))
+
+
+def test_clusters_with_grid_multipliers(gamestate):
+    "Cluster multipliers are the grid sums under each cluster, grid updates count every win at a position."
+    rng = random.Random(8)
+    names = ["H1", "H2", "X", "WM"]
+    grid = Cluster.create_position_multiplier_grid(gamestate.config.num_rows)
+    reference = [[0] * 6 for _ in range(6)]
+    for _ in range(20):
+        board = [[gamestate.create_symbol(rng.choice(names)) for _ in range(6)] for _ in range(6)]
+        clusters = Cluster.get_clusters(board)
+        _, win_data, total_win = Cluster.evaluate_clusters_with_grid(
+            gamestate.config, board, clusters, grid, global_multiplier=2, return_data={"totalWin": 0, "wins": []}
+        )
+        for win in win_data["wins"]:
+            grid_mult = max(sum(reference[reel][row] for reel, row in win["positions"]), 1)
+            assert win["meta"]["clusterMult"] == grid_mult
+            assert win["win"] == gamestate.config.paytable[(win["clusterSize"], win["symbol"])] * grid_mult * 2
+            assert all(board[reel][row].explode for reel, row in win["positions"])
+        assert total_win == sum(win["win"] for win in win_data["wins"])
+
+        Cluster.update_position_multipliers(grid, win_data["wins"], 4)
+        for win in win_data["wins"]:
+            for reel, row in win["positions"]:
+                reference[reel][row] = 1 if reference[reel][row] == 0 else min(reference[reel][row] + 1, 4)
+        assert grid.tolist() == reference
+    assert grid.max() == 4
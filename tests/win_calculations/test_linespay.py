@@ -1,8 +1,12 @@
 """Test basic lines-calculation functionality."""
 
+import random
+import numpy as np
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.lines import Lines
+from src.calculations.lines_engine import get_lines_batch
+from src.executables.executables import Executables
 
 
 class GameLinesConfig:
@@ -122,3 +126,140 @@ def test_linespay_mult(gamestate):
 
     windata = Lines.get_lines(gamestate.board, gamestate.config)
     assert windata["totalWin"] == (gamestate.config.paytable[(5, "WM")] * sum([3, 3, 3, 3, 3]))
+
+
+def test_linespay_batch_matches_single(gamestate):
+    "Bulk evaluation of encoded boards matches per-board evaluation."
+    rng = random.Random(7)
+    names = ["W", "H1", "X", "S"]
+    boards, expected = [], []
+    for _ in range(50):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(names))
+        boards.append(gamestate.symbol_table.encode_board(gamestate.board)[0])
+        expected.append(Lines.get_lines(gamestate.board, gamestate.config)["totalWin"])
+
+    batch_wins = get_lines_batch(np.array(boards), gamestate.config, gamestate.symbol_table)
+    assert list(batch_wins) == expected
+
+
+def test_linespay_wild_substitution(gamestate):
+    "Leading wilds substitute for the first paying symbol, wild-only lines pay the wild payout."
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            gamestate.board[idx][idy] = gamestate.create_symbol("X")
+    for reel, name in enumerate(["W", "W", "H1", "W", "X"]):
+        gamestate.board[reel][0] = gamestate.create_symbol(name)
+    for reel, name in enumerate(["W", "W", "W", "H1", "H1"]):
+        gamestate.board[reel][4] = gamestate.create_symbol(name)
+
+    windata = Lines.get_lines(gamestate.board, gamestate.config)
+    assert [(win["symbol"], win["kind"], win["meta"]["lineIndex"]) for win in windata["wins"]] == [
+        ("H1", 4, 1),
+        ("W", 3, 4),
+    ]
+    assert windata["wins"][0]["positions"] == [(idx, 0) for idx in range(4)]
+    assert windata["wins"][0]["win"] == gamestate.config.paytable[(4, "H1")]
+    assert windata["wins"][1]["win"] == gamestate.config.paytable[(3, "W")]
+
+
+def test_linespay_cache_matches_uncached(gamestate):
+    "Cached line results match direct evaluation, including wild attributes assigned outside of the symbol name."
+    cached_gamestate = create_test_lines_gamestate()
+    cached_gamestate.config.line_win_cache_size = 8
+    rng = random.Random(3)
+    names = ["W", "H1", "WM", "X", "S"]
+    for _ in range(200):
+        board = [[gamestate.create_symbol(rng.choice(names)) for _ in column] for column in gamestate.board]
+        board[rng.randrange(5)][rng.randrange(5)].assign_attribute({"wild": True})
+        expected = Lines.get_lines(board, gamestate.config, multiplier_method="symbol")
+        assert Lines.get_lines(board, cached_gamestate.config, multiplier_method="symbol") == expected
+
+    cache = cached_gamestate.config._win_caches["lines[wild,W]"]
+    assert len(cache.entries) == 8
+    assert cache.hits + cache.misses == 200 * len(gamestate.config.paylines)
+
+
+def test_board_win_cache():
+    "Repeated boards reuse cached win data, the cache is bypassed when special symbol functions are registered."
+
+    class ExecutablesTest(GamestateTest, Executables):
+        """Test gamestate with executables."""
+
+    gamestate = ExecutablesTest(GameLinesConfig())
+    gamestate.config.win_type = "lines"
+    gamestate.config.board_win_cache_size = 4
+    gamestate.create_symbol_map()
+    gamestate.special_symbol_functions = {}
+    rng = random.Random(5)
+    boards = [[[rng.choice(["W", "H1", "X"]) for _ in range(5)] for _ in range(5)] for _ in range(3)]
+    for names in boards + boards:
+        gamestate.board = [[gamestate.create_symbol(name) for name in column] for column in names]
+        gamestate.update_board_arrays()
+        expected = Lines.get_lines(gamestate.board, gamestate.config, global_multiplier=2)
+        assert gamestate.get_board_win_data(global_multiplier=2) == expected
+
+    cache = gamestate.config._win_caches["board"]
+    assert (cache.hits, cache.misses) == (3, 3)
+
+    gamestate.assign_special_sym_function()
+    gamestate.get_board_win_data(global_multiplier=2)
+    assert cache.hits + cache.misses == 6
+
+
+def test_board_win_cache_multipliers_and_copies():
+    "Boards differing only in multiplier values are cached separately, cached win data is returned as a copy."
+
+    class ExecutablesTest(GamestateTest, Executables):
+        """Test gamestate with executables."""
+
+    gamestate = ExecutablesTest(GameLinesConfig())
+    gamestate.config.win_type = "lines"
+    gamestate.config.board_win_cache_size = 4
+    gamestate.create_symbol_map()
+    gamestate.special_symbol_functions = {}
+
+    def set_board(multiplier):
+        gamestate.board = [[gamestate.create_symbol("WM" if row == 0 else "X") for row in range(5)] for _ in range(5)]
+        if multiplier > 0:
+            gamestate.board[2][0].assign_attribute({"multiplier": multiplier})
+        gamestate.update_board_arrays()
+        return Lines.get_lines(gamestate.board, gamestate.config)
+
+    results = {}
+    for multiplier in [0, 3, 0, 3]:
+        expected = set_board(multiplier)
+        win_data = gamestate.get_board_win_data()
+        assert win_data == expected
+        results.setdefault(multiplier, expected)
+        win_data["totalWin"] = -1
+        win_data["wins"].clear()
+
+    cache = gamestate.config._win_caches["board"]
+    assert (cache.hits, cache.misses) == (2, 2)
+    assert results[3]["totalWin"] > results[0]["totalWin"]
+    set_board(3)
+    assert gamestate.get_board_win_data() == results[3]
+
+
+def test_board_win_cache_without_board_arrays():
+    "Board arrays are encoded when missing before looking up cached win data."
+
+    class ExecutablesTest(GamestateTest, Executables):
+        """Test gamestate with executables."""
+
+    gamestate = ExecutablesTest(GameLinesConfig())
+    gamestate.config.win_type = "lines"
+    gamestate.config.board_win_cache_size = 4
+    gamestate.create_symbol_map()
+    gamestate.special_symbol_functions = {}
+    gamestate.board_ids = None
+    gamestate.board = [[gamestate.create_symbol("H1" if row < 2 else "X") for row in range(5)] for _ in range(5)]
+    expected = Lines.get_lines(gamestate.board, gamestate.config)
+    assert expected["totalWin"] > 0
+    assert gamestate.get_board_win_data() == expected
+    assert gamestate.board_ids is not None
+    assert gamestate.get_board_win_data() == expected
+    cache = gamestate.config._win_caches["board"]
+    assert (cache.hits, cache.misses) == (1, 1)
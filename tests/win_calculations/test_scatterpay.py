@@ -103,3 +103,22 @@ def test_scatterpay_wilds(gamestate):
             assert wd["win"] == 3
 
     assert windata["totalWin"] == 53
+
+
+def test_scatterpay_aliases_explode(gamestate):
+    "Aliased symbols pay as their target, only winning positions are marked to explode"
+    gamestate.config.symbol_aliases = {"H2": "H1"}
+    for idx, _ in enumerate(gamestate.board):
+        for idy, _ in enumerate(gamestate.board[idx]):
+            name = {0: "H2", 1: "H1", 2: "W"}.get(idx, "X")
+            gamestate.board[idx][idy] = gamestate.create_symbol(name)
+
+    windata = Scatter.get_scatterpay_wins(gamestate.config, gamestate.board, global_multiplier=1)
+
+    assert len(windata["wins"]) == 1
+    assert windata["wins"][0]["symbol"] == "H1"
+    assert windata["totalWin"] == 20
+    assert [reel for reel, _ in windata["wins"][0]["positions"]] == [1] * 5 + [0] * 5 + [2] * 5
+    for idx, _ in enumerate(gamestate.board):
+        for sym in gamestate.board[idx]:
+            assert sym.check_attribute("explode") == (idx < 3)
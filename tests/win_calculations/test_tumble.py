@@ -0,0 +1,91 @@
+"""Test tumbling board updates."""
+
+import random
+import pytest
+from src.calculations.tumble import Tumble
+from tests.win_calculations.game_test_config import GamestateTest
+from tests.win_calculations.test_clusterpay import GameClusterConfig
+
+
+class TumbleTest(GamestateTest, Tumble):
+    """Test gamestate with tumble functions."""
+
+
+def create_test_tumble_gamestate(include_padding: bool) -> TumbleTest:
+    """Boilerplate gamestate with a random reelstrip."""
+    config = GameClusterConfig()
+    config.include_padding = include_padding
+    rng = random.Random(3)
+    config.reels = {"BR0": [[rng.choice(["H1", "H2", "WM", "X"]) for _ in range(40)] for _ in range(6)]}
+    gamestate = TumbleTest(config)
+    gamestate.create_symbol_map()
+    gamestate.assign_special_sym_function()
+    return gamestate
+
+
+@pytest.mark.parametrize("include_padding", [False, True])
+def test_tumble_matches_reelstrip(include_padding):
+    "Tumbled reels hold the reelstrip symbols above the stop, untouched reels keep their symbols."
+    gamestate = create_test_tumble_gamestate(include_padding)
+    strip = gamestate.config.reels["BR0"]
+    rng = random.Random(11)
+    gamestate.create_board_from_stops("BR0", [rng.randrange(40) for _ in range(6)])
+    gamestate.get_special_symbols_on_board()
+
+    for _ in range(5):
+        stops = list(gamestate.reel_positions)
+        previous = [list(column) for column in gamestate.board]
+        exploding = [0] * 6
+        for reel in (0, 2, 5):
+            for row in rng.sample(range(6), rng.randint(1, 6)):
+                gamestate.board[reel][row].explode = True
+                exploding[reel] += 1
+
+        gamestate.tumble_board()
+
+        for reel in range(6):
+            k = exploding[reel]
+            refill = [strip[reel][(stops[reel] + row) % 40] for row in range(-k, 0)]
+            survivors = [sym for sym in previous[reel] if not sym.check_attribute("explode")]
+            assert [sym.name for sym in gamestate.board[reel]] == refill + [sym.name for sym in survivors]
+            assert all(a is b for a, b in zip(gamestate.board[reel][k:], survivors))
+            assert gamestate.reel_positions[reel] == (stops[reel] - k) % 40
+            if k == 0:
+                assert gamestate.new_symbols_from_tumble[reel] == []
+            elif include_padding:
+                assert gamestate.top_symbols[reel].name == strip[reel][(stops[reel] - k - 1) % 40]
+                assert gamestate.new_symbols_from_tumble[reel][0] is gamestate.top_symbols[reel]
+                assert gamestate.new_symbols_from_tumble[reel][1:] == gamestate.board[reel][: k - 1]
+            else:
+                assert gamestate.new_symbols_from_tumble[reel] == gamestate.board[reel][:k]
+
+        board_ids, board_mults = gamestate.symbol_table.encode_board(gamestate.board)
+        assert (board_ids == gamestate.board_ids).all()
+        assert (board_mults == gamestate.board_mults).all()
+        incremental = gamestate.special_syms_on_board
+        gamestate.get_special_symbols_on_board()
+        assert incremental == gamestate.special_syms_on_board
+
+
+def test_tumble_rescans_changed_reels():
+    "Symbols changed on reels without exploding symbols are picked up by the special symbol scan after a tumble."
+    gamestate = create_test_tumble_gamestate(include_padding=True)
+    gamestate.create_board_from_stops("BR0", [0] * 6)
+    gamestate.get_special_symbols_on_board()
+
+    gamestate.board[1][2] = gamestate.create_symbol("S")
+    gamestate.board[3][0] = gamestate.create_symbol("S")
+    gamestate.update_board_position(3, 0)
+    gamestate.board[4][4].assign_attribute({"special": True, "scatter": True})
+    gamestate.update_board_position(4, 4)
+    gamestate.board[0][5].explode = True
+
+    gamestate.tumble_board()
+
+    scatters = gamestate.special_syms_on_board["scatter"]
+    assert {"reel": 1, "row": 2} in scatters
+    assert {"reel": 3, "row": 0} in scatters
+    assert {"reel": 4, "row": 4} in scatters
+    incremental = gamestate.special_syms_on_board
+    gamestate.get_special_symbols_on_board()
+    assert incremental == gamestate.special_syms_on_board
@@ -1,8 +1,11 @@
 """Test basic ways-calculation functionality."""
 
+import random
+import numpy as np
 import pytest
 from tests.win_calculations.game_test_config import GamestateTest, create_blank_board
 from src.calculations.ways import Ways
+from src.calculations.ways_engine import get_ways_batch
 
 
 class GameWaysConfig:
@@ -136,3 +139,29 @@ def test_global_multiplier_strategy(gamestate):
     expected_win = base_win * global_mult
 
     assert windata["totalWin"] == expected_win, f"Expected {expected_win}, got {windata['totalWin']}"
+
+
+def test_ways_batch_matches_single(gamestate):
+    "Bulk evaluation of encoded boards matches per-board evaluation."
+    rng = random.Random(11)
+    names = ["W", "H1", "H2", "X"]
+    boards, expected = [], []
+    for _ in range(50):
+        for idx, _ in enumerate(gamestate.board):
+            for idy, _ in enumerate(gamestate.board[idx]):
+                gamestate.board[idx][idy] = gamestate.create_symbol(rng.choice(names))
+        boards.append(gamestate.symbol_table.encode_board(gamestate.board)[0])
+        expected.append(Ways.get_ways_data(gamestate.config, gamestate.board)["totalWin"])
+
+    batch_wins = get_ways_batch(np.array(boards), gamestate.config, gamestate.symbol_table)
+    assert np.allclose(batch_wins, expected)
+
+
+def test_ways_positions(gamestate):
+    "Positions list the paying symbol then wilds for each reel."
+    board = setup_test_board(gamestate, wild_mults=(2, 3))
+    windata = Ways.get_ways_data(config=gamestate.config, board=board, multiplier_strategy="symbol")
+
+    assert len(windata["wins"]) == 1
+    assert windata["wins"][0]["positions"] == [(0, 0), (1, 0), (1, 1), (2, 0), (2, 1)]
+    assert windata["wins"][0]["meta"]["symbolMult"] == 5
@@ -163,6 +163,9 @@ class FileDetails:
                     )
                 except FileNotFoundError:
                     print("Book Upload Error!")
+                dictionary_f_name = os.path.join(gamePath, "publish_files", "books_" + mode + ".dict")
+                if os.path.exists(dictionary_f_name):
+                    all_file_paths[mode + "_books_dictionary"] = dictionary_f_name
             if lookupTables:
                 lut_f_name = os.path.join(gamePath, "publish_files", "lookUpTable_" + mode + "_0.csv")
                 if os.path.exists(lut_f_name):
@@ -0,0 +1,148 @@
+"""
+Compare zstd compression settings on a sample of a game's books, reporting compression ratio against
+compression and decompression speed. Use the results to choose a game's compression_options.
+
+python -m utils.benchmark_compression -g 0_0_lines -m base -n 10000 --levels 1 3 9 19 --threads 0 4 --ldm
+"""
+
+import io
+import os
+import json
+import time
+import argparse
+import itertools
+
+from src.write_data.compression import (
+    get_books_decompressor,
+    get_compression_options,
+    get_zstd_compressor,
+    get_zstd_decompressor,
+)
+from utils.rgs_verification import load_game_config
+
+
+def load_book_sample(books_path: str, num_books: int) -> bytes:
+    """First num_books books of a published books file, as JSON-lines."""
+    lines = []
+    if books_path.endswith(".zst"):
+        with open(books_path, "rb") as f:
+            decompressor = get_books_decompressor(books_path)
+            with decompressor.stream_reader(f, read_across_frames=True) as reader:
+                for line in io.TextIOWrapper(reader, encoding="UTF-8"):
+                    if line.strip():
+                        lines.append(line)
+                    if len(lines) == num_books:
+                        break
+    elif books_path.endswith(".jsonl"):
+        with open(books_path, "r", encoding="UTF-8") as f:
+            lines = [line for line in itertools.islice(f, num_books) if line.strip()]
+    else:
+        with open(books_path, "r", encoding="UTF-8") as f:
+            lines = [json.dumps(book) + "\n" for book in json.load(f)[:num_books]]
+    return "".join(lines).encode("UTF-8")
+
+
+def benchmark_compression(sample: bytes, options_list: list, repeats: int = 3) -> list:
+    """Compression ratio and best-of-repeats compress/decompress throughput (MB/s of uncompressed data)."""
+    results = []
+    size_mb = len(sample) / 2**20
+    for options in options_list:
+        compressor = get_zstd_compressor(options)
+        decompressor = get_zstd_decompressor(options)
+        compress_time, decompress_time = float("inf"), float("inf")
+        for _ in range(repeats):
+            start = time.perf_counter()
+            compressed = compressor.compress(sample)
+            compress_time = min(compress_time, time.perf_counter() - start)
+            start = time.perf_counter()
+            decompressed = decompressor.decompress(compressed, max_output_size=len(sample))
+            decompress_time = min(decompress_time, time.perf_counter() - start)
+        assert decompressed == sample, "decompressed sample does not match the original"
+        results.append(
+            {
+                "options": options,
+                "ratio": len(sample) / len(compressed),
+                "compress_mb_s": size_mb / compress_time if compress_time > 0 else float("inf"),
+                "decompress_mb_s": size_mb / decompress_time if decompress_time > 0 else float("inf"),
+            }
+        )
+    return results
+
+
+def get_options_grid(
+    base_options: dict, levels: list = None, threads: list = None, ldm: list = None, window_logs: list = None
+) -> list:
+    """Every distinct combination of the given settings, using base_options for any which are not varied."""
+    options_list = []
+    for level, num_threads, long_distance_matching, window_log in itertools.product(
+        levels or [base_options["level"]],
+        threads or [base_options["threads"]],
+        ldm or [base_options["long_distance_matching"]],
+        window_logs or [base_options["window_log"]],
+    ):
+        options = {
+            "level": level,
+            "threads": num_threads,
+            "long_distance_matching": long_distance_matching,
+            "window_log": window_log,
+        }
+        if options not in options_list:
+            options_list.append(options)
+    return options_list
+
+
+def print_benchmark_results(results: list) -> None:
+    """Table of benchmark results."""
+    print(
+        f"{'level':>6} {'threads':>8} {'ldm':>5} {'window_log':>11} {'ratio':>8} {'comp MB/s':>10} "
+        f"{'decomp MB/s':>12}"
+    )
+    for result in results:
+        options = result["options"]
+        print(
+            f"{options['level']:>6} {options['threads']:>8} {str(options['long_distance_matching']):>5} "
+            f"{options['window_log']:>11} {result['ratio']:>8.2f} {result['compress_mb_s']:>10.1f} "
+            f"{result['decompress_mb_s']:>12.1f}"
+        )
+
+
+def main():
+    """parse commandline arguments"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("-g", dest="game", required=True)
+    parser.add_argument("-m", dest="mode", default="base")
+    parser.add_argument("-n", dest="num_books", type=int, default=10000)
+    parser.add_argument("--levels", type=int, nargs="+", default=None)
+    parser.add_argument("--threads", type=int, nargs="+", default=None)
+    parser.add_argument("--window-logs", dest="window_logs", type=int, nargs="+", default=None)
+    parser.add_argument("--ldm", action="store_true", help="also test with long distance matching enabled")
+    parser.add_argument("--repeats", type=int, default=3)
+    arguments = parser.parse_args()
+
+    config = load_game_config(arguments.game)
+    current = get_compression_options(config)
+    books_path = None
+    for extension in [".jsonl.zst", ".jsonl", ".json"]:
+        filename = f"books_{arguments.mode}{extension}"
+        if os.path.isfile(os.path.join(config.publish_path, filename)):
+            books_path = os.path.join(config.publish_path, filename)
+            break
+    if books_path is None:
+        raise FileNotFoundError(f"No books found for mode {arguments.mode} in {config.publish_path}")
+
+    sample = load_book_sample(books_path, arguments.num_books)
+    num_books = sample.count(b"\n")
+    print(f"Sampled {num_books} books ({len(sample) / 2**20:.2f} MB) from {books_path}")
+    options_list = get_options_grid(
+        current,
+        levels=arguments.levels,
+        threads=arguments.threads,
+        ldm=[current["long_distance_matching"], True] if arguments.ldm else None,
+        window_logs=arguments.window_logs,
+    )
+    print_benchmark_results(benchmark_compression(sample, options_list, arguments.repeats))
+
+
+if __name__ == "__main__":
+
+    main()
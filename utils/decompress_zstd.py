@@ -2,11 +2,16 @@
 
 import json
 import io
-import zstandard as zstd
+from src.write_data.book_index import SeekableBooks
+from src.write_data.compression import get_books_decompressor
 
 
-def decompress(input_path: str, save_output: bool = False):
-    """Decompress zst files assuming newline char to indicate different sims."""
+def decompress(input_path: str, save_output: bool = False, dictionary: bytes = None):
+    """
+    Decompress zst files assuming newline char to indicate different sims, books may span several frames.
+    Books compressed with a trained dictionary use the books_<mode>.dict file alongside them, unless a
+    dictionary is given.
+    """
 
     def json_validate(json_blob):
         """Validate each uncompressed result to ensure valid json format."""
@@ -16,9 +21,9 @@ def decompress(input_path: str, save_output: bool = False):
             print("Invalid JSON!")
             raise RuntimeError("Invalid JSON")
 
-    decompressor = zstd.ZstdDecompressor()
+    decompressor = get_books_decompressor(input_path, dictionary)
     with open(input_path, "rb") as f:
-        with decompressor.stream_reader(f) as reader:
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             txt_stream = io.TextIOWrapper(reader, encoding="utf-8")
             lines = []
             for line in txt_stream:
@@ -31,6 +36,15 @@ def decompress(input_path: str, save_output: bool = False):
             f.writelines(lines)
 
 
+def read_books(input_path: str, first_id: int, last_id: int = None) -> list:
+    """
+    Books with ids from first_id to last_id (inclusive, defaults to first_id) from a file written with
+    books_per_frame set, decompressing only the frames which hold them.
+    """
+    with SeekableBooks(input_path) as books:
+        return list(books.get_books(first_id, first_id if last_id is None else last_id))
+
+
 if __name__ == "__main__":
 
     test_file = "games/0_0_lines/library/publish_files/books_base.jsonl.zst"
@@ -0,0 +1,391 @@
+"""Exact full-cycle win statistics of reel-based (lines and ways) games, without simulation.
+
+Every reel stop is equally likely and reels stop independently, so the outcome of a reelstrip is a finite,
+weighted set of boards. Expected wins follow directly from per-reel symbol frequencies, while the full win
+distribution is built reel-by-reel, merging partial boards which can no longer be told apart by later reels.
+Wins are evaluated with the same rules as Lines.get_lines() and Ways.get_ways_data(), without symbol multipliers.
+"""
+
+import os
+from multiprocessing import Pool
+from typing import Dict, List, Tuple
+import numpy as np
+
+from src.calculations.symbol import get_symbol_table
+from src.config.compiled_config import get_compiled_config, get_compiled_paytable
+
+# Win amounts are accumulated as integers of 1/PAY_SCALE bet, so identical totals merge exactly
+PAY_SCALE = 10**6
+MAX_BLOCK_ROWS = 2**19
+
+
+class CycleResult:
+    """Exact statistics of one reelstrip over its full cycle of reel stops."""
+
+    def __init__(self, reelstrip_id: str, cycle_size: int, win_distribution: Dict[float, int], cost: float = 1.0):
+        self.reelstrip_id = reelstrip_id
+        self.cycle_size = cycle_size
+        self.win_distribution = win_distribution
+        self.cost = cost
+        self.rtp = sum(win * weight for win, weight in win_distribution.items()) / (cycle_size * cost)
+        self.hit_rate = sum(weight for win, weight in win_distribution.items() if win > 0) / cycle_size
+
+    def get_summary(self) -> str:
+        """Printable description."""
+        hits = f"1 in {1 / self.hit_rate:.2f}" if self.hit_rate > 0 else "never"
+        return (
+            f"{self.reelstrip_id}: RTP {self.rtp:.6f}, hit-rate {self.hit_rate:.6f} ({hits}), "
+            f"{len(self.win_distribution)} unique wins over {self.cycle_size} stop combinations"
+        )
+
+
+def get_reel_windows(reelstrip: np.ndarray, num_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct symbol-id windows of one reel, shape [window, row], with the number of stops showing each."""
+    positions = (np.arange(len(reelstrip))[:, None] + np.arange(num_rows)[None, :]) % len(reelstrip)
+    windows, counts = np.unique(np.asarray(reelstrip)[positions], axis=0, return_counts=True)
+    return windows.astype(np.int64), counts.astype(np.int64)
+
+
+def get_symbol_frequencies(reelstrip: np.ndarray, num_symbols: int) -> np.ndarray:
+    """Probability of each symbol id at any single position of each reel, shape [reel, symbol]."""
+    return np.array([np.bincount(np.asarray(reel), minlength=num_symbols) / len(reel) for reel in reelstrip])
+
+
+def get_pay_units(config: object) -> np.ndarray:
+    """Paytable as integer units of 1/PAY_SCALE bet, indexed by [symbol id, kind]."""
+    return np.rint(get_compiled_paytable(config).dense * PAY_SCALE).astype(np.int64)
+
+
+def get_cycle_size(config: object, reelstrip_id: str) -> int:
+    """Number of equally likely stop combinations of a reelstrip."""
+    size = 1
+    for reel in config.reels[reelstrip_id]:
+        size *= len(reel)
+    return size
+
+
+def get_lines_expected_win(config: object, reelstrip_id: str, wild_key: str = "wild", wild_sym: str = "W") -> float:
+    """
+    Exact expected lines-win per spin.
+
+    Each payline position shows every reel position with equal probability, so all paylines share the same
+    expected win. It is found from per-reel symbol frequencies, tracking (first non-wild symbol, leading wilds).
+    """
+    symbol_table = get_symbol_table(config)
+    paytable = get_compiled_paytable(config)
+    reels = get_compiled_config(config).reels[reelstrip_id]
+    freqs = get_symbol_frequencies(reels, symbol_table.num_symbols)
+    is_wild = symbol_table.get_special_mask(wild_key)
+    num_reels = len(reels)
+
+    def pay(kind: int, symbol: str) -> float:
+        return float(paytable.get_payout(kind, symbol))
+
+    expected = 0.0
+    # (target symbol id or None, leading wilds) -> probability that the line is still matching
+    alive = {(None, 0): 1.0}
+    for reel in range(num_reels):
+        next_alive = {}
+        for (target, wild_matches), prob in alive.items():
+            for sym_id in np.flatnonzero(freqs[reel]).tolist():
+                p = prob * freqs[reel][sym_id]
+                if is_wild[sym_id]:
+                    state = (target, wild_matches + (target is None))
+                elif target is None:
+                    state = (sym_id, wild_matches)
+                elif sym_id == target:
+                    state = (target, wild_matches)
+                else:
+                    expected += p * max(pay(wild_matches, wild_sym), pay(reel, symbol_table.names[target]))
+                    continue
+                next_alive[state] = next_alive.get(state, 0.0) + p
+        alive = next_alive
+    for (target, wild_matches), prob in alive.items():
+        base_win = pay(num_reels, symbol_table.names[target]) if target is not None else 0
+        expected += prob * max(pay(wild_matches, wild_sym), base_win)
+
+    return expected * len(config.paylines)
+
+
+def get_ways_expected_win(config: object, reelstrip_id: str, wild_key: str = "wild") -> float:
+    """
+    Exact expected ways-win per spin (before rounding to cents).
+
+    For a symbol s the ways-win is pay(kind) times the product of (s + wild) counts over the first kind reels.
+    Reels are independent, so the expectation factorises into per-reel expected counts and the probability of
+    the reel ending the win. Symbols are only evaluated if they appear on the first reel.
+    """
+    symbol_table = get_symbol_table(config)
+    paytable = get_compiled_paytable(config)
+    reels = get_compiled_config(config).reels[reelstrip_id]
+    is_wild = np.array([name in config.special_symbols[wild_key] for name in symbol_table.names])
+    windows = [get_reel_windows(reel, config.num_rows[idx]) for idx, reel in enumerate(reels)]
+    expected = 0.0
+    for sym_id, name in enumerate(symbol_table.names):
+        if not any(paytable.get_payout(kind, name) for kind in range(len(reels) + 1)):
+            continue
+        # Expected count (given any for reel 0) and probability of no count on each reel
+        mean_count, prob_zero = [], []
+        for reel, (reel_windows, weights) in enumerate(windows):
+            counts = (reel_windows == sym_id).sum(axis=1) + is_wild[reel_windows].sum(axis=1)
+            if reel == 0:
+                counts = np.where((reel_windows == sym_id).any(axis=1), counts, 0)
+            mean_count.append(float((counts * weights).sum() / weights.sum()))
+            prob_zero.append(float(weights[counts == 0].sum() / weights.sum()))
+        product = mean_count[0]
+        for kind in range(1, len(reels) + 1):
+            ends = prob_zero[kind] if kind < len(reels) else 1.0
+            expected += float(paytable.get_payout(kind, name)) * product * ends
+            if kind < len(reels):
+                product *= mean_count[kind]
+
+    return expected
+
+
+def get_lines_tables(config: object, wild_key: str, wild_sym: str) -> dict:
+    """
+    Per-line state transitions for the lines win distribution.
+
+    A line state code is 0 once the line has stopped matching, otherwise 1 + target * (num_reels + 1) + wild_matches
+    with target 0 while only wilds have been seen and symbol id + 1 after that.
+    """
+    symbol_table = get_symbol_table(config)
+    pay_units = get_pay_units(config)
+    num_reels = config.num_reels
+    num_symbols = symbol_table.num_symbols
+    is_wild = symbol_table.get_special_mask(wild_key)
+    wild_id = symbol_table.ids.get(wild_sym)
+    num_codes = 1 + (num_symbols + 1) * (num_reels + 1)
+
+    def pay(kind: int, sym_id: int) -> int:
+        if sym_id is None or kind >= pay_units.shape[1]:
+            return 0
+        return int(pay_units[sym_id, kind])
+
+    def end_win(target: int, wild_matches: int, kind: int) -> int:
+        return max(pay(wild_matches, wild_id), pay(kind, target - 1) if target > 0 else 0)
+
+    next_code = np.zeros((num_reels, num_codes, num_symbols), dtype=np.int64)
+    win = np.zeros((num_reels, num_codes, num_symbols), dtype=np.int64)
+    for reel in range(num_reels):
+        for code in range(1, num_codes):
+            target, wild_matches = divmod(code - 1, num_reels + 1)
+            if wild_matches > reel:
+                continue
+            for sym_id in range(num_symbols):
+                if is_wild[sym_id]:
+                    next_code[reel, code, sym_id] = code + (target == 0)
+                elif target == 0:
+                    next_code[reel, code, sym_id] = 1 + (sym_id + 1) * (num_reels + 1) + wild_matches
+                elif sym_id == target - 1:
+                    next_code[reel, code, sym_id] = code
+                else:
+                    win[reel, code, sym_id] = end_win(target, wild_matches, reel)
+
+    # The last reel also pays every line still matching as a num_reels-kind
+    final_win = win[-1].copy()
+    for code in range(1, num_codes):
+        for sym_id in range(num_symbols):
+            alive = next_code[-1, code, sym_id]
+            if alive > 0:
+                target, wild_matches = divmod(alive - 1, num_reels + 1)
+                final_win[code, sym_id] += end_win(target, wild_matches, num_reels)
+
+    return {
+        "lines": np.array([config.paylines[idx] for idx in config.paylines], dtype=np.int64),
+        "next_code": next_code,
+        "win": win,
+        "final_win": final_win,
+    }
+
+
+def step_lines(tables: dict, reel: int, states: np.ndarray, windows: np.ndarray, final: bool) -> tuple:
+    """Advance line states [state, line] by every window of a reel, returning ([state, window, line], wins)."""
+    rows = tables["lines"][:, reel]
+    symbols = windows[:, rows]
+    codes = states[:, None, :]
+    if final:
+        return None, tables["final_win"][codes, symbols[None, :, :]].sum(axis=2)
+    new_codes = tables["next_code"][reel][codes, symbols[None, :, :]]
+    wins = tables["win"][reel][codes, symbols[None, :, :]].sum(axis=2)
+    return new_codes, wins
+
+
+def get_ways_tables(config: object, wild_key: str) -> dict:
+    """Symbol and wild counts of every window, plus paytable values, for the ways win distribution."""
+    symbol_table = get_symbol_table(config)
+    return {
+        "num_symbols": symbol_table.num_symbols,
+        "is_wild": np.array([name in config.special_symbols[wild_key] for name in symbol_table.names]),
+        "paytable": np.asarray(get_compiled_paytable(config).dense),
+        "num_reels": config.num_reels,
+    }
+
+
+def ways_win_units(tables: dict, sym_ids: np.ndarray, kind: int, ways: np.ndarray) -> np.ndarray:
+    """Rounded ways-win of symbols (id + 1, 0 for none) as pay units."""
+    paytable = tables["paytable"]
+    pays = np.zeros(sym_ids.shape, dtype=np.float64)
+    if kind < paytable.shape[1]:
+        pays = np.where(sym_ids > 0, paytable[np.maximum(sym_ids - 1, 0), kind], 0.0)
+    return np.rint(np.round(pays * ways, 2) * PAY_SCALE).astype(np.int64)
+
+
+def get_ways_initial_states(tables: dict, windows: np.ndarray) -> np.ndarray:
+    """
+    Ways states after the first reel, shape [window, 2 * slots]: for every distinct first-reel symbol in order
+    of appearance, its id + 1 and its number of ways (symbol count plus wild count).
+    """
+    slots = windows.shape[1]
+    states = np.zeros((len(windows), 2 * slots), dtype=np.int64)
+    num_wilds = tables["is_wild"][windows].sum(axis=1)
+    for idx, window in enumerate(windows.tolist()):
+        for slot, sym_id in enumerate(dict.fromkeys(window)):
+            states[idx, 2 * slot] = sym_id + 1
+            states[idx, 2 * slot + 1] = window.count(sym_id) + num_wilds[idx]
+    return states
+
+
+def step_ways(tables: dict, reel: int, states: np.ndarray, windows: np.ndarray, final: bool) -> tuple:
+    """Advance ways states [state, 2 * slots] by every window of a reel, returning ([state, window, ...], wins)."""
+    counts = np.zeros((len(windows), tables["num_symbols"] + 1), dtype=np.int64)
+    for row in range(windows.shape[1]):
+        np.add.at(counts, (np.arange(len(windows)), windows[:, row] + 1), 1)
+    counts[:, 1:] += tables["is_wild"][windows].sum(axis=1)[:, None]
+    counts[:, 0] = 0
+
+    sym_ids = np.repeat(states[:, None, 0::2], len(windows), axis=1)
+    ways = states[:, None, 1::2]
+    reel_counts = counts[np.arange(len(windows))[None, :, None], sym_ids]
+    ended = (sym_ids > 0) & (reel_counts == 0)
+    wins = ways_win_units(tables, np.where(ended, sym_ids, 0), reel, ways).sum(axis=2)
+    new_ways = ways * reel_counts
+    new_syms = np.where(ended, 0, sym_ids)
+    if final:
+        return None, wins + ways_win_units(tables, new_syms, reel + 1, new_ways).sum(axis=2)
+    new_states = np.empty(sym_ids.shape[:2] + (states.shape[1],), dtype=np.int64)
+    new_states[..., 0::2] = new_syms
+    new_states[..., 1::2] = np.where(new_syms > 0, new_ways, 0)
+    return new_states, wins
+
+
+def merge_states(states: np.ndarray, acc: np.ndarray, weights: np.ndarray) -> tuple:
+    """Combine identical (state, accumulated win) rows, summing their weights."""
+    # Rows are compared as raw bytes, using the narrowest integer type holding every state value
+    state_dtype = np.uint8 if states.size == 0 or states.max() < 2**8 else np.int64
+    keys = np.empty((len(states), states.shape[1] * np.dtype(state_dtype).itemsize + 8), dtype=np.uint8)
+    keys[:, :-8] = np.ascontiguousarray(states.astype(state_dtype)).view(np.uint8).reshape(len(states), -1)
+    keys[:, -8:] = np.ascontiguousarray(acc.astype(np.int64)).view(np.uint8).reshape(len(states), 8)
+    row_keys = keys.view(np.dtype((np.void, keys.shape[1]))).reshape(-1)
+    _, first, inverse = np.unique(row_keys, return_index=True, return_inverse=True)
+    merged = np.zeros(len(first), dtype=np.int64)
+    np.add.at(merged, inverse.reshape(-1), weights)
+    return states[first], acc[first], merged
+
+
+def add_to_distribution(distribution: Dict[int, int], wins: np.ndarray, weights: np.ndarray) -> None:
+    """Accumulate weights of win amounts (pay units)."""
+    values, inverse = np.unique(wins, return_inverse=True)
+    totals = np.zeros(len(values), dtype=np.int64)
+    np.add.at(totals, inverse.reshape(-1), weights.reshape(-1))
+    for value, total in zip(values.tolist(), totals.tolist()):
+        distribution[value] = distribution.get(value, 0) + total
+
+
+def run_cycle(win_type: str, tables: dict, reel_windows: List[tuple], first_reel_idx: np.ndarray) -> Dict[int, int]:
+    """Win distribution (pay units: number of stop combinations) for a subset of first-reel windows."""
+    step = step_lines if win_type == "lines" else step_ways
+    first_windows, first_weights = reel_windows[0]
+    first_windows, first_weights = first_windows[first_reel_idx], first_weights[first_reel_idx]
+    if win_type == "lines":
+        initial = np.ones((1, len(tables["lines"])), dtype=np.int64)
+        states, acc = step_lines(tables, 0, initial, first_windows, len(reel_windows) == 1)
+        if states is None:
+            distribution = {}
+            add_to_distribution(distribution, acc[0], first_weights)
+            return distribution
+        states, acc, weights = states[0], acc[0], first_weights
+    else:
+        states, acc, weights = get_ways_initial_states(tables, first_windows), np.zeros(len(first_windows), np.int64), first_weights
+    states, acc, weights = merge_states(states, acc, weights)
+
+    distribution = {}
+    for reel in range(1, len(reel_windows)):
+        windows, window_weights = reel_windows[reel]
+        final = reel == len(reel_windows) - 1
+        block = max(1, MAX_BLOCK_ROWS // len(windows))
+        merged = []
+        for start in range(0, len(states), block):
+            new_states, wins = step(tables, reel, states[start : start + block], windows, final)
+            new_acc = acc[start : start + block, None] + wins
+            new_weights = weights[start : start + block, None] * window_weights[None, :]
+            if final:
+                add_to_distribution(distribution, new_acc, new_weights)
+            else:
+                merged.append(
+                    merge_states(
+                        new_states.reshape(-1, new_states.shape[-1]), new_acc.reshape(-1), new_weights.reshape(-1)
+                    )
+                )
+        if not final:
+            states, acc, weights = merge_states(*(np.concatenate(parts) for parts in zip(*merged)))
+    if len(reel_windows) == 1:
+        add_to_distribution(distribution, acc, weights)
+    return distribution
+
+
+def get_win_distribution(
+    config: object,
+    reelstrip_id: str,
+    win_type: str,
+    wild_key: str = "wild",
+    wild_sym: str = "W",
+    processes: int = None,
+) -> Dict[float, int]:
+    """
+    Exact win distribution of a reelstrip as {win amount: number of stop combinations}.
+    First-reel windows are split between worker processes.
+    """
+    assert win_type in ["lines", "ways"], "exact analysis supports lines and ways games"
+    assert get_cycle_size(config, reelstrip_id) < 2**63, "reel cycle is too large for exact counts"
+    reels = get_compiled_config(config).reels[reelstrip_id]
+    reel_windows = [get_reel_windows(reel, config.num_rows[idx]) for idx, reel in enumerate(reels)]
+    if win_type == "lines":
+        tables = get_lines_tables(config, wild_key, wild_sym)
+    else:
+        tables = get_ways_tables(config, wild_key)
+
+    processes = processes or os.cpu_count() or 1
+    chunks = np.array_split(np.arange(len(reel_windows[0][0])), min(processes, len(reel_windows[0][0])))
+    args = [(win_type, tables, reel_windows, chunk) for chunk in chunks]
+    if processes > 1:
+        with Pool(processes) as pool:
+            results = pool.starmap(run_cycle, args)
+    else:
+        results = [run_cycle(*arg) for arg in args]
+
+    distribution = {}
+    for result in results:
+        for value, weight in result.items():
+            distribution[value] = distribution.get(value, 0) + weight
+    return {value / PAY_SCALE: distribution[value] for value in sorted(distribution)}
+
+
+def run_exact_analysis(
+    config: object,
+    win_type: str = None,
+    reelstrip_ids: List[str] = None,
+    wild_key: str = "wild",
+    wild_sym: str = "W",
+    cost: float = 1.0,
+    processes: int = None,
+) -> Dict[str, CycleResult]:
+    """Exact RTP, hit-rate and win distribution for each reelstrip (default: all of config.reels)."""
+    win_type = win_type or getattr(config, "win_type", None)
+    reelstrip_ids = reelstrip_ids or [key for key, reels in config.reels.items() if len(reels) > 0]
+    results = {}
+    for reelstrip_id in reelstrip_ids:
+        distribution = get_win_distribution(config, reelstrip_id, win_type, wild_key, wild_sym, processes)
+        results[reelstrip_id] = CycleResult(reelstrip_id, get_cycle_size(config, reelstrip_id), distribution, cost)
+        print(results[reelstrip_id].get_summary())
+    return results
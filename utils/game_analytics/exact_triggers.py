@@ -0,0 +1,178 @@
+"""Exact scatter-count, anticipation and freespin trigger probabilities of reelstrips, without simulation.
+
+The number of scatters on each reel depends only on that reel's stop, so the distribution of the total scatter
+count is the convolution of per-reel scatter-count distributions. Counts are kept as integer numbers of stop
+combinations, so all probabilities are exact ratios over the reel cycle.
+"""
+
+from typing import Dict, List, Tuple
+import numpy as np
+
+from src.calculations.symbol import get_symbol_table
+from src.config.compiled_config import get_compiled_config
+from utils.game_analytics.exact_rtp import get_cycle_size, get_reel_windows
+
+
+class TriggerResult:
+    """Exact scatter statistics of one reelstrip evaluated as a given gametype."""
+
+    def __init__(
+        self,
+        reelstrip_id: str,
+        gametype: str,
+        cycle_size: int,
+        scatter_counts: List[int],
+        anticipation_counts: List[int],
+        freespin_triggers: Dict[int, int],
+    ):
+        self.reelstrip_id = reelstrip_id
+        self.gametype = gametype
+        self.cycle_size = cycle_size
+        self.scatter_counts = scatter_counts
+        self.anticipation_counts = anticipation_counts
+        self.freespin_triggers = freespin_triggers
+        self.scatter_probabilities = [count / cycle_size for count in scatter_counts]
+        # anticipation_probabilities[reel] is the probability that anticipation starts on that reel
+        self.anticipation_probabilities = [count / cycle_size for count in anticipation_counts]
+        min_trigger = min(freespin_triggers.keys()) if len(freespin_triggers) > 0 else len(scatter_counts)
+        self.trigger_probability = sum(self.scatter_probabilities[min_trigger:])
+        self.expected_spins_awarded = sum(
+            prob * freespin_triggers.get(num_scatters, 0)
+            for num_scatters, prob in enumerate(self.scatter_probabilities)
+        )
+
+    def get_trigger_frequency(self) -> float:
+        """Average number of spins between freespin triggers, inf if the reelstrip cannot trigger."""
+        return 1 / self.trigger_probability if self.trigger_probability > 0 else float("inf")
+
+    def get_expected_freegame_length(self, initial_spins: int) -> float:
+        """
+        Expected number of freespins played from initial_spins, if every freespin uses this reelstrip.
+        Each spin adds expected_spins_awarded on average, so the total is initial_spins / (1 - expected_spins_awarded).
+        """
+        if self.expected_spins_awarded >= 1:
+            return float("inf")
+        return initial_spins / (1 - self.expected_spins_awarded)
+
+    def get_summary(self) -> str:
+        """Printable description."""
+        lines = [
+            f"{self.reelstrip_id} ({self.gametype}): trigger probability {self.trigger_probability:.6f} "
+            f"(1 in {self.get_trigger_frequency():.2f}), expected spins awarded per spin {self.expected_spins_awarded:.6f}"
+        ]
+        for num_scatters, prob in enumerate(self.scatter_probabilities):
+            if prob > 0:
+                spins = self.freespin_triggers.get(num_scatters)
+                awarded = f", awards {spins} spins" if spins is not None else ""
+                lines.append(f"    {num_scatters} scatters: {prob:.6f}{awarded}")
+        for reel, prob in enumerate(self.anticipation_probabilities):
+            if prob > 0:
+                lines.append(f"    anticipation from reel {reel}: {prob:.6f}")
+        return "\n".join(lines)
+
+
+def get_reel_scatter_counts(reel: np.ndarray, num_rows: int, is_scatter: np.ndarray) -> List[int]:
+    """Number of stops of one reel showing exactly k scatters, indexed by k."""
+    windows, counts = get_reel_windows(reel, num_rows)
+    num_scatters = is_scatter[windows].sum(axis=1)
+    return [int(count) for count in np.bincount(num_scatters, weights=counts, minlength=num_rows + 1)]
+
+
+def convolve_counts(counts_a: List[int], counts_b: List[int]) -> List[int]:
+    """Distribution of the summed scatter count of two independent sets of reels."""
+    combined = [0] * (len(counts_a) + len(counts_b) - 1)
+    for idx, count_a in enumerate(counts_a):
+        if count_a > 0:
+            for idy, count_b in enumerate(counts_b):
+                combined[idx + idy] += count_a * count_b
+    return combined
+
+
+def get_scatter_counts(
+    config: object, reelstrip_id: str, anticipation_trigger: int, scatter_key: str = "scatter"
+) -> Tuple[List[int], List[int]]:
+    """
+    Number of stop combinations showing exactly k scatters, and starting anticipation on each reel.
+
+    Matching Board.create_board_from_stops(), anticipation starts on the reel after the one where the running
+    scatter count reaches anticipation_trigger, unless that is the last reel.
+    """
+    is_scatter = get_symbol_table(config).get_special_mask(scatter_key)
+    reels = get_compiled_config(config).reels[reelstrip_id]
+    reel_counts = [get_reel_scatter_counts(reel, config.num_rows[idx], is_scatter) for idx, reel in enumerate(reels)]
+
+    num_reels = len(reels)
+    anticipation_counts = [0] * num_reels
+    threshold = max(anticipation_trigger, 1)
+    prefix_counts = [1]
+    remaining_stops = get_cycle_size(config, reelstrip_id)
+    reached = 0
+    for reel in range(num_reels):
+        prefix_counts = convolve_counts(prefix_counts, reel_counts[reel])
+        remaining_stops //= len(reels[reel])
+        reached_after = sum(prefix_counts[threshold:]) * remaining_stops
+        if reel + 1 < num_reels:
+            anticipation_counts[reel + 1] = reached_after - reached
+        reached = reached_after
+
+    return prefix_counts, anticipation_counts
+
+
+def get_trigger_result(
+    config: object, reelstrip_id: str, gametype: str, scatter_key: str = "scatter"
+) -> TriggerResult:
+    """Exact scatter statistics of a reelstrip using the freespin and anticipation triggers of a gametype."""
+    freespin_triggers = config.freespin_triggers.get(gametype, {})
+    anticipation_trigger = config.anticipation_triggers.get(gametype, 0)
+    scatter_counts, anticipation_counts = get_scatter_counts(config, reelstrip_id, anticipation_trigger, scatter_key)
+    return TriggerResult(
+        reelstrip_id,
+        gametype,
+        get_cycle_size(config, reelstrip_id),
+        scatter_counts,
+        anticipation_counts,
+        freespin_triggers,
+    )
+
+
+def get_gametype_reelstrips(config: object) -> Dict[str, List[str]]:
+    """Reelstrips which can be drawn for each gametype, from the reel_weights of all betmode distributions."""
+    gametype_reelstrips = {}
+    for betmode in config.bet_modes:
+        for distribution in betmode.get_distributions():
+            for gametype, weights in distribution._conditions["reel_weights"].items():
+                for reelstrip_id in weights:
+                    if reelstrip_id not in gametype_reelstrips.setdefault(gametype, []):
+                        gametype_reelstrips[gametype].append(reelstrip_id)
+    return gametype_reelstrips
+
+
+def run_trigger_analysis(config: object, scatter_key: str = "scatter") -> Dict[Tuple[str, str], TriggerResult]:
+    """
+    Exact scatter statistics of every (gametype, reelstrip) pair used by the game's distributions, followed by
+    the reel-weighted trigger probability of each distribution's basegame, for use when setting quotas.
+    """
+    results = {}
+    for gametype, reelstrip_ids in get_gametype_reelstrips(config).items():
+        for reelstrip_id in reelstrip_ids:
+            if len(config.reels.get(reelstrip_id, [])) == 0:
+                continue
+            results[(gametype, reelstrip_id)] = get_trigger_result(config, reelstrip_id, gametype, scatter_key)
+            print(results[(gametype, reelstrip_id)].get_summary())
+
+    for betmode in config.bet_modes:
+        for distribution in betmode.get_distributions():
+            weights = distribution._conditions["reel_weights"].get(config.basegame_type, {})
+            weights = {key: value for key, value in weights.items() if (config.basegame_type, key) in results}
+            if len(weights) == 0:
+                continue
+            trigger_probability = sum(
+                weight * results[(config.basegame_type, key)].trigger_probability for key, weight in weights.items()
+            ) / sum(weights.values())
+            frequency = f"1 in {1 / trigger_probability:.2f}" if trigger_probability > 0 else "never"
+            print(
+                f"{betmode.get_name()} - {distribution.get_criteria()}: natural {config.basegame_type} trigger "
+                f"probability {trigger_probability:.6f} ({frequency})"
+            )
+
+    return results
@@ -11,9 +11,9 @@ import importlib
 from itertools import combinations
 from io import TextIOWrapper
 import numpy as np
-import zstandard as zst
 import hashlib
 import pickle
+from src.write_data.compression import get_books_decompressor
 from utils.analysis.distribution_functions import (
     make_win_distribution,
     get_distribution_moments,
@@ -118,8 +118,12 @@ def verify_lookup_format(filename: str) -> list:
 
 
 # payout mult value match to lut + length match
-def verify_books_and_payout_mults(books_filename: str) -> list:
-    """Ensure the values written to the books match those in the lookup table exactly."""
+def verify_books_and_payout_mults(books_filename: str, dictionary: bytes = None) -> list:
+    """
+    Ensure the values written to the books match those in the lookup table exactly.
+    Books compressed with a trained dictionary use the books_<mode>.dict file alongside them, unless a
+    dictionary is given.
+    """
     assert str(books_filename).endswith(".jsonl.zstd") or str(books_filename).endswith(
         "jsonl.zst"
     ), "Verification is only run for compressed book files of format .jsonl.zst."
@@ -127,8 +131,8 @@ def verify_books_and_payout_mults(books_filename: str) -> list:
     book_payout_ints = []
     total_num_events = 0
     with open(books_filename, "rb") as f:
-        decompressor = zst.ZstdDecompressor()
-        with decompressor.stream_reader(f) as reader:
+        decompressor = get_books_decompressor(books_filename, dictionary)
+        with decompressor.stream_reader(f, read_across_frames=True) as reader:
             txt_stream = TextIOWrapper(reader, encoding="UTF-8")
             for line in txt_stream:
                 line = line.strip()